@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+
+import math
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+
+class CaptureBuffer:
+    """Chunked, preallocated float32 store for microphone capture
+
+    The audio callback writes into fixed-size chunks with slice assignment,
+    so recording never allocates on the PortAudio thread as long as
+    maintain() keeps a spare chunk ready. Once more than max_memory_seconds
+    of audio is held in RAM, the oldest full chunks are spilled to a raw
+    float32 file on disk.
+    """
+
+    def __init__(self, sample_rate=16000, chunk_seconds=30.0, max_memory_seconds=1200.0, spill_dir=None):
+        self.sample_rate = sample_rate
+        self.chunk_samples = int(chunk_seconds * sample_rate)
+        self.max_memory_samples = None if max_memory_seconds is None else int(max_memory_seconds * sample_rate)
+        self.spill_dir = spill_dir
+
+        self._lock = threading.Lock()
+        self._chunks = []          # In-memory chunks, oldest first
+        self._fill = 0             # Samples used in the last chunk
+        self._frames = 0           # Total samples written
+        self._spare = np.empty(self.chunk_samples, dtype=np.float32)
+
+        self._spill_file = None
+        self._spill_path = None
+        self._spilled = 0          # Samples moved to the spill file
+        self._final = None
+
+    @property
+    def frames(self):
+        return self._frames
+
+    @property
+    def duration(self):
+        return self._frames / self.sample_rate
+
+    @property
+    def spilled_frames(self):
+        return self._spilled
+
+    def write(self, samples):
+        """Append samples; safe to call from the audio callback"""
+        total = len(samples)
+        pos = 0
+        with self._lock:
+            while pos < total:
+                if not self._chunks or self._fill == self.chunk_samples:
+                    self._chunks.append(self._take_spare())
+                    self._fill = 0
+                chunk = self._chunks[-1]
+                count = min(total - pos, self.chunk_samples - self._fill)
+                chunk[self._fill:self._fill + count] = samples[pos:pos + count]
+                self._fill += count
+                pos += count
+            self._frames += total
+
+    def _take_spare(self):
+        """Hand out the preallocated chunk, allocating only if maintain() fell behind"""
+        if self._spare is not None:
+            chunk, self._spare = self._spare, None
+            return chunk
+        return np.empty(self.chunk_samples, dtype=np.float32)
+
+    def maintain(self):
+        """Refill the spare chunk and spill old audio to disk (call from a non-realtime thread)"""
+        if self._spare is None:
+            spare = np.empty(self.chunk_samples, dtype=np.float32)
+            with self._lock:
+                if self._spare is None:
+                    self._spare = spare
+
+        if self.max_memory_samples is None:
+            return
+
+        while True:
+            with self._lock:
+                in_memory = self._frames - self._spilled
+                # Never spill the chunk the callback is still writing into
+                if in_memory <= self.max_memory_samples or len(self._chunks) < 2:
+                    return
+                oldest = self._chunks[0]
+
+            # Full chunks are never written again, so they can be saved without the lock
+            self._write_spill(oldest)
+
+            with self._lock:
+                self._chunks.pop(0)
+                self._spilled += len(oldest)
+
+    def _write_spill(self, samples):
+        if self._spill_file is None:
+            fd, self._spill_path = tempfile.mkstemp(suffix='.f32', prefix='capture_', dir=self.spill_dir)
+            self._spill_file = os.fdopen(fd, 'wb')
+        samples.tofile(self._spill_file)
+        self._spill_file.flush()
+
+    def read(self, start, stop):
+        """Samples in [start, stop); a view when the range sits inside a single chunk"""
+        with self._lock:
+            final = self._final
+            chunks = list(self._chunks)
+            spilled = self._spilled
+            stop = min(stop, self._frames)
+        start = max(0, start)
+        if stop <= start:
+            return np.empty(0, dtype=np.float32)
+        if final is not None:
+            return final[start:stop]
+
+        pieces = []
+        if start < spilled:
+            spill_view = np.memmap(self._spill_path, dtype=np.float32, mode='r', shape=(spilled,))
+            pieces.append(spill_view[start:min(stop, spilled)])
+
+        pos = spilled
+        for chunk in chunks:
+            chunk_end = pos + len(chunk)
+            if chunk_end > start and pos < stop:
+                pieces.append(chunk[max(start, pos) - pos:min(stop, chunk_end) - pos])
+            pos = chunk_end
+
+        if len(pieces) == 1:
+            return pieces[0]
+        return np.concatenate(pieces)
+
+    def get_audio(self):
+        """Whole capture as one float32 array for transcription (call after recording stops)
+
+        A single chunk is returned as a view. Spilled captures are flushed and
+        returned as a writable memmap of the spill file. Otherwise the chunks
+        are consolidated once, releasing each chunk as soon as it is copied.
+        """
+        if self._final is not None:
+            return self._final
+
+        with self._lock:
+            if self._frames == 0:
+                self._final = np.empty(0, dtype=np.float32)
+            elif self._spilled == 0 and len(self._chunks) == 1:
+                self._final = self._chunks[0][:self._fill]
+            elif self._spilled > 0:
+                for i, chunk in enumerate(self._chunks):
+                    last = i == len(self._chunks) - 1
+                    self._write_spill(chunk[:self._fill] if last else chunk)
+                self._chunks = []
+                self._spilled = self._frames
+                self._spill_file.close()
+                self._spill_file = None
+                self._final = np.memmap(self._spill_path, dtype=np.float32, mode='r+', shape=(self._frames,))
+            else:
+                out = np.empty(self._frames, dtype=np.float32)
+                pos = 0
+                while self._chunks:
+                    chunk = self._chunks.pop(0)
+                    count = self._fill if not self._chunks else len(chunk)
+                    out[pos:pos + count] = chunk[:count]
+                    pos += count
+                    del chunk
+                self._final = out
+            self._spare = None
+        return self._final
+
+    def close(self):
+        """Release memory and delete any spill file"""
+        with self._lock:
+            self._chunks = []
+            self._spare = None
+            self._final = None
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+            if self._spill_path is not None:
+                try:
+                    os.unlink(self._spill_path)
+                except OSError:
+                    pass  # Still mapped elsewhere on Windows; the OS temp cleanup will get it
+                self._spill_path = None
+
+
+class LevelMeter:
+    """Per-block RMS and peak from the audio callback, read by the UI at its own frame rate
+
+    update() runs on the PortAudio thread: two reductions over the block,
+    no temporaries, published by swapping a single tuple (atomic under the
+    GIL), so neither side locks and the callback never queues Tk work.
+    Input overflows reported in the callback status are counted alongside.
+    """
+
+    CLIP_LEVEL = 0.99
+    FLOOR_DB = -60.0  # Bottom of the meter scale
+
+    def __init__(self):
+        self.reading = (0, 0.0, 0.0)  # (blocks seen, rms, peak) of the latest block
+        self.overflows = 0
+
+    def update(self, samples, status=None):
+        """Publish the level of one block; safe to call from the audio callback"""
+        if len(samples):
+            rms = math.sqrt(float(np.dot(samples, samples)) / len(samples))
+            peak = max(float(samples.max()), -float(samples.min()))
+        else:
+            rms = peak = 0.0
+        if status is not None and getattr(status, 'input_overflow', False):
+            self.overflows += 1
+        self.reading = (self.reading[0] + 1, rms, peak)
+
+    @classmethod
+    def percent(cls, rms):
+        """RMS on a dBFS scale from FLOOR_DB (0%) to full scale (100%)"""
+        if rms <= 0:
+            return 0.0
+        db = 20 * math.log10(rms)
+        return max(0.0, min(100.0, (db - cls.FLOOR_DB) / -cls.FLOOR_DB * 100))
+
+    @classmethod
+    def state(cls, rms, peak, threshold):
+        """'clipping', 'silence' (energy below the sensitivity threshold) or None"""
+        if peak >= cls.CLIP_LEVEL:
+            return 'clipping'
+        if rms * rms < threshold:
+            return 'silence'
+        return None
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import hardware_probe
+from synthetic_audio import synthesize_speechlike
+
+SAMPLE_RATE = 16000
+CORPUS_DURATIONS = [15, 45, 120]  # Seconds per synthesized clip
+CORPUS_SEED = 1234
+
+
+def build_corpus(directory, durations=CORPUS_DURATIONS, seed=CORPUS_SEED):
+    """Write the synthesized clips as 16 kHz WAVs; returns their paths"""
+    import soundfile as sf
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    files = []
+    for index, duration in enumerate(durations):
+        path = directory / f"synthetic_{duration}s_{seed + index}.wav"
+        if not path.exists():
+            sf.write(str(path), synthesize_speechlike(duration, seed + index), SAMPLE_RATE, subtype='PCM_16')
+        files.append(str(path))
+    return files
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def config_key(config):
+    return "{model}/{compute_type}/{pipeline}/beam{beam_size}/workers{num_workers}".format(**config)
+
+
+def run_config(config, files):
+    """Benchmark one configuration in this process and return its metrics"""
+    from faster_whisper import WhisperModel, BatchedInferencePipeline, decode_audio
+
+    started = time.perf_counter()
+    model = WhisperModel(
+        config["model"],
+        device="cpu",
+        compute_type=config["compute_type"],
+        num_workers=config["num_workers"],
+        cpu_threads=config.get("cpu_threads", 0),
+        local_files_only=config.get("offline", True),
+    )
+    load_seconds = time.perf_counter() - started
+    pipeline = BatchedInferencePipeline(model=model) if config["pipeline"] == "batched" else model
+
+    # Decoding is timed separately so RTF reflects inference only
+    started = time.perf_counter()
+    audio = [decode_audio(path, sampling_rate=SAMPLE_RATE) for path in files]
+    decode_seconds = time.perf_counter() - started
+    audio_seconds = sum(len(a) for a in audio) / SAMPLE_RATE
+
+    params = {"beam_size": config["beam_size"], "vad_filter": config.get("vad_filter", False)}
+    if config["pipeline"] == "batched":
+        params["batch_size"] = config.get("batch_size", 8)
+
+    def transcribe_one(samples):
+        t0 = time.perf_counter()
+        segments, info = pipeline.transcribe(samples, **params)
+        first = None
+        count = 0
+        for segment in segments:
+            if first is None:
+                first = time.perf_counter() - t0
+            count += 1
+        return time.perf_counter() - t0, first, count
+
+    # num_workers concurrent streams share the model, as the GUI queue and batch CLI do
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=config["num_workers"]) as pool:
+        per_file = list(pool.map(transcribe_one, audio))
+    wall_seconds = time.perf_counter() - started
+
+    first_segments = [first for _, first, _ in per_file if first is not None]
+    return {
+        "key": config_key(config),
+        "config": config,
+        "load_seconds": round(load_seconds, 3),
+        "decode_seconds": round(decode_seconds, 3),
+        "audio_seconds": round(audio_seconds, 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "rtf": round(wall_seconds / audio_seconds, 4) if audio_seconds else None,
+        "time_to_first_segment": {
+            "mean": round(sum(first_segments) / len(first_segments), 3) if first_segments else None,
+            "max": round(max(first_segments), 3) if first_segments else None,
+        },
+        "segments": sum(count for _, _, count in per_file),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_isolated(config, files, timeout):
+    """Run one configuration in a fresh interpreter so load time and peak RSS aren't shared"""
+    command = [sys.executable, os.path.abspath(__file__), "--run-one", json.dumps({"config": config, "files": files})]
+    try:
+        proc = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"key": config_key(config), "config": config, "error": f"timed out after {timeout}s"}
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        error = (proc.stderr.strip().splitlines() or ["unknown error"])[-1]
+        return {"key": config_key(config), "config": config, "error": error}
+    return json.loads(lines[-1])
+
+
+def build_matrix(args):
+    configs = []
+    for model, compute_type, pipeline, beam_size, num_workers in itertools.product(
+            args.models, args.compute_types, args.pipelines, args.beam_sizes, args.num_workers):
+        configs.append({
+            "model": model,
+            "compute_type": compute_type,
+            "pipeline": pipeline,
+            "beam_size": beam_size,
+            "num_workers": num_workers,
+            "batch_size": args.batch_size,
+            "vad_filter": args.vad_filter,
+            "offline": not args.allow_download,
+        })
+    return configs
+
+
+def environment():
+    """What the numbers were measured on, so runs can be compared across commits"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": time.time(),
+        "commit": commit,
+        "host_fingerprint": hardware_probe.host_fingerprint(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "libraries": hardware_probe.library_versions(),
+    }
+
+
+def find_regressions(results, baseline, threshold):
+    """Configurations whose RTF, time-to-first-segment or peak RSS got worse than baseline by > threshold"""
+    previous = {run["key"]: run for run in baseline.get("runs", []) if "error" not in run}
+    regressions = []
+    for run in results:
+        old = previous.get(run["key"])
+        if old is None or "error" in run:
+            continue
+        checks = [
+            ("rtf", run.get("rtf"), old.get("rtf")),
+            ("time_to_first_segment", run["time_to_first_segment"]["mean"], old["time_to_first_segment"]["mean"]),
+            ("peak_rss_mb", run.get("peak_rss_mb"), old.get("peak_rss_mb")),
+        ]
+        for metric, new_value, old_value in checks:
+            if new_value is not None and old_value and new_value > old_value * (1 + threshold):
+                regressions.append({"key": run["key"], "metric": metric, "baseline": old_value,
+                                    "current": new_value, "change": round(new_value / old_value - 1, 3)})
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Benchmark faster-whisper real-time factor across models and settings (CPU, offline).",
+        epilog="Example: python benchmark.py --models tiny base --output bench.json --compare baseline.json"
+    )
+    parser.add_argument("--models", nargs="+", default=["tiny"], help="Model sizes (default: tiny)")
+    parser.add_argument("--compute-types", nargs="+", default=["int8", "float32", "default"])
+    parser.add_argument("--pipelines", nargs="+", choices=["batched", "regular"], default=["batched", "regular"])
+    parser.add_argument("--beam-sizes", nargs="+", type=int, default=[1, 5])
+    parser.add_argument("--num-workers", nargs="+", type=int, default=[1, 2],
+                        help="Model num_workers; the same number of files is transcribed concurrently")
+    parser.add_argument("--batch-size", type=int, default=8, help="BatchedInferencePipeline batch size")
+    parser.add_argument("--vad-filter", action="store_true", help="Enable the VAD filter (off by default so all audio is decoded)")
+    parser.add_argument("--corpus", help="Directory of audio files to use instead of the synthesized corpus")
+    parser.add_argument("--allow-download", action="store_true", help="Let faster-whisper download missing models")
+    parser.add_argument("--timeout", type=int, default=1800, help="Seconds allowed per configuration")
+    parser.add_argument("--output", help="Write the JSON report here (default: print it)")
+    parser.add_argument("--compare", help="Baseline JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown that counts as a regression")
+    parser.add_argument("--run-one", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+
+    if args.run_one:
+        # Child process: one configuration, result as the last JSON line on stdout
+        job = json.loads(args.run_one)
+        print(json.dumps(run_config(job["config"], job["files"])))
+        return
+
+    if args.corpus:
+        from transcribe import AUDIO_EXTENSIONS
+        files = sorted(str(p) for p in Path(args.corpus).rglob('*') if p.suffix.lower() in AUDIO_EXTENSIONS)
+        corpus = {"type": "directory", "path": os.path.abspath(args.corpus), "files": [Path(f).name for f in files]}
+    else:
+        corpus_dir = Path(tempfile.gettempdir()) / "speech_to_text_bench_corpus"
+        files = build_corpus(corpus_dir)
+        corpus = {"type": "synthetic", "seed": CORPUS_SEED, "durations": CORPUS_DURATIONS}
+    if not files:
+        print("Error: no audio files in corpus!")
+        sys.exit(1)
+
+    configs = build_matrix(args)
+    print(f"Running {len(configs)} configurations on {len(files)} files...", file=sys.stderr)
+
+    results = []
+    for index, config in enumerate(configs, 1):
+        result = run_isolated(config, files, args.timeout)
+        results.append(result)
+        if "error" in result:
+            print(f"[{index}/{len(configs)}] {result['key']}: ERROR {result['error']}", file=sys.stderr)
+        else:
+            print(f"[{index}/{len(configs)}] {result['key']}: RTF {result['rtf']:.3f}, "
+                  f"first segment {result['time_to_first_segment']['mean']}s, "
+                  f"peak RSS {result['peak_rss_mb']} MB", file=sys.stderr)
+
+    report = {"environment": environment(), "corpus": corpus, "runs": results}
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        report["baseline"] = {"path": args.compare, "commit": baseline.get("environment", {}).get("commit")}
+        report["regressions"] = find_regressions(results, baseline, args.threshold)
+        for regression in report["regressions"]:
+            print(f"REGRESSION {regression['key']} {regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['current']} (+{regression['change']:.0%})", file=sys.stderr)
+        exit_code = 1 if report["regressions"] else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+import threading
+
+
+class TranscriptionCancelled(Exception):
+    """Raised in a worker once its CancellationToken has been cancelled"""
+
+
+class CancellationToken:
+    """A flag a UI or caller sets and a worker checks at safe points
+
+    Workers call raise_if_cancelled() between segments and between model
+    load phases; nothing is interrupted mid-step, so cancelled work stops
+    within one segment (or one load phase) and unwinds normally, closing
+    generators and releasing whatever it held.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        with self._lock:
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback):
+        """Call callback() on cancel, or right away if already cancelled"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TranscriptionCancelled()
+
+
+def cancellable(segments, token):
+    """Yield segments until token is cancelled, then raise TranscriptionCancelled
+
+    The check runs before each segment is pulled, so no further audio is
+    decoded after a cancel. The source generator is closed either way,
+    which lets the decode, cache and model wrappers beneath it clean up.
+    """
+    iterator = iter(segments)
+    try:
+        while True:
+            if token is not None:
+                token.raise_if_cancelled()
+            try:
+                segment = next(iterator)
+            except StopIteration:
+                return
+            yield segment
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+
+import gc
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+import thread_budget
+from cancellation import CancellationToken, TranscriptionCancelled, cancellable
+from model_manager import LoadedModel
+from transcript_cache import INFO_FIELDS, to_dict, to_namespace
+
+MAX_RESTARTS = 3  # Engine starts allowed within RESTART_WINDOW seconds before giving up
+RESTART_WINDOW = 60.0
+
+
+# --- Engine process side ---------------------------------------------------
+
+def _attach_audio(ref):
+    """(audio, shared_memory) for a request's audio reference; paths come back as is"""
+    if ref[0] == "path":
+        return ref[1], None
+    import numpy as np
+    from multiprocessing import shared_memory
+    _, name, length = ref
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)  # The GUI owns and unlinks it
+    except TypeError:
+        # Before 3.13 attaching also registers it, but a spawned engine shares the GUI's
+        # resource tracker, so that registration is the one the GUI's unlink() removes
+        shm = shared_memory.SharedMemory(name=name)
+    return np.ndarray((length,), dtype=np.float32, buffer=shm.buf), shm
+
+
+def _engine_main(conn, memory_budget_mb, num_workers, warm_up, budget):
+    """Entry point of the engine process: owns the models and serves requests from conn
+
+    Each load/transcribe request runs on its own thread so queued jobs can
+    share the model as they do in-process; replies from all of them go back
+    over the one pipe, tagged with the request id. budget is the GUI's
+    thread budget (its CPU affinity is inherited with the process).
+    """
+    thread_budget.configure(**budget)
+    import perf_log
+    from model_manager import ModelManager
+    from streaming_audio import StreamingTranscriber
+
+    manager = ModelManager(memory_budget_mb=memory_budget_mb, num_workers=num_workers, warm_up=warm_up)
+    send_lock = threading.Lock()
+    tokens = {}
+
+    def send(message):
+        with send_lock:
+            conn.send(message)
+
+    def loaded_state():
+        return {"keys": manager.loaded_keys(), "memory_mb": manager.memory_used_mb}
+
+    def load(request_id, key, jobs):
+        try:
+            thread_budget.set_jobs(jobs)  # The GUI's job count when it asked; sizes the model's threads
+            entry = manager.load(*key, cancel_token=tokens[request_id])
+            send(("loaded", request_id, {"compute_type": entry.compute_type, "resources": entry.resources,
+                                         "warm_up_seconds": entry.warm_up_seconds, **loaded_state()}))
+        except TranscriptionCancelled:
+            send(("cancelled", request_id))
+        except Exception as e:
+            send(("error", request_id, str(e)))
+
+    def transcribe(request_id, key, pipeline, ref, params):
+        shm = None
+        try:
+            audio, shm = _attach_audio(ref)
+            entry = manager.load(*key)
+            transcriber = entry.batched_model if pipeline == 'batched' else entry.model
+            instrumented = perf_log.InstrumentedTranscriber(transcriber, model=key[0], pipeline=pipeline, engine=True)
+            # Files are decoded here too, window by window, so decode never runs in the GUI process
+            streaming = StreamingTranscriber(instrumented, carry_prompt=(pipeline != 'batched'))
+            segments, info = streaming.transcribe(audio, **params)
+            send(("info", request_id, {field: getattr(info, field, None) for field in INFO_FIELDS}))
+            for segment in cancellable(segments, tokens[request_id]):
+                send(("segment", request_id, to_dict(segment)))
+            send(("done", request_id))
+        except TranscriptionCancelled:
+            send(("cancelled", request_id))
+        except Exception as e:
+            send(("error", request_id, str(e)))
+        finally:
+            segments = audio = None
+            gc.collect()
+            if shm is not None:
+                try:
+                    shm.close()
+                except BufferError:
+                    pass  # A view is still alive somewhere; the mapping goes when it does
+
+    def run(request_id, target, *args):
+        try:
+            target(request_id, *args)
+        finally:
+            tokens.pop(request_id, None)
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break  # The GUI went away
+        kind, request_id = message[0], message[1]
+        if kind == "shutdown":
+            break
+        if kind == "cancel":
+            token = tokens.get(request_id)
+            if token is not None:
+                token.cancel()
+            continue
+        tokens[request_id] = CancellationToken()
+        target = load if kind == "load" else transcribe
+        thread = threading.Thread(target=run, args=(request_id, target) + tuple(message[2:]), daemon=True)
+        thread.start()
+    manager.clear()
+
+
+# --- GUI process side ------------------------------------------------------
+
+class EngineTranscriber:
+    """One pipeline of a model living in the engine process, with WhisperModel's transcribe() shape"""
+
+    def __init__(self, host, key, pipeline):
+        self.host = host
+        self.key = key  # (model_size, device, compute_type) as requested
+        self.pipeline = pipeline
+
+    def transcribe(self, audio, **params):
+        return self.host.transcribe(self.key, self.pipeline, audio, params)
+
+
+class EngineHost:
+    """Runs the models in a separate engine process and streams segments back
+
+    Drop-in for ModelManager in the GUI: load() returns a LoadedModel whose
+    model/batched_model are EngineTranscribers. Inference, file decoding and
+    the post-transcription garbage collection all happen in the engine, so
+    they never hold the GIL the Tk thread needs, and a native crash there
+    leaves the window running. Arrays are copied once into shared memory
+    and read in place by the engine instead of being pickled down the pipe;
+    segments come back over the pipe as they are decoded.
+
+    If the engine dies, everything in flight fails with a RuntimeError and
+    on_exit(exitcode) is called from a background thread; the next load()
+    starts a fresh engine (up to MAX_RESTARTS within RESTART_WINDOW).
+    """
+
+    def __init__(self, memory_budget_mb=4096, num_workers=None, warm_up=False, on_exit=None):
+        self.memory_budget_mb = memory_budget_mb
+        self.num_workers = num_workers
+        self.warm_up = warm_up
+        self.on_exit = on_exit
+        self._process = None
+        self._conn = None
+        self._send_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._pending = {}  # request id -> (reply queue, connection it was sent on)
+        self._ids = itertools.count(1)
+        self._starts = []
+        self._closing = False
+        self._loaded = {}  # key -> LoadedModel proxy for models the engine holds
+        self._memory_mb = 0.0
+
+    def start(self):
+        """Start the engine process if it isn't running"""
+        with self._lock:
+            if self._process is not None and self._process.is_alive():
+                return
+            now = time.monotonic()
+            self._starts = [started for started in self._starts if now - started < RESTART_WINDOW]
+            if len(self._starts) >= MAX_RESTARTS:
+                raise RuntimeError(f"Inference engine crashed {len(self._starts)} times in "
+                                   f"{RESTART_WINDOW:.0f}s; not restarting")
+            self._starts.append(now)
+            context = multiprocessing.get_context("spawn")
+            parent_conn, child_conn = context.Pipe()
+            budget = thread_budget.current()
+            process = context.Process(target=_engine_main, name="inference-engine", daemon=True,
+                                      args=(child_conn, self.memory_budget_mb, self.num_workers, self.warm_up,
+                                            {"total": budget.total, "jobs": budget.jobs,
+                                             "reserved": budget.reserved}))
+            process.start()
+            child_conn.close()
+            self._process, self._conn, self._closing = process, parent_conn, False
+        reader = threading.Thread(target=self._read_replies, args=(process, parent_conn), daemon=True)
+        reader.start()
+        print(f"Inference engine started (pid {process.pid})")
+
+    def _read_replies(self, process, conn):
+        """Route engine replies to their requests; on EOF the engine is gone"""
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                pending = self._pending.get(message[1])
+            if pending is not None:
+                pending[0].put(message)  # Replies to requests nobody waits for any more are dropped
+
+        process.join(timeout=5)
+        with self._lock:
+            if self._process is process:
+                self._process = self._conn = None
+                self._loaded.clear()
+                self._memory_mb = 0.0
+            orphaned = [(request_id, replies) for request_id, (replies, sent_on) in self._pending.items()
+                        if sent_on is conn]
+            for request_id, _ in orphaned:
+                del self._pending[request_id]
+            closing = self._closing
+        message = f"Inference engine exited (code {process.exitcode})"
+        for request_id, replies in orphaned:
+            replies.put(("error", request_id, message))
+        if not closing:
+            print(message)
+            if self.on_exit is not None:
+                self.on_exit(process.exitcode)
+
+    def _request(self, *message):
+        """Send a request to the engine; returns (request_id, reply queue)"""
+        self.start()
+        request_id = next(self._ids)
+        replies = queue.Queue()
+        with self._lock:
+            conn = self._conn
+            self._pending[request_id] = (replies, conn)
+        try:
+            with self._send_lock:
+                conn.send((message[0], request_id) + message[1:])
+        except (AttributeError, OSError) as e:
+            self._forget(request_id)
+            raise RuntimeError(f"Inference engine not available: {e}")
+        return request_id, replies
+
+    def _forget(self, request_id, cancel=False):
+        with self._lock:
+            self._pending.pop(request_id, None)
+            conn = self._conn
+        if cancel and conn is not None:
+            try:
+                with self._send_lock:
+                    conn.send(("cancel", request_id))
+            except OSError:
+                pass
+
+    # ModelManager interface
+
+    def get(self, model_size, device, compute_type):
+        with self._lock:
+            return self._loaded.get((model_size, device, compute_type))
+
+    def load(self, model_size, device, compute_type, cancel_token=None):
+        key = (model_size, device, compute_type)
+        entry = self.get(*key)
+        if entry is not None:
+            return entry
+        request_id, replies = self._request("load", key, thread_budget.current().jobs)
+        if cancel_token is not None:
+            def cancel():
+                self._forget(request_id, cancel=True)
+                replies.put(("cancelled", request_id))  # Don't wait for the engine to reach a safe point
+            cancel_token.add_callback(cancel)
+        try:
+            reply = replies.get()
+        finally:
+            self._forget(request_id)
+        if reply[0] == "cancelled":
+            raise TranscriptionCancelled()
+        if reply[0] == "error":
+            raise RuntimeError(reply[2])
+
+        state = reply[2]
+        entry = LoadedModel(model_size, device, state["compute_type"], EngineTranscriber(self, key, 'regular'),
+                            EngineTranscriber(self, key, 'batched'), state["resources"])
+        entry.warm_up_seconds = state["warm_up_seconds"]
+        with self._lock:
+            # Mirror what the engine kept after its own LRU eviction
+            self._loaded = {tuple(k): self._loaded.get(tuple(k)) for k in state["keys"]}
+            self._loaded[key] = entry
+            self._memory_mb = state["memory_mb"]
+        return entry
+
+    def loaded_keys(self):
+        with self._lock:
+            return list(self._loaded.keys())
+
+    @property
+    def pid(self):
+        """The running engine's process id, or None"""
+        with self._lock:
+            return self._process.pid if self._process is not None else None
+
+    @property
+    def memory_used_mb(self):
+        with self._lock:
+            return self._memory_mb
+
+    def clear(self):
+        """Shut the engine down; the next load() starts a new one"""
+        with self._lock:
+            process, conn = self._process, self._conn
+            self._closing = True
+        if conn is not None:
+            try:
+                with self._send_lock:
+                    conn.send(("shutdown", 0))
+            except OSError:
+                pass
+        if process is not None:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    # Transcription
+
+    def transcribe(self, key, pipeline, audio, params):
+        """(segments, info) for a path or 16 kHz float32 array, decoded in the engine"""
+        shm = None
+        if isinstance(audio, (str, os.PathLike)):
+            ref = ("path", str(audio))
+        else:
+            import numpy as np
+            from multiprocessing import shared_memory
+            audio = np.asarray(audio, dtype=np.float32)
+            shm = shared_memory.SharedMemory(create=True, size=max(1, audio.nbytes))
+            view = np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)
+            view[:] = audio  # The only copy; the engine reads it in place
+            del view
+            ref = ("shm", shm.name, len(audio))
+
+        request_id = None
+        try:
+            request_id, replies = self._request("transcribe", key, pipeline, ref, params)
+            reply = replies.get()
+            if reply[0] != "info":
+                raise RuntimeError(reply[2] if len(reply) > 2 else "Transcription cancelled in the engine")
+        except BaseException:
+            if request_id is not None:
+                self._forget(request_id, cancel=True)
+            self._release(shm)
+            raise
+        return self._segments(request_id, replies, shm), SimpleNamespace(**reply[2])
+
+    def _segments(self, request_id, replies, shm):
+        finished = False
+        try:
+            while True:
+                reply = replies.get()
+                kind = reply[0]
+                if kind == "segment":
+                    yield to_namespace(reply[2])
+                elif kind == "done":
+                    finished = True
+                    return
+                else:
+                    finished = True
+                    raise RuntimeError(reply[2] if len(reply) > 2 else "Transcription cancelled in the engine")
+        finally:
+            # Closed early (e.g. cancelled in the GUI): stop the engine at its next segment
+            self._forget(request_id, cancel=not finished)
+            self._release(shm)
+
+    @staticmethod
+    def _release(shm):
+        if shm is not None:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import os
+import platform
+import sys
+import time
+from importlib import metadata
+from pathlib import Path
+
+import perf_log
+
+# Libraries whose upgrade can change which device/compute type works
+PROBE_LIBRARIES = ["faster-whisper", "ctranslate2", "torch", "openvino"]
+
+PROBE_FILENAME = "hardware_probe.json"
+
+
+def cache_dir():
+    """Per-user cache directory for the app (created on demand)"""
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    path = base / "speech-to-text"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def library_versions():
+    """Installed versions of the probe-relevant libraries, read without importing them"""
+    versions = {}
+    for name in PROBE_LIBRARIES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def host_fingerprint():
+    """Stable hash of this machine and the installed inference stack"""
+    parts = {
+        "node": platform.node(),
+        "system": platform.system(),
+        "release": platform.release(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "libraries": library_versions(),
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def probe_hardware():
+    """Pick the device and compute type for this machine
+
+    Returns a dict with device, compute_type and path (which detection branch
+    decided). This imports torch/openvino and can take seconds, so callers
+    normally go through load_probe() instead.
+    """
+    # Optimize compute type based on available hardware
+    device = "cpu"  # Default to CPU
+    compute_type = "int8"  # Default to compatible CPU type
+    path = "cpu"
+
+    try:
+        import torch
+
+        # Check for NVIDIA GPU (CUDA)
+        if torch.cuda.is_available():
+            device = "cuda"
+            compute_type = "float16"
+            path = "torch-cuda"
+            print("Using NVIDIA GPU (CUDA)")
+
+        # Check for AMD GPU (ROCm/HIP)
+        elif hasattr(torch, 'hip') and torch.hip.is_available():
+            device = "hip"
+            compute_type = "float16"
+            path = "torch-hip"
+            print("Using AMD GPU (ROCm)")
+
+        # Check for OpenVINO GPU support (good for Intel/AMD integrated GPUs)
+        else:
+            try:
+                import openvino as ov
+                core = ov.Core()
+                available_devices = core.available_devices
+
+                # Check for GPU device
+                if "GPU" in available_devices:
+                    print(f"OpenVINO GPU available on devices: {available_devices}")
+                    device = "auto"  # Let faster-whisper + OpenVINO optimize
+                    compute_type = "int8"  # Good balance for integrated GPU
+                    path = "openvino-gpu"
+                else:
+                    print(f"OpenVINO devices available: {available_devices}")
+                    device = "cpu"
+                    compute_type = "int8"
+                    path = "openvino-cpu"
+            except ImportError:
+                # Fallback: Try faster-whisper auto detection
+                try:
+                    from faster_whisper import WhisperModel
+                    test_model = WhisperModel('tiny', device='auto', compute_type='auto')
+                    device = "auto"
+                    compute_type = "auto"
+                    path = "faster-whisper-auto"
+                    print("Using faster-whisper auto GPU detection")
+                    del test_model  # cleanup
+                except Exception:
+                    print("No GPU acceleration available, using optimized CPU")
+                    device = "cpu"
+                    compute_type = "int8"
+                    path = "cpu-fallback"
+
+    except ImportError:
+        print("PyTorch not available, using CPU with auto detection")
+        device = "auto"
+        compute_type = "auto"
+        path = "no-torch-auto"
+
+    return {"device": device, "compute_type": compute_type, "path": path}
+
+
+def runs_on_gpu(device):
+    """True if a model loaded with this device runs on a GPU
+
+    "auto" is resolved the way CTranslate2 does: a GPU only if one is
+    visible to its CUDA/ROCm build, otherwise the CPU.
+    """
+    if device in ("cuda", "hip"):
+        return True
+    if device != "auto":
+        return False
+    try:
+        import ctranslate2
+        return ctranslate2.get_cuda_device_count() > 0
+    except Exception:
+        return False
+
+
+def available_memory_mb():
+    """Memory the OS can hand out right now (MemAvailable on Linux), or None if unknown"""
+    try:
+        with open("/proc/meminfo", 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _probe_file():
+    return cache_dir() / PROBE_FILENAME
+
+
+def load_probe(force=False):
+    """Cached probe result for this host, probing (and saving) only on a miss
+
+    The cache is keyed by host_fingerprint(), so a hardware change or an
+    upgrade of faster-whisper/ctranslate2/torch/openvino triggers a fresh
+    probe automatically. force=True always re-probes.
+    """
+    fingerprint = host_fingerprint()
+    probe_file = _probe_file()
+
+    if not force:
+        try:
+            with open(probe_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get("fingerprint") == fingerprint:
+                cached["cached"] = True
+                perf_log.event("hardware_probe", cached=True, device=cached["device"],
+                               compute_type=cached["compute_type"], path=cached["path"])
+                return cached
+            print("Hardware probe cache is stale (host or library versions changed), re-probing")
+        except (OSError, ValueError):
+            pass
+
+    started = time.perf_counter()
+    with perf_log.stage("hardware_probe", cached=False) as fields:
+        result = probe_hardware()
+        fields.update(result)
+    result.update({
+        "fingerprint": fingerprint,
+        "versions": library_versions(),
+        "probed_at": time.time(),
+        "probe_seconds": round(time.perf_counter() - started, 3),
+    })
+    _save_probe(result)
+    result["cached"] = False
+    return result
+
+
+def update_probe(**fields):
+    """Merge fields into the cached probe (e.g. the compute type that actually loaded)"""
+    try:
+        with open(_probe_file(), 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return
+    if cached.get("fingerprint") != host_fingerprint():
+        return
+    cached.update(fields)
+    _save_probe(cached)
+
+
+def clear_probe():
+    """Forget the cached probe so the next load_probe() runs the detection again"""
+    try:
+        _probe_file().unlink()
+    except OSError:
+        pass
+
+
+def _save_probe(result):
+    probe_file = _probe_file()
+    tmp_file = probe_file.with_suffix(".tmp")
+    try:
+        data = {k: v for k, v in result.items() if k != "cached"}
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_file, probe_file)
+    except OSError as e:
+        print(f"Could not save hardware probe cache: {e}")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+import itertools
+import queue
+import threading
+import time
+from pathlib import Path
+
+from cancellation import CancellationToken, TranscriptionCancelled
+
+_job_ids = itertools.count(1)
+
+# Queue priorities: a stop entry jumps ahead of queued jobs so an idle worker wakes up to retire
+_STOP_PRIORITY = 0
+_JOB_PRIORITY = 1
+
+
+class TranscriptionJob:
+    """One queued file plus its state, timing and result"""
+
+    def __init__(self, source, formats=("txt",)):
+        self.id = next(_job_ids)
+        self.source = source
+        self.formats = list(formats)  # Output files written beside the source
+        self.state = "queued"  # queued -> running -> done / failed / cancelled
+        self.cancel_token = CancellationToken()
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.audio_duration = 0.0
+        self.progress = 0.0  # Percent of audio decoded
+        self.segments = 0
+        self.result_segments = []  # Decoded segments, paged into the output box when the job is selected
+        self.info = None
+        self.output_path = None  # First of output_paths, for display
+        self.output_paths = []
+        self.error = None
+
+    @property
+    def name(self):
+        return Path(self.source).name
+
+    @property
+    def processing_time(self):
+        """Seconds spent running (so far, if still running)"""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    @property
+    def rtf(self):
+        """Real-time factor: processing time / audio duration (below 1 is faster than real time)"""
+        if not self.audio_duration:
+            return None
+        return self.processing_time / self.audio_duration
+
+
+class JobScheduler:
+    """Runs queued TranscriptionJobs on a pool of worker threads
+
+    run_job(job) does the actual work and may update the job's progress
+    fields, calling notify(job) to publish them. concurrency can be changed
+    at any time; extra workers retire after their current job. Idle
+    workers block on the queue and are woken by stop entries, never by a
+    timer.
+    """
+
+    def __init__(self, run_job, concurrency=1, on_update=None):
+        self.run_job = run_job
+        self.on_update = on_update
+        self.concurrency = max(1, concurrency)
+        self.jobs = []
+        self._queue = queue.PriorityQueue()  # (priority, order, job or None for stop)
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._workers = 0  # Live worker threads
+
+    def submit(self, source, formats=("txt",)):
+        job = TranscriptionJob(source, formats)
+        with self._lock:
+            self.jobs.append(job)
+        self._queue.put((_JOB_PRIORITY, next(self._order), job))
+        self.notify(job)
+        self._ensure_workers()
+        return job
+
+    def set_concurrency(self, concurrency):
+        with self._lock:
+            self.concurrency = max(1, int(concurrency))
+        self._retire_extra_workers()
+        self._ensure_workers()
+
+    def shutdown(self):
+        """Stop every worker after its current job; queued jobs stay queued"""
+        with self._lock:
+            self.concurrency = 0
+        self._retire_extra_workers()
+
+    def notify(self, job):
+        if self.on_update is not None:
+            self.on_update(job)
+
+    def pending(self):
+        """Jobs that are queued or running"""
+        with self._lock:
+            return [job for job in self.jobs if job.state in ("queued", "running")]
+
+    def cancel_all(self):
+        """Cancel queued jobs and stop running ones at their next segment"""
+        with self._lock:
+            jobs = [job for job in self.jobs if job.state in ("queued", "running")]
+        for job in jobs:
+            job.cancel_token.cancel()
+        return len(jobs)
+
+    def clear_finished(self):
+        with self._lock:
+            self.jobs = [job for job in self.jobs if job.state in ("queued", "running")]
+
+    def _ensure_workers(self):
+        with self._lock:
+            while self._workers < self.concurrency:
+                self._workers += 1
+                thread = threading.Thread(target=self._worker)
+                thread.daemon = True
+                thread.start()
+
+    def _retire_extra_workers(self):
+        """Wake one idle worker per worker above the concurrency; busy ones check after their job"""
+        with self._lock:
+            extra = self._workers - self.concurrency
+        for _ in range(extra):
+            self._queue.put((_STOP_PRIORITY, next(self._order), None))
+
+    def _should_retire(self):
+        with self._lock:
+            if self._workers > self.concurrency:
+                self._workers -= 1
+                return True
+            return False
+
+    def _worker(self):
+        while True:
+            if self._should_retire():
+                return
+            entry = self._queue.get()
+            job = entry[2]
+            if job is None:
+                self._queue.task_done()
+                continue  # Retires above if still needed; stale if concurrency went back up
+            if self._should_retire():
+                self._queue.put(entry)  # Back in its place for a remaining worker
+                self._queue.task_done()
+                return
+
+            if job.cancel_token.cancelled:
+                job.state = "cancelled"
+                job.finished = time.time()
+                self._queue.task_done()
+                self.notify(job)
+                continue
+
+            job.state = "running"
+            job.started = time.time()
+            self.notify(job)
+            try:
+                self.run_job(job)
+                job.state = "done"
+                job.progress = 100.0
+            except TranscriptionCancelled:
+                job.state = "cancelled"
+            except Exception as e:
+                job.state = "failed"
+                job.error = str(e)
+                print(f"Job {job.id} ({job.name}) failed: {e}")
+            finally:
+                job.finished = time.time()
+                self._queue.task_done()
+                self.notify(job)
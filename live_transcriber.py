@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+import threading
+import time
+
+
+class LiveTranscriber:
+    """Incremental transcription of a CaptureBuffer while it is still recording
+
+    Every step_seconds the uncommitted tail of the capture (at most
+    window_seconds long) is decoded again with word timestamps. Words that
+    two consecutive passes agree on are committed and never change; the rest
+    is reported as a tentative tail that later passes may revise.
+    """
+
+    def __init__(self, model, capture, on_commit, on_tentative, on_finished=None,
+                 window_seconds=10.0, step_seconds=0.5, min_audio_seconds=1.0):
+        self.model = model
+        self.capture = capture
+        self.on_commit = on_commit
+        self.on_tentative = on_tentative
+        self.on_finished = on_finished
+        self.sample_rate = capture.sample_rate
+        self.window_samples = int(window_seconds * self.sample_rate)
+        self.step_seconds = step_seconds
+        self.min_audio_samples = int(min_audio_seconds * self.sample_rate)
+
+        self.buffer_start = 0          # Absolute sample the decode window starts at
+        self.committed_time = 0.0      # Absolute end time (s) of the last committed word
+        self.committed_text = []
+        self.previous_words = []       # Uncommitted words from the last pass
+        self.passes = 0
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Ask the worker to run a final pass, commit everything and finish"""
+        self._stop_event.set()
+
+    @property
+    def text(self):
+        return "".join(self.committed_text).strip()
+
+    def _run(self):
+        try:
+            last_frames = 0
+            while not self._stop_event.is_set():
+                frames = self.capture.frames
+                if frames - self.buffer_start < self.min_audio_samples or frames == last_frames:
+                    self._stop_event.wait(self.step_seconds)
+                    continue
+
+                started = time.perf_counter()
+                last_frames = frames
+                self._process(frames, final=False)
+
+                # Decode time counts towards the step so lag stays bounded on slow machines
+                elapsed = time.perf_counter() - started
+                self._stop_event.wait(max(0.0, self.step_seconds - elapsed))
+
+            # Flush: everything left in the window is final now
+            self._process(self.capture.frames, final=True)
+            if self.on_finished is not None:
+                self.on_finished(self.text, None)
+        except Exception as e:
+            print(f"Live transcription error: {e}")
+            if self.on_finished is not None:
+                self.on_finished(self.text, e)
+
+    def _process(self, frames, final):
+        """Decode the current window and split it into committed and tentative words"""
+        if frames <= self.buffer_start:
+            if final:
+                self.on_tentative("")
+            return
+
+        audio = self.capture.read(self.buffer_start, frames)
+        offset = self.buffer_start / self.sample_rate
+
+        segments, info = self.model.transcribe(
+            audio,
+            beam_size=1,
+            best_of=1,
+            temperature=0.0,
+            word_timestamps=True,
+            condition_on_previous_text=False,
+            initial_prompt="".join(self.committed_text)[-200:] or None,
+        )
+        words = []
+        for segment in segments:
+            for word in segment.words or []:
+                start = offset + word.start
+                # Skip words that belong to audio we already committed
+                if start >= self.committed_time - 0.1:
+                    words.append((start, offset + word.end, word.word))
+        self.passes += 1
+
+        if final:
+            agreed = len(words)
+        else:
+            # LocalAgreement-2: commit the common prefix of the last two passes
+            agreed = 0
+            for new, old in zip(words, self.previous_words):
+                if _normalize(new[2]) != _normalize(old[2]):
+                    break
+                agreed += 1
+
+        if agreed:
+            self.committed_time = words[agreed - 1][1]
+            text = "".join(w[2] for w in words[:agreed])
+            self.committed_text.append(text)
+            self.on_commit(text)
+
+        self.previous_words = words[agreed:]
+        self.on_tentative("".join(w[2] for w in self.previous_words))
+
+        # Keep the decode window bounded by dropping committed audio from its start
+        if frames - self.buffer_start > self.window_samples:
+            committed_sample = int(self.committed_time * self.sample_rate)
+            if committed_sample > self.buffer_start:
+                self.buffer_start = committed_sample
+            else:
+                # Nothing stabilised inside a full window; commit it rather than let lag grow
+                self._force_commit(frames)
+
+    def _force_commit(self, frames):
+        if self.previous_words:
+            text = "".join(w[2] for w in self.previous_words)
+            self.committed_text.append(text)
+            self.committed_time = self.previous_words[-1][1]
+            self.on_commit(text)
+            self.on_tentative("")
+            self.previous_words = []
+        self.buffer_start = max(self.buffer_start, frames - self.min_audio_samples)
+
+
+def _normalize(word):
+    return word.strip().lower().strip('.,!?;:"\'')
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+
+import gc
+import threading
+import time
+from collections import OrderedDict
+
+import perf_log
+import tuning
+from synthetic_audio import synthesize_speechlike
+
+# Approximate parameter counts (millions) used to estimate resident size
+MODEL_PARAMS_M = {
+    "tiny": 39,
+    "base": 74,
+    "small": 244,
+    "medium": 769,
+    "large": 1550,
+    "turbo": 809,
+}
+
+WARM_UP_SECONDS = 3.0
+
+# Bytes per weight for each compute type; "auto"/"default" are assumed to be fp16-sized
+BYTES_PER_PARAM = {
+    "int8": 1,
+    "int8_float16": 1,
+    "int8_float32": 1,
+    "int8_bfloat16": 1,
+    "float16": 2,
+    "bfloat16": 2,
+    "float32": 4,
+}
+
+
+def estimate_model_mb(model_size, compute_type):
+    """Rough resident memory of a loaded model in MB (weights plus ~20% runtime overhead)"""
+    params = MODEL_PARAMS_M.get(model_size, MODEL_PARAMS_M["large"])
+    return params * BYTES_PER_PARAM.get(compute_type, 2) * 1.2
+
+
+class LoadedModel:
+    """A WhisperModel plus its BatchedInferencePipeline"""
+
+    def __init__(self, model_size, device, compute_type, model, batched_model, resources=None):
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type  # What actually loaded (may be "default" after a fallback)
+        self.model = model
+        self.batched_model = batched_model
+        self.resources = resources or {}  # batch_size/cpu_threads/num_workers it was loaded with
+        self.memory_mb = estimate_model_mb(model_size, compute_type)
+        self.warm_up_seconds = None  # {pipeline: first-segment seconds} once warm_up() has run
+
+
+def warm_up(entry, seconds=WARM_UP_SECONDS):
+    """Run a short synthetic clip through both pipelines so the first real request starts warm
+
+    CTranslate2 allocates its buffers and initializes kernels on the first
+    inference; paying that here moves it off the first transcription. Each
+    run goes through perf_log.InstrumentedTranscriber, so perf.jsonl gets
+    the cold first-segment latency to compare with later (warm) runs.
+    Returns {pipeline: seconds to the first segment, or to the end if the
+    clip produced none}.
+    """
+    clip = synthesize_speechlike(seconds)
+    results = {}
+    with perf_log.stage("warm_up", model=entry.model_size, device=entry.device,
+                        compute_type=entry.compute_type) as fields:
+        for pipeline, transcriber in (("regular", entry.model), ("batched", entry.batched_model)):
+            instrumented = perf_log.InstrumentedTranscriber(transcriber, model=entry.model_size,
+                                                            pipeline=pipeline, warm_up=True)
+            started = time.perf_counter()
+            segments, _ = instrumented.transcribe(clip, beam_size=1)
+            first = None
+            for _ in segments:
+                if first is None:
+                    first = time.perf_counter() - started
+            results[pipeline] = round(first if first is not None else time.perf_counter() - started, 4)
+        fields.update(results)
+    entry.warm_up_seconds = results
+    return results
+
+
+class ModelManager:
+    """LRU cache of loaded models keyed by (size, device, compute_type)
+
+    Models stay resident until the estimated total exceeds memory_budget_mb,
+    at which point the least recently used ones are dropped. A model that is
+    still referenced by a running transcription is only freed once that
+    transcription lets go of it.
+
+    cpu_threads, num_workers and the batch size come from tuning.load_tuning()
+    (host cores/memory, refined by calibration); pass num_workers to fix the
+    number of parallel transcriptions instead. With warm_up, each newly built
+    model runs warm_up() before load() returns it.
+    """
+
+    def __init__(self, memory_budget_mb=4096, num_workers=None, warm_up=False):
+        self.memory_budget_mb = memory_budget_mb
+        self.num_workers = num_workers
+        self.warm_up = warm_up
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()  # One model construction at a time
+
+    @staticmethod
+    def key(model_size, device, compute_type):
+        return (model_size, device, compute_type)
+
+    def get(self, model_size, device, compute_type):
+        """Cached model or None; a hit marks it most recently used"""
+        key = self.key(model_size, device, compute_type)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+            return entry
+
+    def load(self, model_size, device, compute_type, cancel_token=None):
+        """Return the cached model or build it, evicting LRU entries to fit the budget
+
+        cancel_token (a cancellation.CancellationToken) is checked between
+        the download, eviction and construction phases; a model finished
+        after a cancel is dropped rather than cached.
+        """
+        entry = self.get(model_size, device, compute_type)
+        if entry is not None:
+            return entry
+
+        with self._load_lock:
+            # Another thread may have finished the same load while we waited
+            entry = self.get(model_size, device, compute_type)
+            if entry is not None:
+                return entry
+
+            # Imported here so importing this module stays cheap at GUI startup
+            from faster_whisper import WhisperModel, BatchedInferencePipeline
+            from faster_whisper.utils import download_model
+
+            self._check_cancelled(cancel_token)
+            with perf_log.stage("model_download", model=model_size):
+                # A no-op once the weights are in the Hugging Face cache
+                model_path = download_model(model_size) if model_size in MODEL_PARAMS_M else model_size
+            self._check_cancelled(cancel_token)
+
+            # Make room before allocating so peak memory stays within budget
+            self._evict_to_fit(estimate_model_mb(model_size, compute_type))
+
+            resources = tuning.load_tuning(model_size, device, compute_type,
+                                           estimate_model_mb(model_size, compute_type), self.num_workers)
+
+            with perf_log.stage("model_load", model=model_size, device=device,
+                                compute_type=compute_type, **resources) as fields:
+                actual_compute_type = compute_type
+                try:
+                    model = WhisperModel(
+                        model_path,
+                        device=device,
+                        compute_type=compute_type,
+                        cpu_threads=resources["cpu_threads"],
+                        num_workers=resources["num_workers"]  # Parallel transcriptions
+                    )
+                except Exception as model_error:
+                    # Fallback to default compute type if optimized type fails
+                    print(f"Optimized compute type failed, trying default: {model_error}")
+                    self._check_cancelled(cancel_token)
+                    actual_compute_type = "default"
+                    model = WhisperModel(
+                        model_path,
+                        device=device,
+                        compute_type="default",
+                        cpu_threads=resources["cpu_threads"],
+                        num_workers=resources["num_workers"]
+                    )
+
+                batched_model = tuning.AdaptiveBatchTranscriber(BatchedInferencePipeline(model=model),
+                                                                resources["batch_size"],
+                                                                (model_size, device, compute_type))
+                entry = LoadedModel(model_size, device, actual_compute_type, model, batched_model, resources)
+                fields["actual_compute_type"] = actual_compute_type
+
+            if self.warm_up and not (cancel_token is not None and cancel_token.cancelled):
+                try:
+                    warm_up(entry)
+                except Exception as e:
+                    # The model itself loaded fine; the first real request just starts cold
+                    print(f"Warm-up failed: {e}")
+
+            if cancel_token is not None and cancel_token.cancelled:
+                del entry, model, batched_model
+                gc.collect()
+                cancel_token.raise_if_cancelled()
+
+            with self._lock:
+                self._cache[self.key(model_size, device, compute_type)] = entry
+            return entry
+
+    @staticmethod
+    def _check_cancelled(cancel_token):
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+
+    def _evict_to_fit(self, incoming_mb):
+        with self._lock:
+            while self._cache and self._used_mb() + incoming_mb > self.memory_budget_mb:
+                key, entry = self._cache.popitem(last=False)
+                print(f"Evicting cached model {key} (~{entry.memory_mb:.0f} MB)")
+
+    def _used_mb(self):
+        return sum(entry.memory_mb for entry in self._cache.values())
+
+    @property
+    def memory_used_mb(self):
+        with self._lock:
+            return self._used_mb()
+
+    def loaded_keys(self):
+        """Cached keys, least recently used first"""
+        with self._lock:
+            return list(self._cache.keys())
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import hardware_probe
+import perf_log
+import thread_budget
+from segment_times import replace_fields, shift_segment
+from model_manager import estimate_model_mb
+
+SAMPLE_RATE = 16000
+
+# Working memory per worker on top of the weights: decoder state, features and the chunk itself
+WORKER_OVERHEAD_MB = 600
+
+
+def plan_chunks(audio, chunk_seconds=300.0, min_silence_ms=500):
+    """Split 16 kHz audio into ~chunk_seconds pieces, cutting only in the middle of pauses
+
+    Returns a list of (start, end) sample offsets that cover the whole
+    array back to back. A single run of speech longer than chunk_seconds is
+    kept whole rather than cut mid-word. Audio with no speech gives [].
+    """
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    speech = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=min_silence_ms, speech_pad_ms=200))
+    if not speech:
+        return []
+
+    target = int(chunk_seconds * SAMPLE_RATE)
+    cuts = [0]
+    for previous, region in zip(speech, speech[1:]):
+        if region["end"] - cuts[-1] > target:
+            cuts.append((previous["end"] + region["start"]) // 2)
+    cuts.append(len(audio))
+    return list(zip(cuts, cuts[1:]))
+
+
+def plan_workers(model_size, requested=None, cpu_count=None, available_mb=None):
+    """(workers, cpu_threads per worker) for this host
+
+    Defaults to one worker per 4 of the thread budget's usable cores, capped
+    by how many int8 model copies fit in available memory; the cores are
+    split evenly between workers.
+    """
+    cpu_count = cpu_count or thread_budget.current().usable
+    workers = requested or max(1, cpu_count // 4)
+    if available_mb is None:
+        available_mb = hardware_probe.available_memory_mb()
+    if available_mb is not None:
+        per_worker = estimate_model_mb(model_size, "int8") + WORKER_OVERHEAD_MB
+        workers = min(workers, max(1, int(available_mb * 0.8 // per_worker)))
+    workers = max(1, min(workers, cpu_count))
+    return workers, max(1, cpu_count // workers)
+
+
+# Per-process model, created by the pool initializer
+_worker_model = None
+
+
+def _init_worker(model_size, cpu_threads):
+    global _worker_model
+    from faster_whisper import WhisperModel
+    with perf_log.stage("model_load", model=model_size, device="cpu", compute_type="int8",
+                        cpu_threads=cpu_threads, worker=os.getpid()):
+        _worker_model = WhisperModel(model_size, device="cpu", compute_type="int8", cpu_threads=cpu_threads)
+
+
+def _transcribe_chunk(audio, offset, params):
+    """Worker side: transcribe one chunk and return its segments on the global timeline"""
+    started = time.perf_counter()
+    segments, info = _worker_model.transcribe(audio, **params)
+    shifted = [shift_segment(segment, offset) for segment in segments]
+    perf_log.event("parallel_chunk", offset=round(offset, 3), audio_seconds=round(len(audio) / SAMPLE_RATE, 3),
+                   seconds=round(time.perf_counter() - started, 4), segments=len(shifted), worker=os.getpid())
+    return shifted, info.language, info.language_probability
+
+
+def _detect_language(audio, params):
+    """Worker side: (language, probability) of the audio's opening, as transcribe() would detect it"""
+    with perf_log.stage("parallel_language", worker=os.getpid()) as fields:
+        language, probability, _ = _worker_model.detect_language(
+            audio, vad_filter=params.get("vad_filter", False), vad_parameters=params.get("vad_parameters"),
+            language_detection_segments=params.get("language_detection_segments", 1),
+            language_detection_threshold=params.get("language_detection_threshold", 0.5))
+        fields["language"] = language
+    return language, probability
+
+
+class ParallelTranscriber:
+    """Transcribes long audio by splitting it at pauses and fanning the pieces out to processes
+
+    Each worker process holds its own CPU int8 WhisperModel, so throughput
+    scales with the worker count instead of being bound to one model
+    instance. Segments come back in order with timestamps relative to the
+    start of the original audio. Without a language in params it is
+    detected once on the opening chunk and passed to every chunk, so they
+    all decode the same language. transcribe() mirrors WhisperModel's
+    signature, so the cache and perf wrappers work unchanged.
+    """
+
+    compute_type = "int8"
+
+    def __init__(self, model_size="turbo", workers=None, chunk_seconds=300.0):
+        self.model_size = model_size
+        self.chunk_seconds = chunk_seconds
+        self.workers, self.cpu_threads = plan_workers(model_size, workers)
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            print(f"Starting {self.workers} transcription workers "
+                  f"({self.model_size}, int8, {self.cpu_threads} threads each)")
+            # spawn: forked children would inherit the parent's OpenMP/CTranslate2 thread state
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_size, self.cpu_threads),
+            )
+        return self._pool
+
+    def transcribe(self, audio, **params):
+        """(segments, info) like WhisperModel.transcribe; segments is a generator in time order"""
+        if isinstance(audio, (str, os.PathLike)):
+            from faster_whisper import decode_audio
+            with perf_log.stage("decode", file=os.path.basename(str(audio)), pipeline="parallel") as fields:
+                audio = decode_audio(str(audio), sampling_rate=SAMPLE_RATE)
+                fields["audio_seconds"] = round(len(audio) / SAMPLE_RATE, 3)
+
+        with perf_log.stage("parallel_plan", workers=self.workers) as fields:
+            chunks = plan_chunks(audio, self.chunk_seconds)
+            fields["chunks"] = len(chunks)
+
+        pool = self._get_pool()
+        info = SimpleNamespace(language=params.get("language"), language_probability=1.0,
+                               duration=len(audio) / SAMPLE_RATE,
+                               duration_after_vad=sum(end - start for start, end in chunks) / SAMPLE_RATE)
+        if chunks and info.language is None:
+            # One detection on the opening chunk, as a single-model run would, instead of one per chunk
+            start, end = chunks[0]
+            info.language, info.language_probability = pool.submit(_detect_language, audio[start:end],
+                                                                   params).result()
+            params = dict(params, language=info.language)
+
+        # Chunks are views into audio, so queuing them all costs no extra memory here
+        futures = [pool.submit(_transcribe_chunk, audio[start:end], start / SAMPLE_RATE, params)
+                   for start, end in chunks]
+        return self._collect(futures), info
+
+    def _collect(self, futures):
+        try:
+            segment_id = 0
+            for future in futures:
+                segments, _, _ = future.result()
+                for segment in segments:
+                    segment_id += 1
+                    yield replace_fields(segment, id=segment_id)
+        finally:
+            # Abandoned early: don't keep the workers busy on chunks nobody will read
+            for future in futures:
+                future.cancel()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
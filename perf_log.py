@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+
+import json
+import logging
+import logging.handlers
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+PERF_LOG_NAME = "perf.jsonl"
+PERF_LOG_MAX_BYTES = 5 * 1024 * 1024
+PERF_LOG_BACKUPS = 3
+
+_logger = logging.getLogger("speech_to_text.perf")
+_setup_lock = threading.Lock()
+_configured = False
+_used_transcribers = weakref.WeakSet()  # Models that have run at least once in this process
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, thread, event name and its fields"""
+
+    def format(self, record):
+        data = {"ts": round(record.created, 3), "thread": record.threadName}
+        if isinstance(record.msg, dict):
+            data.update(record.msg)
+        else:
+            data["message"] = record.getMessage()
+        return json.dumps(data, default=str)
+
+
+def get_logger():
+    """The perf logger, writing to a rotating perf.jsonl in the cache dir on first use"""
+    global _configured
+    if _configured:
+        return _logger
+    with _setup_lock:
+        if not _configured:
+            _logger.setLevel(logging.INFO)
+            _logger.propagate = False
+            try:
+                # Imported here because hardware_probe itself logs through this module
+                from hardware_probe import cache_dir
+                handler = logging.handlers.RotatingFileHandler(
+                    cache_dir() / PERF_LOG_NAME, maxBytes=PERF_LOG_MAX_BYTES,
+                    backupCount=PERF_LOG_BACKUPS, encoding='utf-8')
+                handler.setFormatter(JsonLinesFormatter())
+            except OSError as e:
+                print(f"Perf log disabled: {e}")
+                handler = logging.NullHandler()
+            _logger.addHandler(handler)
+            _configured = True
+    return _logger
+
+
+def event(name, **fields):
+    """Log a single structured event"""
+    get_logger().info({"event": name, **fields})
+
+
+@contextmanager
+def stage(name, **fields):
+    """Time a block and log it as a stage; the yielded dict can be filled with extra fields"""
+    started = time.perf_counter()
+    try:
+        yield fields
+    except BaseException as e:
+        fields["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        fields["seconds"] = round(time.perf_counter() - started, 4)
+        event("stage", stage=name, **fields)
+
+
+class RunStats:
+    """Live throughput of one transcription: RTF, segments/s and elapsed time"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.segments = 0
+        self.audio_position = 0.0  # End time of the latest segment
+
+    def update(self, segment_end, count=1):
+        self.segments += count
+        self.audio_position = max(self.audio_position, segment_end)
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rtf(self):
+        """Processing time per second of audio decoded so far"""
+        return self.elapsed / self.audio_position if self.audio_position else None
+
+    @property
+    def segments_per_second(self):
+        return self.segments / self.elapsed if self.elapsed > 0 else 0.0
+
+    def line(self):
+        minutes, seconds = divmod(int(self.elapsed), 60)
+        rtf = f"RTF {self.rtf:.2f}" if self.rtf is not None else "RTF -"
+        return f"{rtf} · {self.segments_per_second:.1f} seg/s · {minutes}:{seconds:02d} elapsed"
+
+    def as_dict(self):
+        return {
+            "elapsed": round(self.elapsed, 3),
+            "segments": self.segments,
+            "audio_seconds": round(self.audio_position, 3),
+            "rtf": round(self.rtf, 4) if self.rtf is not None else None,
+            "segments_per_second": round(self.segments_per_second, 3),
+        }
+
+
+class InstrumentedTranscriber:
+    """Wraps a WhisperModel/BatchedInferencePipeline and logs each stage of a transcription
+
+    Stages: prepare (the transcribe() call itself: VAD, feature extraction,
+    language detection) and one segment event per yielded segment with the
+    time spent producing it (encoder + decoder; the library does not expose
+    those separately). Decoding is logged where it happens: decode_window
+    events from iter_audio_windows and ParallelTranscriber's decode stage.
+    The closing transcription event carries the latency from the call to the
+    first segment and whether this was the model's first (cold) run in the
+    process.
+    """
+
+    def __init__(self, transcriber, **labels):
+        self.transcriber = transcriber
+        self.labels = labels
+
+    def transcribe(self, audio, **params):
+        called = time.perf_counter()
+        try:
+            cold = self.transcriber not in _used_transcribers
+            _used_transcribers.add(self.transcriber)
+        except TypeError:
+            cold = None  # Not weak-referenceable; can't tell
+        with stage("prepare", params=params, **self.labels) as fields:
+            segments, info = self.transcriber.transcribe(audio, **params)
+            fields["audio_seconds"] = round(info.duration, 3)
+        return self._timed(segments, called, cold), info
+
+    def _timed(self, segments, called, cold):
+        stats = RunStats()
+        previous = time.perf_counter()
+        first_segment = None
+        for segment in segments:
+            now = time.perf_counter()
+            if first_segment is None:
+                first_segment = round(now - called, 4)
+            stats.update(segment.end)
+            event("segment", index=stats.segments, seconds=round(now - previous, 4),
+                  start=round(segment.start, 2), end=round(segment.end, 2), **self.labels)
+            previous = now
+            yield segment
+        event("transcription", first_segment_seconds=first_segment, cold=cold, **stats.as_dict(), **self.labels)
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+
+import dataclasses
+from types import SimpleNamespace
+
+
+def replace_fields(obj, **changes):
+    """dataclasses.replace that also handles the namespaces cached and server segments come as"""
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.replace(obj, **changes)
+    if hasattr(obj, "_replace"):
+        return obj._replace(**changes)
+    return SimpleNamespace(**{**vars(obj), **changes})
+
+
+def shift_segment(segment, offset):
+    """The segment with its (and its words') timestamps moved by offset seconds"""
+    words = segment.words
+    if words:
+        words = [replace_fields(w, start=round(w.start + offset, 3), end=round(w.end + offset, 3))
+                 for w in words]
+    return replace_fields(segment, start=round(segment.start + offset, 3),
+                          end=round(segment.end + offset, 3), words=words)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+import time
+
+import perf_log
+from segment_times import replace_fields
+
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.02
+KEEP_PAUSE_SECONDS = 0.4  # Longer pauses are cut down to this, half on each side
+
+
+class TimeMap:
+    """Maps timestamps in gated audio back to the original recording
+
+    Holds the start of every kept span in both timelines. A time that
+    falls exactly on a cut belongs to the following span when it's a start
+    and to the preceding one when it's an end, so segments never stretch
+    across removed silence.
+    """
+
+    def __init__(self, gated_starts, original_starts):
+        self.gated_starts = gated_starts
+        self.original_starts = original_starts
+
+    @classmethod
+    def identity(cls):
+        return cls([0.0], [0.0])
+
+    def to_original(self, seconds, end=False):
+        import numpy as np
+        side = 'left' if end else 'right'
+        span = max(0, int(np.searchsorted(self.gated_starts, seconds, side=side)) - 1)
+        return round(float(self.original_starts[span] + seconds - self.gated_starts[span]), 3)
+
+
+def gate_silence(audio, threshold, sample_rate=SAMPLE_RATE, keep_pause=KEEP_PAUSE_SECONDS):
+    """Drop silence from a float32 recording; returns (gated_audio, TimeMap)
+
+    Frames of FRAME_SECONDS whose mean-square energy is at or below
+    threshold count as silence. Leading and trailing silence is trimmed to
+    half of keep_pause and every inner pause to keep_pause, so words keep
+    their onsets and decays. Audio with no frame above the threshold is
+    returned unchanged.
+    """
+    import numpy as np
+
+    frame = int(FRAME_SECONDS * sample_rate)
+    count = len(audio) // frame
+    if count == 0:
+        return audio, TimeMap.identity()
+    frames = np.asarray(audio[:count * frame]).reshape(count, frame)
+    voiced = np.einsum('ij,ij->i', frames, frames) / frame > threshold
+    if not voiced.any():
+        return audio, TimeMap.identity()
+
+    # Runs of voiced frames as [start, stop) frame indices
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.view(np.int8), [0]))))
+    starts, stops = edges[::2], edges[1::2]
+
+    pad = int(keep_pause / 2 * sample_rate)
+    spans = []
+    for start, stop in zip(starts * frame, stops * frame):
+        start, stop = max(0, start - pad), min(len(audio), stop + pad)
+        if spans and start <= spans[-1][1]:
+            spans[-1][1] = stop  # Pause short enough to keep whole
+        else:
+            spans.append([start, stop])
+    if spans[-1][1] == count * frame:
+        spans[-1][1] = len(audio)  # Keep the partial frame at the end
+
+    if len(spans) == 1 and spans[0] == [0, len(audio)]:
+        return audio, TimeMap.identity()
+
+    lengths = np.array([stop - start for start, stop in spans])
+    gated_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])) / sample_rate
+    original_starts = np.array([start for start, _ in spans]) / sample_rate
+    gated = np.concatenate([audio[start:stop] for start, stop in spans])
+    return gated, TimeMap(gated_starts, original_starts)
+
+
+def remap_segment(segment, time_map):
+    """The segment with its (and its words') timestamps moved to the original timeline"""
+    words = segment.words
+    if words:
+        words = [replace_fields(w, start=time_map.to_original(w.start), end=time_map.to_original(w.end, end=True))
+                 for w in words]
+    return replace_fields(segment, start=time_map.to_original(segment.start),
+                          end=time_map.to_original(segment.end, end=True), words=words)
+
+
+class SilenceGatedTranscriber:
+    """Transcribes in-memory recordings with their long pauses cut out
+
+    Wraps a WhisperModel/BatchedInferencePipeline (or a server client).
+    Arrays go through gate_silence() first, so a dictation with long
+    thinking pauses decodes in proportion to the speech in it; segment and
+    word timestamps are mapped back to the original recording and
+    info.duration is the original length. Paths are passed straight through.
+    """
+
+    def __init__(self, transcriber, threshold, keep_pause=KEEP_PAUSE_SECONDS):
+        self.transcriber = transcriber
+        self.threshold = threshold
+        self.keep_pause = keep_pause
+
+    def transcribe(self, audio, **params):
+        if isinstance(audio, str) or not hasattr(audio, "dtype"):
+            return self.transcriber.transcribe(audio, **params)
+
+        started = time.perf_counter()
+        gated, time_map = gate_silence(audio, self.threshold, keep_pause=self.keep_pause)
+        duration = len(audio) / SAMPLE_RATE
+        perf_log.event("silence_gate", audio_seconds=round(duration, 3),
+                       gated_seconds=round(len(gated) / SAMPLE_RATE, 3), spans=len(time_map.gated_starts),
+                       seconds=round(time.perf_counter() - started, 4))
+        segments, info = self.transcriber.transcribe(gated, **params)
+        if gated is audio:
+            return segments, info
+        return self._remapped(segments, time_map), replace_fields(info, duration=duration)
+
+    @staticmethod
+    def _remapped(segments, time_map):
+        try:
+            for segment in segments:
+                yield remap_segment(segment, time_map)
+        finally:
+            close = getattr(segments, "close", None)
+            if close is not None:
+                close()
@@ -1,24 +1,75 @@
 #!/usr/bin/env python3
 
+import time
+_PROCESS_START = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-from faster_whisper import WhisperModel, BatchedInferencePipeline
 import threading
+import queue
 import os
 from pathlib import Path
-import sounddevice as sd
-import soundfile as sf
-import tempfile
-import time
-import numpy as np
 import gc
-import logging
+from concurrent.futures import Future
+from types import SimpleNamespace
+from cancellation import CancellationToken, TranscriptionCancelled, cancellable
+from engine_host import EngineHost, EngineTranscriber
+from live_transcriber import LiveTranscriber
+from job_queue import JobScheduler
+from transcript_cache import TranscriptCache, transcribe_cached
+from transcript_store import TranscriptStore
+from transcript_writers import FORMATS, TranscriptWriters, write_transcript
+from model_manager import ModelManager
+from silence_gate import SilenceGatedTranscriber
+from streaming_audio import StreamingTranscriber
+import hardware_probe
+import perf_log
+import thread_budget
+import transcription_server
+
+# numpy, sounddevice, soundfile and faster_whisper are imported lazily (inside the
+# methods that need them) so the window can paint before they load; see
+# SpeechToTextApp._warm_imports_worker. The helper modules imported above
+# (silence_gate, streaming_audio, engine_host, ...) keep numpy and av imports
+# inside their functions for the same reason.
+HEAVY_MODULES = ["numpy", "soundfile", "sounddevice", "audio_capture", "faster_whisper"]
+
+
+class StartupTimer:
+    """Startup milestones in seconds since process start, reported once the model is ready"""
+    
+    def __init__(self, start):
+        self.start = start
+        self.marks = {}
+        self.imports = {}
+        self.reported = False
+    
+    def mark(self, name):
+        # First occurrence wins so re-loading a model later doesn't skew the report
+        if name not in self.marks:
+            self.marks[name] = round(time.perf_counter() - self.start, 3)
+    
+    def report(self):
+        """Print the breakdown and record it as a "startup" event in the perf log"""
+        if self.reported:
+            return
+        self.reported = True
+        summary = ", ".join(f"{name} {value:.2f}s" for name, value in self.marks.items())
+        slowest = sorted(self.imports.items(), key=lambda item: -item[1])[:3]
+        print(f"Startup timing: {summary}")
+        if slowest:
+            print("  slowest imports: " + ", ".join(f"{name} {value:.2f}s" for name, value in slowest))
+        perf_log.event("startup", marks=self.marks, imports=self.imports)
+
 
 class SpeechToTextApp:
-    def __init__(self, root):
+    def __init__(self, root, startup_timer=None, server_url=None, engine_process=True):
         self.root = root
+        self.startup_timer = startup_timer or StartupTimer(_PROCESS_START)
+        self.server_url = server_url  # Transcribe through a running transcription_server instead of locally
+        self.engine_process = engine_process  # Run local models in a separate engine process
         self.root.title("Speech to Text - Whisper")
-        self.root.geometry("900x700")
+        self.root.geometry("900x820")
         
         # Modern dark theme colors
         self.colors = {
@@ -41,26 +92,112 @@ class SpeechToTextApp:
         self.model_size = "turbo"
         self.model_loaded = False
         self.model_loading = False
+        self.model_request_id = 0  # Bumped on every model request so superseded loads can be spotted
+        self.model_state_lock = threading.Lock()
+        # Resolved with the loaded entry (or failure) of the newest request; workers block on it
+        self.model_ready = Future()
+        self.device = None  # From the persisted hardware probe
+        self.compute_type = None
+        self.model_memory_budget_mb = 4096  # Estimated RAM the cached models may use together
+        self.warm_up_models = True  # Run a short synthetic clip through new models before reporting ready
+        if self.engine_process:
+            # Inference, decode and their GC run outside the Tk process; a crash there restarts the engine
+            self.model_manager = EngineHost(memory_budget_mb=self.model_memory_budget_mb, warm_up=self.warm_up_models,
+                                            on_exit=lambda code: self.root.after(0, self._engine_exited, code))
+        else:
+            self.model_manager = ModelManager(memory_budget_mb=self.model_memory_budget_mb,
+                                              warm_up=self.warm_up_models)
+        self.model_compute_type = None  # Compute type the active model actually loaded with
+        self.model_load_token = None  # Cancels the load in progress between phases
+        self.transcription_token = None  # Cancels the file transcription in progress
+        
+        # Finished transcriptions keyed by audio content + model + decode settings
+        try:
+            self.transcript_cache = TranscriptCache()
+        except Exception as e:
+            print(f"Transcription cache disabled: {e}")
+            self.transcript_cache = None
+        
+        # Multi-file job queue sharing the loaded model
+        # The thread budget's job count matches the model's num_workers so jobs don't serialize inside CTranslate2
+        self.job_concurrency = thread_budget.current().jobs
+        self.job_scheduler = JobScheduler(self._run_queue_job, concurrency=self.job_concurrency,
+                                          on_update=lambda job: self.root.after(0, self._refresh_job_row, job))
+        self.cpu_monitor = thread_budget.CpuMonitor()  # This process plus the engine, against the budget
+        self.cpu_poll_interval = 1000  # ms between CPU utilization readings
         self.transcribing = False  # Flag to disable animations during transcription
         
+        # Segment streaming from the transcription worker to the Tk thread
+        self.segment_queue = queue.Queue(maxsize=256)  # Bounded so a slow UI backpressures the decoder
+        self.ui_frame_interval = 33  # ms between queue drains (~30 fps)
+        self.segment_batch_limit = 64  # Max segments inserted per frame
+        self.segments_streamed = 0  # Counted on the worker side
+        self.segments_received = 0  # Counted on the UI side
+        self.audio_duration = 0.0
+        self.run_stats = None  # perf_log.RunStats for the transcription on screen
+        
+        # Output view: text lives in the store, the widget shows at most a couple of pages of it
+        self.transcript = TranscriptStore(page_size=1000)  # Segments per page
+        self.output_pages_shown = 2  # Pages kept in the widget while following the end
+        self.output_first_page = 0  # First page in the widget while following
+        self.output_page = None  # Page being browsed, None while following the end
+        self.output_pieces_shown = 0  # Store pieces already inserted while following
+        self.output_render_id = 0  # Bumped to abandon a chunked render in progress
+        self.output_rendering = False
+        self.output_chunk_chars = 16384  # Characters inserted per event-loop turn
+        
         # Recording state
         self.is_recording = False
-        self.recorded_file = None
+        self.recorded_file = None  # Last persisted recording, kept on disk
+        self.recordings_dir = Path.home() / "Speech to Text Recordings"
         self.recording_data = []
-        self.recording_chunks = []
+        self.recording_finished = True  # Set on the UI thread once the recording thread has filled recording_data
+        self.recording_stopping = False  # Stop was pressed; the audio is processed when the thread finishes
+        self.capture = None  # CaptureBuffer for the current/last recording
+        self.capture_memory_limit = 20 * 60  # Seconds kept in RAM before older audio spills to disk
+        self.live_transcriber = None  # Set while live dictation is running
         self.sample_rate = 16000
-        self.sensitivity_threshold = 0.0001  # Much lower threshold
+        self.sensitivity_threshold = 0.0001  # Mean-square energy below which a block counts as silence
         self.current_level = 0.0
-        self.level_update_counter = 0  # Throttle UI updates
+        self.level_meter = None  # LevelMeter fed by the audio callback while recording
+        self.level_blocks_seen = 0
+        self.recording_gate_threshold = None  # Silence gate for the recording being transcribed, None = off
+        self.pending_recordings = []  # (audio, gate threshold) stopped while another transcription was running
         
         self.setup_ui()
+        self.startup_timer.mark('ui_built')
         
-        # Start model preloading in background
-        self.start_model_preloading()
+        # Heavy imports and model preloading start once the window has painted
+        self.root.after_idle(self._start_background_startup)
         
         # Setup cleanup on window close
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
     
+    def _start_background_startup(self):
+        """Kick off deferred imports and model preloading after the first paint"""
+        self.startup_timer.mark('window_shown')
+        
+        thread = threading.Thread(target=self._warm_imports_worker)
+        thread.daemon = True
+        thread.start()
+        
+        # Start model preloading in background
+        self.start_model_preloading()
+        self.root.after(self.cpu_poll_interval, self._poll_cpu_usage)
+    
+    def _warm_imports_worker(self):
+        """Import the heavy modules in the background so first use doesn't stall the UI"""
+        import importlib
+        for name in HEAVY_MODULES:
+            started = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                # e.g. PortAudio missing: recording will report it when used, files still work
+                print(f"Deferred import of {name} failed: {e}")
+            self.startup_timer.imports[name] = round(time.perf_counter() - started, 3)
+        self.startup_timer.mark('imports_done')
+    
     def setup_theme(self):
         """Setup modern dark theme"""
         self.root.configure(bg=self.colors['bg'])
@@ -148,6 +285,31 @@ class SpeechToTextApp:
                  background=[('active', '#dc2626'),
                            ('pressed', '#dc2626')])
         
+        style.configure('Modern.Treeview',
+                       background=self.colors['bg'],
+                       fieldbackground=self.colors['bg'],
+                       foreground=self.colors['text'],
+                       borderwidth=0,
+                       font=('Segoe UI', 9))
+        
+        style.configure('Modern.Treeview.Heading',
+                       background=self.colors['surface'],
+                       foreground=self.colors['text_secondary'],
+                       relief='flat',
+                       font=('Segoe UI', 9, 'bold'))
+        
+        style.map('Modern.Treeview',
+                 background=[('selected', self.colors['primary'])],
+                 foreground=[('selected', 'white')])
+        
+        style.configure('Surface.TCheckbutton',
+                       background=self.colors['surface'],
+                       foreground=self.colors['text_secondary'],
+                       font=('Segoe UI', 9))
+        
+        style.map('Surface.TCheckbutton',
+                 background=[('active', self.colors['surface'])])
+        
     def setup_ui(self):
         # Main container with modern styling
         main_frame = ttk.Frame(self.root, style='Modern.TFrame', padding="20")
@@ -157,7 +319,7 @@ class SpeechToTextApp:
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
         main_frame.columnconfigure(1, weight=1)
-        main_frame.rowconfigure(5, weight=1)
+        main_frame.rowconfigure(6, weight=1)
         
         # Title
         title_label = ttk.Label(main_frame, text="Speech to Text", style='Title.TLabel')
@@ -176,6 +338,11 @@ class SpeechToTextApp:
         model_combo.grid(row=0, column=1, sticky=tk.W+tk.E, pady=5, padx=(15, 0))
         model_combo.bind('<<ComboboxSelected>>', self.on_model_change)
         
+        reprobe_btn = ttk.Button(model_frame, text="Re-detect Hardware", command=self.reprobe_hardware,
+                                 style='Secondary.TButton')
+        reprobe_btn.grid(row=0, column=2, pady=5, padx=(10, 0))
+        self.add_button_hover_effect(reprobe_btn)
+        
         # File selection section
         file_section = ttk.Frame(main_frame, style='Surface.TFrame', padding="15")
         file_section.grid(row=2, column=0, columnspan=2, sticky=tk.W+tk.E, pady=(0, 15))
@@ -202,6 +369,27 @@ class SpeechToTextApp:
         self.mic_btn.grid(row=0, column=2)
         self.add_button_hover_effect(self.mic_btn)
         
+        # Recordings are transcribed from memory; optionally also keep a WAV copy
+        self.persist_recording_var = tk.BooleanVar(value=False)
+        persist_check = ttk.Checkbutton(file_section, text="Keep recordings as WAV files",
+                                        variable=self.persist_recording_var,
+                                        style='Surface.TCheckbutton')
+        persist_check.grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=(8, 0))
+        
+        # Live dictation: transcribe a rolling window while still recording
+        self.live_mode_var = tk.BooleanVar(value=False)
+        live_check = ttk.Checkbutton(file_section, text="Live transcription while recording",
+                                     variable=self.live_mode_var,
+                                     style='Surface.TCheckbutton')
+        live_check.grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=(4, 0))
+        
+        # Cut long pauses out of recordings before decoding (timestamps still match the recording)
+        self.trim_silence_var = tk.BooleanVar(value=True)
+        trim_check = ttk.Checkbutton(file_section, text="Skip silence in recordings (uses sensitivity)",
+                                     variable=self.trim_silence_var,
+                                     style='Surface.TCheckbutton')
+        trim_check.grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=(4, 0))
+        
         # Action buttons section
         action_frame = ttk.Frame(main_frame, style='Modern.TFrame')
         action_frame.grid(row=3, column=0, columnspan=2, pady=(0, 20))
@@ -213,6 +401,12 @@ class SpeechToTextApp:
         # Add hover effect animation
         self.add_button_hover_effect(self.transcribe_btn)
         
+        # Stops the running transcription, queued jobs and any model load at the next segment/phase
+        self.cancel_btn = ttk.Button(action_frame, text="Cancel", command=self.cancel_transcription,
+                                     style='Secondary.TButton', state='disabled')
+        self.cancel_btn.pack(pady=(0, 5))
+        self.add_button_hover_effect(self.cancel_btn)
+        
         # Test microphone button
         test_mic_btn = ttk.Button(action_frame, text="Test Microphone", 
                                  command=self.test_microphone, style='Secondary.TButton')
@@ -258,19 +452,88 @@ class SpeechToTextApp:
         self.level_label = ttk.Label(level_frame, text="0%", style='Modern.TLabel', font=('Segoe UI', 8))
         self.level_label.grid(row=0, column=2, sticky=tk.W)
         
+        # Clipping / silence / dropped-audio warnings from the level meter
+        self.level_state_label = ttk.Label(level_frame, text="", style='Modern.TLabel', font=('Segoe UI', 8))
+        self.level_state_label.grid(row=0, column=3, sticky=tk.W, padx=(10, 0))
+        
         self.status_var = tk.StringVar(value="Ready")
         self.status_label = ttk.Label(progress_frame, textvariable=self.status_var, 
                                      style='Modern.TLabel', font=('Segoe UI', 9))
         self.status_label.grid(row=2, column=0, pady=5)
         
+        # Job queue section (multi-file transcription)
+        queue_frame = ttk.Frame(main_frame, style='Surface.TFrame', padding="15")
+        queue_frame.grid(row=5, column=0, columnspan=2, sticky=tk.W+tk.E, pady=(0, 15))
+        queue_frame.columnconfigure(0, weight=1)
+        
+        queue_header = ttk.Frame(queue_frame, style='Surface.TFrame')
+        queue_header.grid(row=0, column=0, sticky=tk.W+tk.E, pady=(0, 10))
+        
+        ttk.Label(queue_header, text="Job Queue:", style='Surface.TLabel',
+                 font=('Segoe UI', 11, 'bold')).pack(side=tk.LEFT)
+        
+        # Formats written beside each queued file, streamed to disk while it transcribes
+        ttk.Label(queue_header, text="Save as:", style='Surface.TLabel',
+                 font=('Segoe UI', 9)).pack(side=tk.LEFT, padx=(15, 5))
+        self.output_format_vars = {}
+        for fmt in FORMATS:
+            var = tk.BooleanVar(value=(fmt == "txt"))
+            self.output_format_vars[fmt] = var
+            ttk.Checkbutton(queue_header, text=fmt.upper(), variable=var,
+                            style='Surface.TCheckbutton').pack(side=tk.LEFT, padx=(0, 5))
+        
+        clear_btn = ttk.Button(queue_header, text="Clear Finished", command=self.clear_finished_jobs,
+                               style='Secondary.TButton')
+        clear_btn.pack(side=tk.RIGHT)
+        self.add_button_hover_effect(clear_btn)
+        
+        self.job_concurrency_var = tk.IntVar(value=self.job_concurrency)
+        concurrency_spin = ttk.Spinbox(queue_header, from_=1, to=thread_budget.current().usable,
+                                       textvariable=self.job_concurrency_var, width=3,
+                                       command=self.on_concurrency_change)
+        concurrency_spin.pack(side=tk.RIGHT, padx=(5, 15))
+        concurrency_spin.bind('<Return>', self.on_concurrency_change)
+        ttk.Label(queue_header, text="Parallel jobs:", style='Surface.TLabel',
+                 font=('Segoe UI', 9)).pack(side=tk.RIGHT)
+        
+        # Share of the thread budget in use by this process and the engine
+        self.cpu_var = tk.StringVar(value="CPU --")
+        ttk.Label(queue_header, textvariable=self.cpu_var, style='Surface.TLabel',
+                 font=('Segoe UI', 9)).pack(side=tk.RIGHT, padx=(0, 15))
+        
+        columns = ('file', 'state', 'audio', 'time', 'rtf')
+        self.job_tree = ttk.Treeview(queue_frame, columns=columns, show='headings', height=4,
+                                     style='Modern.Treeview')
+        for column, heading, width in [('file', "File", 260), ('state', "State", 110),
+                                       ('audio', "Audio", 70), ('time', "Time", 70), ('rtf', "RTF", 60)]:
+            self.job_tree.heading(column, text=heading)
+            self.job_tree.column(column, width=width, stretch=(column == 'file'))
+        self.job_tree.grid(row=1, column=0, sticky=tk.W+tk.E)
+        self.job_tree.bind('<<TreeviewSelect>>', self.on_job_select)
+        
         # Transcription output section
         output_frame = ttk.Frame(main_frame, style='Surface.TFrame', padding="15")
-        output_frame.grid(row=5, column=0, columnspan=2, sticky=tk.W+tk.E+tk.N+tk.S, pady=(0, 0))
+        output_frame.grid(row=6, column=0, columnspan=2, sticky=tk.W+tk.E+tk.N+tk.S, pady=(0, 0))
         output_frame.columnconfigure(0, weight=1)
         output_frame.rowconfigure(1, weight=1)
         
-        ttk.Label(output_frame, text="Transcription Result:", 
-                 style='Surface.TLabel', font=('Segoe UI', 11, 'bold')).grid(row=0, column=0, sticky=tk.W, pady=(0, 10))
+        output_header = ttk.Frame(output_frame, style='Surface.TFrame')
+        output_header.grid(row=0, column=0, sticky=tk.W+tk.E, pady=(0, 10))
+        
+        ttk.Label(output_header, text="Transcription Result:", 
+                 style='Surface.TLabel', font=('Segoe UI', 11, 'bold')).pack(side=tk.LEFT)
+        
+        # Long transcripts are shown a page of segments at a time
+        self.next_page_btn = ttk.Button(output_header, text="▶", width=3, state='disabled',
+                                        command=lambda: self._show_output_page(self._current_output_page() + 1),
+                                        style='Secondary.TButton')
+        self.next_page_btn.pack(side=tk.RIGHT)
+        self.page_label = ttk.Label(output_header, text="", style='Surface.TLabel', font=('Segoe UI', 9))
+        self.page_label.pack(side=tk.RIGHT, padx=5)
+        self.prev_page_btn = ttk.Button(output_header, text="◀", width=3, state='disabled',
+                                        command=lambda: self._show_output_page(self._current_output_page() - 1),
+                                        style='Secondary.TButton')
+        self.prev_page_btn.pack(side=tk.RIGHT)
         
         # Text output with modern styling
         self.text_output = scrolledtext.ScrolledText(
@@ -287,6 +550,7 @@ class SpeechToTextApp:
             borderwidth=1
         )
         self.text_output.grid(row=1, column=0, sticky=tk.W+tk.E+tk.N+tk.S, pady=(0, 15))
+        self.text_output.tag_configure('tentative', foreground=self.colors['text_secondary'])
         
         # Button frame for save and copy
         button_frame = ttk.Frame(output_frame, style='Surface.TFrame')
@@ -326,28 +590,31 @@ class SpeechToTextApp:
             if self.is_recording:
                 self.is_recording = False
                 try:
+                    import sounddevice as sd
                     sd.stop()
                 except:
                     pass
             
-            # Clean up temporary files
-            if hasattr(self, 'recorded_file') and self.recorded_file and os.path.exists(self.recorded_file):
-                try:
-                    os.unlink(self.recorded_file)
-                except:
-                    pass
-            
             # Clear recording data
             if hasattr(self, 'recording_data'):
                 self.recording_data = None
-            if hasattr(self, 'recording_chunks'):
-                self.recording_chunks.clear()
+            if self.capture is not None:
+                self.capture.close()
+                self.capture = None
             
             # Clear models to free GPU/CPU memory
             if hasattr(self, 'model'):
                 self.model = None
             if hasattr(self, 'batched_model'):
                 self.batched_model = None
+            self.model_manager.clear()
+            self.job_scheduler.shutdown()
+            
+            if self.transcript_cache is not None:
+                stats = self.transcript_cache.stats()
+                print(f"Transcription cache: {stats['entries']} entries, {stats['hits']} hits, "
+                      f"{stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+                self.transcript_cache.close()
             
             # Force garbage collection
             gc.collect()
@@ -396,21 +663,183 @@ class SpeechToTextApp:
         pass
     
     def browse_file(self):
-        """Open file dialog to select audio file"""
-        file_path = filedialog.askopenfilename(
-            title="Select Audio File",
+        """Open file dialog; one file fills the entry, several go to the job queue"""
+        file_paths = filedialog.askopenfilenames(
+            title="Select Audio File(s)",
             filetypes=[
                 ("Audio Files", "*.mp3 *.wav *.flac *.m4a *.ogg *.wma"),
                 ("All Files", "*.*")
             ]
         )
-        if file_path:
-            self.file_var.set(file_path)
+        if len(file_paths) == 1:
+            self.file_var.set(file_paths[0])
+        elif file_paths:
+            formats = self._selected_formats()
+            for file_path in file_paths:
+                self.job_scheduler.submit(file_path, formats)
+            self.status_var.set(f"Queued {len(file_paths)} files - results are saved next to each file")
+    
+    def _selected_formats(self):
+        """Output formats ticked in the queue section (plain text if none are)"""
+        return [fmt for fmt, var in self.output_format_vars.items() if var.get()] or ["txt"]
+    
+    def on_concurrency_change(self, event=None):
+        """Apply the parallel job setting to the scheduler and the thread budget
+
+        The budget's new split (fewer jobs get more inference threads each)
+        applies to models loaded from now on.
+        """
+        try:
+            self.job_concurrency = max(1, int(self.job_concurrency_var.get()))
+        except (ValueError, tk.TclError):
+            return
+        budget = thread_budget.set_jobs(self.job_concurrency)
+        self.job_scheduler.set_concurrency(self.job_concurrency)
+        print(f"Thread budget: {budget.line()}")
+    
+    def _poll_cpu_usage(self):
+        """Show how much of the thread budget is busy, about once a second"""
+        pid = getattr(self.model_manager, "pid", None)
+        pids = [pid] if pid is not None else []
+        if self.cpu_monitor.pids != pids:
+            self.cpu_monitor.track(pids)  # Engine (re)started or gone; read again from here
+        else:
+            utilization = self.cpu_monitor.sample()
+            self.cpu_var.set(f"CPU {utilization:.0%} of {thread_budget.current().total}")
+        self.root.after(self.cpu_poll_interval, self._poll_cpu_usage)
+    
+    def _wait_for_model(self, cancel_token=None):
+        """Block a worker thread until the model is ready (never polls or touches Tk)
+
+        Wakes as soon as the loader resolves model_ready or cancel_token is
+        cancelled, and returns the ready entry (its model/batched_model are
+        what the caller should use, even if the selection changes meanwhile).
+        Raises TranscriptionCancelled if either the wait or the
+        load was cancelled, and RuntimeError if the load failed.
+        """
+        with self.model_state_lock:
+            idle = not self.model_loaded and not self.model_loading
+        if idle:
+            self.start_model_preloading()
+        with self.model_state_lock:
+            ready = self.model_ready
+        
+        if cancel_token is not None:
+            wake = threading.Event()
+            ready.add_done_callback(lambda _: wake.set())
+            cancel_token.add_callback(wake.set)
+            wake.wait()
+            cancel_token.raise_if_cancelled()
+        try:
+            return ready.result()
+        except TranscriptionCancelled:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Model failed to load: {e}") from e
+    
+    def _resolve_model_ready(self, entry=None, error=None):
+        """Settle model_ready for everyone waiting on it; call with model_state_lock held"""
+        if self.model_ready.done():
+            return
+        if error is not None:
+            self.model_ready.set_exception(error)
+        else:
+            self.model_ready.set_result(entry)
+    
+    def _run_queue_job(self, job):
+        """Transcribe one queued file with the shared model and save the result beside it"""
+        entry = self._wait_for_model(job.cancel_token)
+        
+        model, batched_model = entry.model, entry.batched_model
+        if batched_model is not None:
+            segments, info, hit = self._cached_transcribe(batched_model, job.source, 'batched')
+        else:
+            segments, info, hit = self._cached_transcribe(model, job.source, 'regular',
+                                                          beam_size=1, best_of=1, temperature=0.0)
+        segments = cancellable(segments, job.cancel_token)
+        job.audio_duration = info.duration
+        self.job_scheduler.notify(job)
+        
+        source = Path(job.source)
+        job.info = info
+        last_notify = time.time()
+        # Outputs grow on disk segment by segment, so a crash keeps what was decoded
+        with TranscriptWriters(source.with_name(source.stem + "_transcription"), job.formats) as writers:
+            job.output_paths = [str(path) for path in writers.paths]
+            job.output_path = job.output_paths[0]
+            writers.begin(info)
+            for segment in segments:
+                writers.write(segment)
+                job.result_segments.append(segment)
+                job.segments += 1
+                if job.audio_duration:
+                    job.progress = min(100.0, segment.end / job.audio_duration * 100)
+                # Throttle row refreshes so many parallel jobs don't flood the Tk queue
+                if time.time() - last_notify > 0.5:
+                    last_notify = time.time()
+                    self.job_scheduler.notify(job)
+    
+    def _refresh_job_row(self, job):
+        """Insert or update a job's row in the queue view"""
+        minutes, seconds = divmod(int(job.audio_duration), 60)
+        if job.state == "running":
+            state = f"running {job.progress:.0f}%"
+        else:
+            state = job.state
+        values = (
+            job.name,
+            state,
+            f"{minutes}:{seconds:02d}" if job.audio_duration else "-",
+            f"{job.processing_time:.1f}s" if job.started else "-",
+            f"{job.rtf:.2f}" if job.rtf is not None and job.started else "-",
+        )
+        item = str(job.id)
+        if self.job_tree.exists(item):
+            self.job_tree.item(item, values=values)
+        else:
+            self.job_tree.insert('', tk.END, iid=item, values=values)
+        
+        if job.state == "failed":
+            self.status_var.set(f"{job.name} failed: {str(job.error)[:50]}")
+        elif job.state == "done":
+            remaining = len(self.job_scheduler.pending())
+            self.status_var.set(f"Saved {Path(job.output_path).name}"
+                                + (f" ({remaining} jobs left)" if remaining else " - queue finished"))
+        elif job.state == "cancelled":
+            self.status_var.set(f"{job.name} cancelled")
+        
+        busy = self.transcription_token is not None or self.job_scheduler.pending()
+        self.cancel_btn.config(state='normal' if busy else 'disabled')
+    
+    def on_job_select(self, event=None):
+        """Show a finished job's transcript in the output box"""
+        selection = self.job_tree.selection()
+        if not selection:
+            return
+        for job in self.job_scheduler.jobs:
+            if str(job.id) == selection[0] and job.state == "done":
+                # Its timed formats are already on disk beside the source
+                self._reset_output()
+                for segment in job.result_segments:
+                    self.transcript.add_segment(segment)  # Paged like a live transcription
+                self.transcript.info = job.info
+                self._show_output_page(0)
+                self.save_btn.config(state='normal')
+                self.copy_btn.config(state='normal')
+                break
+    
+    def clear_finished_jobs(self):
+        """Remove finished and failed jobs from the queue view"""
+        self.job_scheduler.clear_finished()
+        active = {str(job.id) for job in self.job_scheduler.jobs}
+        for item in self.job_tree.get_children():
+            if item not in active:
+                self.job_tree.delete(item)
     
     def on_model_change(self, event=None):
         """Handle model size change"""
         self.model_size = self.model_var.get()
-        self.model = None  # Reset model to reload with new size
+        self.model = None  # Swap in the new size (cached models are reused without reloading)
         self.batched_model = None
         self.model_loaded = False
         self.status_var.set(f"Model changed to {self.model_size}")
@@ -418,256 +847,459 @@ class SpeechToTextApp:
         self.start_model_preloading()
     
     def start_model_preloading(self):
-        """Start model preloading in background thread"""
-        if not self.model_loading:
+        """Request the current model size; a running loader picks up the newest request"""
+        with self.model_state_lock:
+            self.model_request_id += 1
+            if self.model_loading:
+                # Stop the superseded load at its next phase instead of finishing it
+                if self.model_load_token is not None:
+                    self.model_load_token.cancel()
+                return
             self.model_loading = True
-            thread = threading.Thread(target=self._preload_model_worker)
-            thread.daemon = True
-            thread.start()
+            if self.model_ready.done():
+                self.model_ready = Future()  # Waiters from now on wait for this load
+        thread = threading.Thread(target=self._preload_model_worker)
+        thread.daemon = True
+        thread.start()
+    
+    def _detect_device(self):
+        """Device and compute type from the on-disk probe cache, probing only on a miss"""
+        probe = hardware_probe.load_probe()
+        source = "cached" if probe.get("cached") else f"probed in {probe['probe_seconds']:.1f}s"
+        print(f"Hardware: {probe['device']}/{probe['compute_type']} via {probe['path']} ({source})")
+        return probe["device"], probe["compute_type"]
+    
+    def reprobe_hardware(self):
+        """Discard the cached hardware probe and detect again"""
+        hardware_probe.clear_probe()
+        with self.model_state_lock:
+            self.device = None
+            self.compute_type = None
+        self.model = None
+        self.batched_model = None
+        self.model_loaded = False
+        self.status_var.set("Re-detecting hardware...")
+        self.start_model_preloading()
+    
+    def _use_server(self, model_size):
+        """Point model/batched_model at the transcription server; False if it isn't reachable"""
+        client = transcription_server.connect(self.server_url)
+        if client is None:
+            return False
+        client = client.with_options(model_size=model_size)
+        entry = SimpleNamespace(model=client.with_options(pipeline='regular'), batched_model=client)
+        with self.model_state_lock:
+            self.model = entry.model
+            self.batched_model = entry.batched_model
+            self.model_compute_type = client.compute_type
+            self.model_loaded = True
+            self.model_loading = False
+            self._resolve_model_ready(entry)
+        print(f"Using transcription server at {self.server_url} for {model_size}")
+        self.startup_timer.mark('model_ready')
+        self.root.after(0, self.startup_timer.report)
+        self.root.after(0, lambda: self.status_var.set(f"{model_size.title()} model ready (server)"))
+        return True
+    
+    def _engine_exited(self, exitcode):
+        """The engine process died: drop its models and load the current one into a fresh engine"""
+        with self.model_state_lock:
+            if self.model_loading or not isinstance(self.batched_model, EngineTranscriber):
+                return  # A load in flight reports the failure itself; the server doesn't use the engine
+            self.model = None
+            self.batched_model = None
+            self.model_loaded = False
+        self.status_var.set(f"Inference engine stopped (code {exitcode}), restarting...")
+        self.start_model_preloading()
     
     def _preload_model_worker(self):
         """Background worker to preload model"""
+        if self.server_url and self._use_server(self.model_size):
+            return
         try:
-            self.root.after(0, lambda: self.status_var.set(f"Preloading {self.model_size} model..."))
-            
-            # Determine optimal device and compute type
-            device = "auto"
-            compute_type = "auto"
-            
-            # Optimize compute type based on available hardware
-            device = "cpu"  # Default to CPU
-            compute_type = "int8"  # Default to compatible CPU type
-            
-            try:
-                import torch
+            while True:
+                request_id = self.model_request_id
+                model_size = self.model_size
                 
-                # Check for NVIDIA GPU (CUDA)
-                if torch.cuda.is_available():
-                    device = "cuda"
-                    compute_type = "float16"
-                    print("Using NVIDIA GPU (CUDA)")
+                if self.model_manager.get(model_size, self.device, self.compute_type) is None:
+                    self.root.after(0, lambda size=model_size: self.status_var.set(f"Preloading {size} model..."))
                 
-                # Check for AMD GPU (ROCm/HIP)
-                elif hasattr(torch, 'hip') and torch.hip.is_available():
-                    device = "hip"
-                    compute_type = "float16"
-                    print("Using AMD GPU (ROCm)")
+                if self.device is None:
+                    self.device, self.compute_type = self._detect_device()
                 
-                # Check for OpenVINO GPU support (good for Intel/AMD integrated GPUs)
-                else:
-                    try:
-                        import openvino as ov
-                        core = ov.Core()
-                        available_devices = core.available_devices
-                        
-                        # Check for GPU device
-                        if "GPU" in available_devices:
-                            print(f"OpenVINO GPU available on devices: {available_devices}")
-                            device = "auto"  # Let faster-whisper + OpenVINO optimize
-                            compute_type = "int8"  # Good balance for integrated GPU
-                        else:
-                            print(f"OpenVINO devices available: {available_devices}")
-                            device = "cpu"
-                            compute_type = "int8"
-                    except ImportError:
-                        # Fallback: Try faster-whisper auto detection
-                        try:
-                            from faster_whisper import WhisperModel
-                            test_model = WhisperModel('tiny', device='auto', compute_type='auto')
-                            device = "auto"
-                            compute_type = "auto"
-                            print("Using faster-whisper auto GPU detection")
-                            del test_model  # cleanup
-                        except Exception:
-                            print("No GPU acceleration available, using optimized CPU")
-                            device = "cpu"
-                            compute_type = "int8"
-                        
-            except ImportError:
-                print("PyTorch not available, using CPU with auto detection")
-                device = "auto"
-                compute_type = "auto"
-            
-            # Load base model for BatchedInferencePipeline with fallback
-            try:
-                self.model = WhisperModel(
-                    self.model_size,
-                    device=device,
-                    compute_type=compute_type,
-                    num_workers=2  # Optimize for batch processing
-                )
-            except Exception as model_error:
-                # Fallback to default compute type if optimized type fails
-                print(f"Optimized compute type failed, trying default: {model_error}")
-                self.model = WhisperModel(
-                    self.model_size,
-                    device=device,
-                    compute_type="default",
-                    num_workers=2
-                )
-            
-            # Create BatchedInferencePipeline for faster processing
-            self.batched_model = BatchedInferencePipeline(model=self.model)
-            
-            self.model_loaded = True
-            self.model_loading = False
+                token = CancellationToken()
+                with self.model_state_lock:
+                    self.model_load_token = token
+                    if request_id != self.model_request_id:
+                        continue  # A newer request arrived before this one started
+                
+                # Cached models come back immediately; new ones may evict the least recently used
+                try:
+                    entry = self.model_manager.load(model_size, self.device, self.compute_type, cancel_token=token)
+                except Exception as e:
+                    with self.model_state_lock:
+                        if request_id != self.model_request_id:
+                            # However a superseded load ended (cancelled, download error, OOM), serve the newest
+                            print(f"Loading {model_size} abandoned in favour of a newer request ({type(e).__name__})")
+                            continue
+                        self.model_loading = False
+                        self.model_load_token = None
+                        self._resolve_model_ready(error=e)
+                    if isinstance(e, TranscriptionCancelled):
+                        print(f"Loading {model_size} cancelled")
+                        self.root.after(0, lambda: self.status_var.set("Model loading cancelled"))
+                        return
+                    raise
+                
+                with self.model_state_lock:
+                    if request_id != self.model_request_id:
+                        # Superseded mid-flight: keep the result cached and serve the newest request
+                        print(f"Model {model_size} loaded but no longer selected; kept in cache")
+                        continue
+                    self.model = entry.model
+                    self.model_compute_type = entry.compute_type
+                    self.batched_model = entry.batched_model
+                    self.model_loaded = True
+                    self.model_loading = False
+                    self.model_load_token = None
+                    self._resolve_model_ready(entry)
+                
+                if entry.compute_type != self.compute_type:
+                    # Start from the compute type that actually worked on the next launch
+                    hardware_probe.update_probe(compute_type=entry.compute_type)
+                break
             
             # Determine device name for display
-            if device == "cuda":
+            if entry.device == "cuda":
                 device_name = "NVIDIA GPU"
-            elif device == "hip":
+            elif entry.device == "hip":
                 device_name = "AMD GPU"
-            elif device == "auto":
+            elif entry.device == "auto":
                 device_name = "Auto GPU"
             else:
                 device_name = "CPU"
             
-            print(f"Model loaded: {self.model_size} on {device_name} with {compute_type} precision")
+            cached = len(self.model_manager.loaded_keys())
+            print(f"Model loaded: {model_size} on {device_name} with {entry.compute_type} precision "
+                  f"({cached} cached, ~{self.model_manager.memory_used_mb:.0f} MB)")
+            resources = entry.resources
+            print(f"Resources: batch size {resources['batch_size']}, {resources['cpu_threads']} CPU threads, "
+                  f"{resources['num_workers']} workers ({resources['source']})")
+            if entry.warm_up_seconds:
+                print("Warm-up first segment: " + ", ".join(f"{pipeline} {seconds:.2f}s"
+                                                            for pipeline, seconds in entry.warm_up_seconds.items()))
+            
+            self.startup_timer.mark('model_ready')
+            self.root.after(0, self.startup_timer.report)
             
             self.root.after(0, lambda: self.status_var.set(
-                f"{self.model_size.title()} model ready ({device_name}, {compute_type})"
+                f"{model_size.title()} model ready ({device_name}, {entry.compute_type})"
             ))
             
         except Exception as e:
-            self.model_loading = False
+            with self.model_state_lock:
+                self.model_loading = False
+                self.model_load_token = None
+                self._resolve_model_ready(error=e)
             error_msg = str(e)[:50]
             self.root.after(0, lambda msg=error_msg: self.status_var.set(f"Model loading failed: {msg}..."))
             print(f"Model preloading error: {e}")
+            self.startup_timer.mark('model_failed')
+            self.root.after(0, self.startup_timer.report)
     
-    def load_model(self):
-        """Load Whisper model with GPU acceleration (legacy method)"""
-        if not self.model_loaded:
-            if not self.model_loading:
-                self.start_model_preloading()
-            # Wait for model to load
-            while self.model_loading and not self.model_loaded:
-                time.sleep(0.1)
-                self.root.update()
-    
-    def transcribe_file(self):
-        """Transcribe the selected audio file with optimized UI"""
-        file_path = self.file_var.get().strip()
-        
-        if not file_path:
-            messagebox.showerror("Error", "Please select an audio file first!")
+    def transcribe_file(self, audio=None):
+        """Transcribe the selected audio file, or an in-memory 16 kHz float32 buffer if given"""
+        if self.transcription_token is not None or self.live_transcriber is not None:
+            # One run at a time: the segment queue, transcript and cancel token belong to it
+            self.status_var.set("A transcription is already running - wait for it or cancel it")
             return
         
-        if not os.path.exists(file_path):
-            messagebox.showerror("Error", f"File not found: {file_path}")
-            return
+        if audio is not None:
+            source = audio
+        else:
+            source = self.file_var.get().strip()
+            
+            if not source:
+                messagebox.showerror("Error", "Please select an audio file first!")
+                return
+            
+            if not os.path.exists(source):
+                messagebox.showerror("Error", f"File not found: {source}")
+                return
         
         # Set transcribing flag to disable animations
         self.transcribing = True
         
         # Disable button and start progress (no animation during transcription)
         self.transcribe_btn.config(state='disabled')
-        self.progress.start(20)  # Faster, less CPU-intensive progress
-        self.text_output.delete(1.0, tk.END)
+        self.cancel_btn.config(state='normal')
+        self.progress.config(mode='indeterminate', value=0)
+        self.progress.start(20)  # Indeterminate until the worker reports the audio duration
+        self._reset_output()
         self.save_btn.config(state='disabled')
         
+        # Reset streaming state and drop anything left over from a previous run
+        self.segments_streamed = 0
+        self.segments_received = 0
+        self.audio_duration = 0.0
+        self.run_stats = perf_log.RunStats()
+        while True:
+            try:
+                self.segment_queue.get_nowait()
+            except queue.Empty:
+                break
+        
         # Direct status update (no animation)
         self.status_var.set("Preparing transcription...")
         self.root.update_idletasks()  # Update UI once
         
         # Run transcription in separate thread
-        thread = threading.Thread(target=self._transcribe_worker, args=(file_path,))
+        self.transcription_token = CancellationToken()
+        thread = threading.Thread(target=self._transcribe_worker, args=(source, self.transcription_token))
         thread.daemon = True
         thread.start()
+        
+        # Drain streamed segments at a fixed frame rate
+        self.root.after(self.ui_frame_interval, self._drain_segment_queue)
     
-    def _transcribe_worker(self, file_path):
-        """Worker function for transcription (runs in separate thread)"""
+    def _transcribe_worker(self, source, cancel_token):
+        """Worker function for transcription (runs in separate thread)
+
+        source is either a file path or a 16 kHz mono float32 numpy array;
+        faster-whisper accepts both directly. cancel_token is checked while
+        waiting for the model and between segments.
+        """
         try:
-            # Ensure model is loaded
-            self.load_model()
+            # Ensure model is loaded; use this entry throughout, a model change may clear self.model
+            entry = self._wait_for_model(cancel_token)
+            model, batched_model = entry.model, entry.batched_model
             
             # Check if model is loaded
-            if not self.model_loaded or (self.model is None and self.batched_model is None):
-                self.root.after(0, self._transcription_error, "Failed to load model")
+            if model is None and batched_model is None:
+                self.segment_queue.put(('error', "Failed to load model"))
                 return
             
             # Update status
             self.root.after(0, lambda: self.status_var.set("Transcribing audio..."))
             
             # Use BatchedInferencePipeline if available for 3x speedup
-            if self.batched_model is not None:
+            if batched_model is not None:
                 try:
                     # BatchedInferencePipeline approach (faster)
-                    segments, info = self.batched_model.transcribe(file_path)
-                    transcription = " ".join([segment.text for segment in segments])
+                    segments, info, hit = self._cached_transcribe(batched_model, source, 'batched')
+                    self._stream_segments(segments, info, cancel_token)
+                except TranscriptionCancelled:
+                    raise
                 except Exception as batch_error:
+                    # Segments already shown can't be taken back, so only fall back before the first one
+                    if self.segments_streamed:
+                        raise
                     print(f"Batch processing failed, falling back to regular: {batch_error}")
                     # Fallback to regular model
-                    segments, info = self.model.transcribe(file_path, beam_size=1)  # Faster beam size
-                    transcription = " ".join([segment.text for segment in segments])
+                    segments, info, hit = self._cached_transcribe(model, source, 'regular',
+                                                                  beam_size=1)  # Faster beam size
+                    self._stream_segments(segments, info, cancel_token)
             else:
                 # Regular model approach with optimized settings
-                segments, info = self.model.transcribe(
-                    file_path,
+                segments, info, hit = self._cached_transcribe(
+                    model,
+                    source,
+                    'regular',
                     beam_size=1,  # Faster than default beam_size=5
                     best_of=1,    # Faster than default best_of=5
                     temperature=0.0  # Deterministic for speed
                 )
-                transcription = " ".join([segment.text for segment in segments])
+                self._stream_segments(segments, info, cancel_token)
             
             # Clean up memory
-            if segments:
-                del segments
+            del segments
             gc.collect()
             
-            # Update UI in main thread
-            self.root.after(0, self._transcription_complete, transcription)
+            # Tell the UI thread everything has been queued
+            self.segment_queue.put(('done', hit))
             
+        except TranscriptionCancelled:
+            # The segment generators are closed by now; drop what they held
+            gc.collect()
+            self.segment_queue.put(('cancelled', None))
         except Exception as e:
-            self.root.after(0, self._transcription_error, str(e))
+            self.segment_queue.put(('error', str(e)))
+    
+    def _cached_transcribe(self, transcriber, source, pipeline, **params):
+        """Transcribe through the result cache; returns (segments, info, hit)"""
+        model_key = [self.model_size, self.model_compute_type, pipeline]
+        if isinstance(transcriber, (transcription_server.TranscriptionClient, EngineTranscriber)):
+            # The server/engine process decodes, streams and logs timings itself
+            wrapped = transcriber
+        else:
+            instrumented = perf_log.InstrumentedTranscriber(transcriber, model=self.model_size, pipeline=pipeline)
+            # Files are decoded window by window so memory stays flat for multi-hour audio
+            wrapped = StreamingTranscriber(instrumented, carry_prompt=(pipeline != 'batched'))
+        threshold = self.recording_gate_threshold
+        if not isinstance(source, (str, os.PathLike)) and threshold is not None:
+            # Recordings: decode only the speech, keyed by the original audio plus the gate setting
+            wrapped = SilenceGatedTranscriber(wrapped, threshold)
+            model_key.append(f"gate:{threshold:.3g}")
+        return transcribe_cached(self.transcript_cache, wrapped, source, model_key, **params)
     
-    def _transcription_complete(self, transcription):
+    def _stream_segments(self, segments, info, cancel_token=None):
+        """Push segments to the UI queue as the generator yields them, stopping on cancel"""
+        self.segment_queue.put(('info', info))
+        for segment in cancellable(segments, cancel_token):
+            # Blocks when the queue is full so decoding never runs far ahead of the UI
+            self.segment_queue.put(('segment', (segment, time.perf_counter())))
+            self.segments_streamed += 1
+    
+    def _drain_segment_queue(self):
+        """Insert queued segments into the output in one batch per frame"""
+        received = 0
+        last_end = None
+        finished = None
+        oldest_enqueued = None
+        
+        for _ in range(self.segment_batch_limit):
+            try:
+                kind, payload = self.segment_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if kind == 'segment':
+                segment, enqueued = payload
+                self.transcript.add_segment(segment)
+                self.segments_received += 1
+                received += 1
+                last_end = segment.end
+                if oldest_enqueued is None:
+                    oldest_enqueued = enqueued
+            elif kind == 'info':
+                self.transcript.info = payload
+                self.audio_duration = payload.duration or 0.0
+                if self.audio_duration > 0:
+                    self.progress.stop()
+                    self.progress.config(mode='determinate', maximum=100, value=0)
+            else:
+                finished = (kind, payload)
+                break
+        
+        if received:
+            insert_started = time.perf_counter()
+            self._catch_up_output()
+            now = time.perf_counter()
+            perf_log.event("ui_handoff", segments=received,
+                           queue_latency_ms=round((now - oldest_enqueued) * 1000, 1),
+                           insert_ms=round((now - insert_started) * 1000, 1))
+            self.run_stats.update(last_end, received)
+        
+        if last_end is not None and self.audio_duration > 0:
+            percent = min(100.0, last_end / self.audio_duration * 100)
+            self.progress['value'] = percent
+            self.status_var.set(f"Transcribing audio... {percent:.0f}% ({self.segments_received} segments) · "
+                                f"{self.run_stats.line()}")
+        
+        if finished is None:
+            self.root.after(self.ui_frame_interval, self._drain_segment_queue)
+        elif finished[0] == 'done':
+            self._transcription_complete(from_cache=finished[1])
+        elif finished[0] == 'cancelled':
+            self._transcription_cancelled()
+        else:
+            self._transcription_error(finished[1])
+    
+    def _reset_progress(self):
+        """Return the progress bar to its idle indeterminate state"""
+        self.progress.stop()
+        self.progress.config(mode='indeterminate', value=0)
+    
+    def _transcription_complete(self, from_cache=False):
         """Handle successful transcription completion with optimized UI"""
         self.transcribing = False  # Re-enable animations
-        self.progress.stop()
+        self._reset_progress()
         self.transcribe_btn.config(state='normal')
+        self.cancel_btn.config(state='disabled')
+        self.transcription_token = None
         self.save_btn.config(state='normal')
         self.copy_btn.config(state='normal')
         
-        # Direct text insertion (no animation for speed)
-        self.text_output.delete(1.0, tk.END)
-        self.text_output.insert(tk.END, transcription)
-        
-        # Direct status update
-        self.status_var.set("Transcription complete!")
+        # Text was already streamed into the output as segments arrived
+        source = ", from cache" if from_cache else ""
+        self.status_var.set(f"Transcription complete! ({self.segments_received} segments{source}) · "
+                            f"{self.run_stats.line()}")
+        perf_log.event("gui_transcription", from_cache=bool(from_cache), **self.run_stats.as_dict())
         
-        # Clean up temporary recording file
-        if self.recorded_file and os.path.exists(self.recorded_file):
-            try:
-                os.unlink(self.recorded_file)
-                self.recorded_file = None
-            except:
-                pass
-                
         # Force garbage collection after transcription
         gc.collect()
+        self._start_pending_recording()
     
-    def animate_text_insertion(self, text):
-        """Animate text insertion with typing effect (disabled during transcription)"""
-        if self.transcribing:
-            # During transcription, insert directly for performance
-            self.text_output.delete(1.0, tk.END)
-            self.text_output.insert(tk.END, text)
+    def _reset_output(self):
+        """Empty the transcript store and the output box"""
+        self.output_render_id += 1
+        self.output_rendering = False
+        self.transcript.clear()
+        self.output_first_page = 0
+        self.output_page = None
+        self.output_pieces_shown = 0
+        self.text_output.delete(1.0, tk.END)
+        self._update_page_controls()
+    
+    def _current_output_page(self):
+        return self.output_page if self.output_page is not None else max(0, self.transcript.page_count - 1)
+    
+    def _update_page_controls(self):
+        pages = self.transcript.page_count
+        current = self._current_output_page()
+        self.page_label.config(text=f"Page {current + 1}/{pages}" if pages > 1 else "")
+        self.prev_page_btn.config(state='normal' if current > 0 else 'disabled')
+        self.next_page_btn.config(state='normal' if current < pages - 1 else 'disabled')
+    
+    def _catch_up_output(self):
+        """Append store pieces the widget doesn't show yet, dropping old pages past the limit
+
+        Only while following the end; a browsed page stays put and the new
+        text is picked up when the user pages back to the end.
+        """
+        if self.output_page is None and not self.output_rendering:
+            pieces = self.transcript.pieces[self.output_pieces_shown:]
+            if pieces:
+                self.text_output.insert(tk.END, "".join(pieces))
+                self.output_pieces_shown += len(pieces)
+                while self.transcript.page_count - self.output_first_page > self.output_pages_shown:
+                    chars = self.transcript.page_chars(self.output_first_page)
+                    self.text_output.delete("1.0", f"1.0 + {chars} chars")
+                    self.output_first_page += 1
+                self.text_output.see(tk.END)
+        self._update_page_controls()
+    
+    def _show_output_page(self, page):
+        """Render one page of the store; the last page resumes following new segments"""
+        last = max(0, self.transcript.page_count - 1)
+        page = max(0, min(page, last))
+        if page == last:
+            self.output_page = None
+            self.output_first_page = last
+            self.output_pieces_shown = len(self.transcript)
         else:
-            # Normal animation when not transcribing
-            self.text_output.delete(1.0, tk.END)
-            self._typing_animation(text, 0)
+            self.output_page = page
+        text = self.transcript.page_text(page)
+        self.output_render_id += 1
+        self.text_output.delete(1.0, tk.END)
+        self._update_page_controls()
+        self.output_rendering = True
+        self._insert_chunks(text, 0, self.output_render_id)
     
-    def _typing_animation(self, text, index):
-        """Step function for typing animation (optimized)"""
-        if not self.transcribing and index < len(text):
-            self.text_output.insert(tk.END, text[index])
-            self.text_output.see(tk.END)
-            # Faster typing for longer texts, skip animation if transcribing
-            delay = 1 if len(text) > 500 else 2  # Slightly faster
-            self.root.after(delay, self._typing_animation, text, index + 1)
-        elif self.transcribing:
-            # If transcribing started during animation, just insert remaining text
-            self.text_output.insert(tk.END, text[index:])
+    def _insert_chunks(self, text, start, render_id):
+        """Insert text a chunk per event-loop turn so big pages never freeze the window"""
+        if render_id != self.output_render_id:
+            return
+        end = start + self.output_chunk_chars
+        self.text_output.insert(tk.END, text[start:end])
+        if end < len(text):
+            self.root.after(1, self._insert_chunks, text, end, render_id)
+            return
+        self.output_rendering = False
+        if self.output_page is None:
+            self._catch_up_output()  # Segments that arrived while rendering
+        else:
+            self.text_output.see("1.0")
     
     def animate_status_change(self, new_status):
         """Animate status text changes (disabled during transcription)"""
@@ -698,11 +1330,47 @@ class SpeechToTextApp:
             if alpha > 0:
                 self.root.after(30, self._fade_status_in, alpha)
     
+    def _transcription_cancelled(self):
+        """Back to ready after a cancel; segments shown so far stay and can be saved"""
+        self.transcribing = False
+        self._reset_progress()
+        self.transcribe_btn.config(state='normal')
+        self.cancel_btn.config(state='disabled')
+        self.transcription_token = None
+        if self.segments_received:
+            self.save_btn.config(state='normal')
+            self.copy_btn.config(state='normal')
+        self.status_var.set(f"Transcription cancelled ({self.segments_received} segments kept)")
+        perf_log.event("gui_transcription", cancelled=True, **self.run_stats.as_dict())
+        self._start_pending_recording()
+    
+    def _start_pending_recording(self):
+        """Transcribe the next recording that was stopped while a file transcription was running"""
+        if self.pending_recordings and self.transcription_token is None:
+            audio, self.recording_gate_threshold = self.pending_recordings.pop(0)
+            self.transcribe_file(audio=audio)
+    
+    def cancel_transcription(self):
+        """Cancel the file transcription, queued jobs and any model load in progress"""
+        if self.transcription_token is not None:
+            self.transcription_token.cancel()
+            self.status_var.set("Cancelling...")
+        jobs = self.job_scheduler.cancel_all()
+        if jobs:
+            self.status_var.set(f"Cancelling {jobs} queued job{'s' if jobs != 1 else ''}...")
+        with self.model_state_lock:
+            if self.model_loading and self.model_load_token is not None:
+                self.model_load_token.cancel()
+        if not self.job_scheduler.pending():
+            self.cancel_btn.config(state='disabled')
+    
     def _transcription_error(self, error_msg):
         """Handle transcription error with optimized cleanup"""
         self.transcribing = False  # Re-enable animations
-        self.progress.stop()
+        self._reset_progress()
         self.transcribe_btn.config(state='normal')
+        self.cancel_btn.config(state='disabled')
+        self.transcription_token = None
         
         # Direct status update
         self.status_var.set("Error during transcription")
@@ -710,9 +1378,12 @@ class SpeechToTextApp:
         
         # Cleanup memory on error
         gc.collect()
+        self._start_pending_recording()
     
     def toggle_recording(self):
         """Toggle microphone recording"""
+        if self.recording_stopping:
+            return  # The previous recording is still being handed over
         if not self.is_recording:
             self.start_recording()
         else:
@@ -721,6 +1392,9 @@ class SpeechToTextApp:
     def start_recording(self):
         """Start recording from microphone"""
         try:
+            import sounddevice as sd
+            from audio_capture import CaptureBuffer, LevelMeter
+            
             # Check for available input devices
             devices = sd.query_devices()
             input_devices = []
@@ -739,8 +1413,16 @@ class SpeechToTextApp:
             default_device = sd.default.device[0]  # Input device
             device_info = sd.query_devices(default_device)
             
+            # Release the previous capture (and its spill file, if any)
+            if self.capture is not None:
+                self.capture.close()
+            self.capture = CaptureBuffer(self.sample_rate, max_memory_seconds=self.capture_memory_limit)
+            self.level_meter = LevelMeter()
+            self.level_blocks_seen = 0
+            
             self.is_recording = True
             self.recording_data = []
+            self.root.after(self.ui_frame_interval, self._poll_level_meter)
             
             # Update UI
             self.mic_btn.configure(text="⏹️ Stop", style='Recording.TButton')
@@ -751,38 +1433,39 @@ class SpeechToTextApp:
             self.animate_status_change(f"Recording from {device_name}... Click stop when finished")
             
             # Start recording thread
+            self.recording_finished = False
             self.recording_thread = threading.Thread(target=self._record_audio)
             self.recording_thread.daemon = True
             self.recording_thread.start()
             
+            if self.live_mode_var.get():
+                self.start_live_transcription()
+            
         except Exception as e:
             messagebox.showerror("Recording Error", f"Failed to start recording: {e}")
             self.is_recording = False
     
     def _record_audio(self):
         """Record audio in separate thread with optimized performance"""
+        import numpy as np
         try:
+            import sounddevice as sd
+            
             # Optimized recording settings
             self.sample_rate = 16000
             chunk_size = int(0.2 * self.sample_rate)  # 200ms chunks (reduced overhead)
-            self.recording_chunks = []
-            self.level_update_counter = 0
+            capture = self.capture
+            meter = self.level_meter
             
             print(f"Starting optimized recording with {chunk_size} sample chunks...")
             
             # Optimized audio callback with reduced overhead
             def audio_callback(indata, frames, time, status):
                 if self.is_recording:
-                    # Direct append without copy for performance
-                    self.recording_chunks.append(indata.copy())
-                    
-                    # Heavily throttled UI updates to reduce overhead
-                    self.level_update_counter += 1
-                    if self.level_update_counter % 25 == 0:  # Update every 5 seconds (25 * 200ms)
-                        current_level = np.max(np.abs(indata))
-                        level_percent = min(100, current_level * 1000)
-                        # Use after_idle to prevent UI blocking
-                        self.root.after_idle(self.update_level_indicator, level_percent, current_level)
+                    # Copy straight into the preallocated capture buffer (no per-block allocation)
+                    capture.write(indata[:, 0])
+                    # Publish the block level; the UI poller picks it up at its own frame rate
+                    meter.update(indata[:, 0], status)
             
             # Optimized stream settings
             with sd.InputStream(
@@ -795,16 +1478,18 @@ class SpeechToTextApp:
             ):
                 # Keep recording while flag is true
                 while self.is_recording:
+                    capture.maintain()  # Keep a spare chunk ready and spill old audio past the cap
                     time.sleep(0.1)  # Larger sleep to reduce CPU usage
             
-            # Efficient chunk combination
-            if self.recording_chunks:
-                self.recording_data = np.concatenate(self.recording_chunks, axis=0).flatten()
-                duration = len(self.recording_data) / self.sample_rate
-                print(f"Recorded {len(self.recording_data)} samples ({duration:.1f} seconds)")
-                
-                # Clear chunks to free memory immediately
-                self.recording_chunks.clear()
+            if meter.overflows:
+                print(f"Audio input overflowed {meter.overflows} times; some audio was dropped")
+                perf_log.event("recording_overflow", overflows=meter.overflows, seconds=round(capture.duration, 3))
+            
+            # Single contiguous array (a view or memmap where possible)
+            if capture.frames:
+                self.recording_data = capture.get_audio()
+                print(f"Recorded {capture.frames} samples ({capture.duration:.1f} seconds, "
+                      f"{capture.spilled_frames / self.sample_rate:.1f}s spilled to disk)")
             else:
                 self.recording_data = np.array([])
                 print("No data recorded")
@@ -812,19 +1497,23 @@ class SpeechToTextApp:
         except Exception as e:
             print(f"Recording error: {e}")
             self.recording_data = np.array([])
-            if hasattr(self, 'recording_chunks'):
-                self.recording_chunks.clear()
             self.root.after(0, lambda: messagebox.showerror("Recording Error", f"Recording failed: {e}"))
+        finally:
+            self.root.after(0, self._recording_thread_done)
+    
+    def _recording_thread_done(self):
+        """UI side of the recording thread exiting: recording_data is final from here on"""
+        self.recording_finished = True
+        if self.recording_stopping:
+            self._process_recording()
     
     def stop_recording(self):
-        """Stop recording and process audio with optimized cleanup"""
+        """Stop recording; the captured audio goes to the model once the recording thread has assembled it"""
         self.is_recording = False
         
-        # Wait for recording thread to finish cleanly
-        time.sleep(0.2)
-        
         # Stop sounddevice recording
         try:
+            import sounddevice as sd
             sd.stop()
         except:
             pass
@@ -832,49 +1521,76 @@ class SpeechToTextApp:
         # Update UI
         self.mic_btn.configure(text="🎤 Record", style='Secondary.TButton')
         
+        if self.recording_finished:
+            self._process_recording()
+        else:
+            # Closing the stream and flushing a spill file can take a while; never block Tk on it
+            self.recording_stopping = True
+            self.status_var.set("Finishing recording...")
+    
+    def _process_recording(self):
+        """Hand the finished recording straight to the model (or finish live dictation)"""
+        import numpy as np
+        self.recording_stopping = False
+        
+        if self.live_transcriber is not None:
+            # Text is already on screen; the live worker does one last pass over the tail
+            self.live_transcriber.stop()
+            self.status_var.set("Finishing live transcription...")
+            if self.persist_recording_var.get() and self.recording_data is not None and len(self.recording_data) > 0:
+                thread = threading.Thread(target=self._persist_recording, args=(self.recording_data,))
+                thread.daemon = True
+                thread.start()
+            self.recording_data = None
+            return
+        
         # Process recorded audio with better error handling
         try:
-            if hasattr(self, 'recording_data') and len(self.recording_data) > 0:
-                max_amplitude = np.max(np.abs(self.recording_data))
-                duration = len(self.recording_data) / self.sample_rate
+            if self.recording_data is not None and len(self.recording_data) > 0:
+                audio = np.asarray(self.recording_data, dtype=np.float32)
+                max_amplitude = max(audio.max(), -audio.min())  # No full-size abs() copy
+                duration = len(audio) / self.sample_rate
                 print(f"Recording complete: {duration:.1f}s, max amplitude: {max_amplitude}")
                 
                 # Optimize audio for transcription (normalize if too quiet)
+                gain = 1.0
                 if max_amplitude > 0:
-                    # Normalize audio to improve transcription quality
+                    # Normalize audio in place to improve transcription quality
                     if max_amplitude < 0.1:
-                        self.recording_data = self.recording_data * (0.1 / max_amplitude)
+                        gain = 0.1 / max_amplitude
+                        audio *= gain
                         print("Audio normalized for better transcription")
                 
-                # Save to optimized temporary file
-                self.recorded_file = tempfile.mktemp(suffix=".wav")
-                sf.write(self.recorded_file, self.recording_data, self.sample_rate, subtype='PCM_16')
+                # The gate compares energy, so scale the threshold along with the samples
+                gate_threshold = self.sensitivity_threshold * gain ** 2 if self.trim_silence_var.get() else None
                 
-                # Verify and process
-                if os.path.exists(self.recorded_file):
-                    file_size = os.path.getsize(self.recorded_file)
-                    print(f"Audio saved: {file_size} bytes")
-                    
-                    self.file_var.set(self.recorded_file)
-                    self.status_var.set(f"Recording ready ({duration:.1f}s), starting transcription...")
-                    
-                    # Clear recording data to free memory
-                    self.recording_data = None
-                    gc.collect()
-                    
-                    # Auto-start transcription with shorter delay
-                    self.root.after(1000, self.transcribe_file)
-                else:
-                    raise Exception("Failed to create audio file")
+                status = f"Recording ready ({duration:.1f}s), starting transcription..."
             else:
                 # Handle empty recording
                 print("No audio data recorded")
-                self.recording_data = np.zeros(int(0.5 * self.sample_rate), dtype=np.float32)
-                self.recorded_file = tempfile.mktemp(suffix=".wav")
-                sf.write(self.recorded_file, self.recording_data, self.sample_rate)
-                self.file_var.set(self.recorded_file)
-                self.status_var.set("No audio detected, attempting transcription...")
-                self.root.after(1000, self.transcribe_file)
+                audio = np.zeros(int(0.5 * self.sample_rate), dtype=np.float32)
+                gate_threshold = None
+                status = "No audio detected, attempting transcription..."
+            
+            # The buffer is handed over below; drop our reference so it can be freed afterwards
+            self.recording_data = None
+            
+            if self.persist_recording_var.get():
+                # Write the WAV off the UI thread; transcription doesn't wait for it
+                thread = threading.Thread(target=self._persist_recording, args=(audio,))
+                thread.daemon = True
+                thread.start()
+            
+            if self.transcription_token is not None:
+                # A file is still transcribing into the shared output; this recording follows it
+                self.pending_recordings.append((audio, gate_threshold))
+                self.status_var.set("Recording kept - it will be transcribed when the current file finishes")
+                return
+            
+            # Start transcription immediately from memory (no temp file, no re-decode)
+            self.recording_gate_threshold = gate_threshold
+            self.transcribe_file(audio=audio)
+            self.status_var.set(status)
                 
         except Exception as e:
             print(f"Error processing recording: {e}")
@@ -884,29 +1600,126 @@ class SpeechToTextApp:
             # Cleanup on error
             if hasattr(self, 'recording_data'):
                 self.recording_data = None
-            if hasattr(self, 'recording_chunks'):
-                self.recording_chunks.clear()
+            if self.capture is not None:
+                self.capture.close()
+                self.capture = None
             gc.collect()
     
-    def update_level_indicator(self, level_percent, raw_level):
-        """Update the audio level indicator (optimized)"""
+    def start_live_transcription(self):
+        """Run the loaded model over the capture buffer while recording continues"""
+        if not self.model_loaded or self.model is None:
+            self.status_var.set("Model still loading - live text disabled, will transcribe after recording")
+            return
+        if self.transcription_token is not None:
+            self.status_var.set("A file is transcribing - live text disabled, will transcribe after it")
+            return
+        
+        self.transcribing = True
+        self._reset_output()
+        self.save_btn.config(state='disabled')
+        self.copy_btn.config(state='disabled')
+        self.transcribe_btn.config(state='disabled')
+        
+        # Callbacks fire on the live worker thread, so hop to Tk before touching widgets
+        self.live_transcriber = LiveTranscriber(
+            self.model,
+            self.capture,
+            on_commit=lambda text: self.root.after(0, self._live_commit, text),
+            on_tentative=lambda text: self.root.after(0, self._live_tentative, text),
+            on_finished=lambda text, error: self.root.after(0, self._live_finished, text, error),
+        )
+        self.live_transcriber.start()
+    
+    def _clear_tentative(self):
+        """Remove the unstable tail from the end of the output"""
+        ranges = self.text_output.tag_ranges('tentative')
+        if ranges:
+            self.text_output.delete(ranges[0], ranges[-1])
+    
+    def _live_commit(self, text):
+        """Append stabilized text; it will not be revised again"""
+        self._clear_tentative()
+        self.transcript.add_text(text)
+        self._catch_up_output()
+    
+    def _live_tentative(self, text):
+        """Replace the unstable tail with the latest hypothesis"""
+        self._clear_tentative()
+        if text and self.output_page is None:
+            self.text_output.insert(tk.END, text, 'tentative')
+            self.text_output.see(tk.END)
+    
+    def _live_finished(self, text, error):
+        """Wrap up a live dictation session"""
+        self._clear_tentative()
+        self.live_transcriber = None
+        self.transcribing = False
+        self.transcribe_btn.config(state='normal')
+        if error is not None:
+            self.status_var.set(f"Live transcription error: {str(error)[:50]}...")
+        else:
+            self.status_var.set("Live transcription complete!")
+        if text:
+            self.save_btn.config(state='normal')
+            self.copy_btn.config(state='normal')
+        gc.collect()
+    
+    def _persist_recording(self, audio):
+        """Save a recording as a 16-bit WAV in the recordings folder (runs in separate thread)"""
         try:
-            # Only update if widget still exists and we're recording
-            if self.is_recording and hasattr(self, 'level_progress'):
-                self.level_progress['value'] = level_percent
-                self.level_label.config(text=f"{level_percent:.0f}%")
-        except Exception:
+            import soundfile as sf
+            self.recordings_dir.mkdir(parents=True, exist_ok=True)
+            file_path = self.recordings_dir / f"recording_{time.strftime('%Y%m%d_%H%M%S')}.wav"
+            sf.write(str(file_path), audio, self.sample_rate, subtype='PCM_16')
+            self.recorded_file = str(file_path)
+            print(f"Recording saved: {file_path} ({os.path.getsize(file_path)} bytes)")
+            self.root.after(0, lambda: self.file_var.set(str(file_path)))
+        except Exception as e:
+            print(f"Failed to save recording: {e}")
+            self.root.after(0, lambda msg=str(e)[:50]: self.status_var.set(f"Could not save recording: {msg}..."))
+    
+    def _poll_level_meter(self):
+        """Show the latest block level at the UI frame rate while recording"""
+        meter = self.level_meter
+        if not self.is_recording or meter is None:
+            self.update_level_indicator(0.0, 0.0)
+            return
+        blocks, rms, peak = meter.reading
+        if blocks != self.level_blocks_seen:
+            self.level_blocks_seen = blocks
+            self.update_level_indicator(meter.percent(rms), rms, meter.state(rms, peak, self.sensitivity_threshold),
+                                        meter.overflows)
+        self.root.after(self.ui_frame_interval, self._poll_level_meter)
+    
+    def update_level_indicator(self, level_percent, raw_level, state=None, overflows=0):
+        """Update the audio level bar and the clipping/silence/overflow note"""
+        try:
+            self.current_level = raw_level
+            self.level_progress['value'] = level_percent
+            self.level_label.config(text=f"{level_percent:.0f}%")
+            notes = []
+            if state == 'clipping':
+                notes.append("⚠ Clipping")
+            elif state == 'silence':
+                notes.append("Silence")
+            if overflows:
+                notes.append(f"⚠ {overflows} dropped")
+            self.level_state_label.config(text=" · ".join(notes))
+        except tk.TclError:
             # Ignore errors if widgets are being destroyed
             pass
     
     def set_sensitivity(self, threshold):
-        """Set microphone sensitivity threshold"""
+        """Set the energy threshold below which input counts as silence"""
         self.sensitivity_threshold = threshold
         self.animate_status_change(f"Sensitivity set to {threshold} (Lower = more sensitive)")
     
     def test_microphone(self):
         """Test if microphone is working"""
         try:
+            import numpy as np
+            import sounddevice as sd
+            
             devices = sd.query_devices()
             input_devices = [d for d in devices if d.get('max_input_channels', 0) > 0]
             
@@ -928,23 +1741,24 @@ class SpeechToTextApp:
             )
             
             max_amplitude = np.max(np.abs(test_data))
+            energy = float(np.mean(np.square(test_data)))  # Compared like the level meter does
             
             device_name = device_info.get('name', 'Unknown Device')
             device_samplerate = device_info.get('default_samplerate', 'Unknown')
             
-            if max_amplitude > self.sensitivity_threshold:
+            if energy > self.sensitivity_threshold:
                 messagebox.showinfo("Microphone Test", 
                     f"✅ Microphone working!\n\n"
                     f"Device: {device_name}\n"
                     f"Sample Rate: {device_samplerate} Hz\n"
-                    f"Signal Level: {max_amplitude:.6f}\n"
+                    f"Signal Level: {max_amplitude:.6f} (energy {energy:.6f})\n"
                     f"Threshold: {self.sensitivity_threshold:.6f}\n"
                     f"Status: ABOVE threshold ✓")
             else:
                 messagebox.showwarning("Microphone Test", 
                     f"⚠️ Microphone detected but signal too quiet.\n\n"
                     f"Device: {device_name}\n"
-                    f"Signal Level: {max_amplitude:.6f}\n"
+                    f"Signal Level: {max_amplitude:.6f} (energy {energy:.6f})\n"
                     f"Threshold: {self.sensitivity_threshold:.6f}\n"
                     f"Status: BELOW threshold ✗\n\n"
                     f"Try: Higher sensitivity or speak louder.")
@@ -954,7 +1768,7 @@ class SpeechToTextApp:
     
     def copy_to_clipboard(self):
         """Copy transcription to clipboard"""
-        transcription = self.text_output.get(1.0, tk.END).strip()
+        transcription = self.transcript.text()
         if not transcription:
             messagebox.showwarning("Warning", "No transcription to copy!")
             return
@@ -985,28 +1799,54 @@ class SpeechToTextApp:
     
     def save_transcription(self):
         """Save transcription to file"""
-        transcription = self.text_output.get(1.0, tk.END).strip()
-        if not transcription:
+        if not self.transcript:
             messagebox.showwarning("Warning", "No transcription to save!")
             return
         
+        # Timed formats need segments; live dictation only has text
+        filetypes = [("Text Files", "*.txt")]
+        if self.transcript.segments:
+            filetypes += [("SubRip Subtitles", "*.srt"), ("WebVTT Subtitles", "*.vtt"), ("JSON", "*.json")]
         file_path = filedialog.asksaveasfilename(
             title="Save Transcription",
             defaultextension=".txt",
-            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
+            filetypes=filetypes + [("All Files", "*.*")]
         )
         
         if file_path:
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(transcription)
+                if self.transcript.segments and Path(file_path).suffix.lower() in (".srt", ".vtt", ".json"):
+                    write_transcript(file_path, self.transcript.segments, self.transcript.info)
+                else:
+                    with open(file_path, 'w', encoding='utf-8') as f:
+                        f.write(self.transcript.text())
                 messagebox.showinfo("Success", f"Transcription saved to: {file_path}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save file: {e}")
 
 def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Speech to Text GUI")
+    parser.add_argument("--server", nargs="?", const=transcription_server.DEFAULT_URL, metavar="URL",
+                        help="Transcribe through a running transcription_server.py "
+                             f"(default URL: {transcription_server.DEFAULT_URL}); falls back to a local model")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run the model inside the GUI process instead of a separate engine process")
+    parser.add_argument("--threads", type=int, metavar="N",
+                        help="CPU threads the app may use in total (default: all allowed cores)")
+    parser.add_argument("--pin", action="store_true",
+                        help="Pin the app (and its engine) to the first --threads CPUs (Linux)")
+    args = parser.parse_args()
+    
+    # One core is kept for Tk and the audio callback; the rest is split between jobs and decode
+    budget = thread_budget.configure(total=args.threads, reserved=1, pin=args.pin)
+    print(f"Thread budget: {budget.line()}")
+    
+    startup_timer = StartupTimer(_PROCESS_START)
+    startup_timer.mark('gui_imports')
     root = tk.Tk()
-    app = SpeechToTextApp(root)
+    startup_timer.mark('tk_ready')
+    app = SpeechToTextApp(root, startup_timer, server_url=args.server, engine_process=not args.in_process)
     root.mainloop()
 
 if __name__ == "__main__":
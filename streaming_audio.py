@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+import gc
+import os
+import time
+from types import SimpleNamespace
+
+import perf_log
+import thread_budget
+from segment_times import replace_fields, shift_segment
+
+SAMPLE_RATE = 16000
+
+# Cut windows at the quietest 20 ms frame within the last few seconds, so words aren't split
+CUT_FRAME = SAMPLE_RATE // 50
+CUT_SEARCH_SECONDS = 5.0
+
+
+def probe_duration(path):
+    """Duration of the file in seconds from the container header, or None if it doesn't say"""
+    import av
+    try:
+        with av.open(str(path), mode="r", metadata_errors="ignore") as container:
+            stream = container.streams.audio[0]
+            if stream.duration is not None and stream.time_base is not None:
+                return float(stream.duration * stream.time_base)
+            if container.duration is not None:
+                return container.duration / av.time_base
+    except (av.error.FFmpegError, IndexError):
+        pass
+    return None
+
+
+def _quiet_cut(window, search):
+    """Index of the start of the quietest frame in the last `search` samples of window"""
+    import numpy as np
+    tail = window[len(window) - search:]
+    frames = tail[:len(tail) // CUT_FRAME * CUT_FRAME].reshape(-1, CUT_FRAME)
+    energy = np.einsum('ij,ij->i', frames, frames)
+    return len(window) - search + int(np.argmin(energy)) * CUT_FRAME
+
+
+def iter_audio_windows(path, window_seconds=300.0):
+    """Decode and resample a file to 16 kHz mono float32 one window at a time
+
+    Yields (offset_seconds, window). Windows are ~window_seconds long and
+    end at a pause; the audio after the cut is carried into the next
+    window. Only one window buffer is ever allocated, so memory stays flat
+    however long the file is -- the yielded array is reused, copy it to keep it.
+    """
+    import av
+    import numpy as np
+
+    size = int(window_seconds * SAMPLE_RATE)
+    search = min(int(CUT_SEARCH_SECONDS * SAMPLE_RATE), size // 2)
+    buffer = np.empty(size, dtype=np.float32)
+    filled = 0
+    offset = 0  # Samples of the file before buffer[0]
+
+    resampler = av.audio.resampler.AudioResampler(format="flt", layout="mono", rate=SAMPLE_RATE)
+    decode_started = time.perf_counter()
+    with av.open(str(path), mode="r", metadata_errors="ignore") as container:
+        container.streams.audio[0].codec_context.thread_count = thread_budget.current().decode_threads
+        frames = container.decode(audio=0)
+        while True:
+            try:
+                frame = next(frames)
+            except StopIteration:
+                frame = None  # Flushes the resampler
+            except av.error.InvalidDataError:
+                continue
+            if frame is not None:
+                frame.pts = None  # Ignore timestamp checks, like faster-whisper's decoder
+            for resampled in resampler.resample(frame):
+                samples = resampled.to_ndarray().reshape(-1)
+                while len(samples):
+                    take = min(size - filled, len(samples))
+                    buffer[filled:filled + take] = samples[:take]
+                    filled += take
+                    samples = samples[take:]
+                    if filled == size:
+                        cut = _quiet_cut(buffer, search)
+                        perf_log.event("decode_window", offset=round(offset / SAMPLE_RATE, 3),
+                                       audio_seconds=round(cut / SAMPLE_RATE, 3),
+                                       seconds=round(time.perf_counter() - decode_started, 4))
+                        yield offset / SAMPLE_RATE, buffer[:cut]
+                        decode_started = time.perf_counter()
+                        # Carry the audio after the cut to the front of the buffer
+                        buffer[:size - cut] = buffer[cut:]
+                        filled = size - cut
+                        offset += cut
+            if frame is None:
+                break
+
+    # PyAV's resampler holds native buffers until collected (faster-whisper #390)
+    del resampler
+    gc.collect()
+    if filled:
+        perf_log.event("decode_window", offset=round(offset / SAMPLE_RATE, 3),
+                       audio_seconds=round(filled / SAMPLE_RATE, 3),
+                       seconds=round(time.perf_counter() - decode_started, 4))
+        yield offset / SAMPLE_RATE, buffer[:filled]
+
+
+class StreamingTranscriber:
+    """Transcribes files window by window instead of decoding them whole up front
+
+    Wraps a WhisperModel/BatchedInferencePipeline. For a path, the file is
+    decoded in ~window_seconds pieces (see iter_audio_windows) and each one
+    is transcribed as the previous one's segments are consumed, so peak
+    memory no longer grows with file length. The detected language carries
+    across windows and, with carry_prompt, so does the tail of the text as
+    the next window's initial_prompt. Segment ids and timestamps are
+    relative to the whole file. Arrays are passed straight through.
+    """
+
+    def __init__(self, transcriber, window_seconds=300.0, carry_prompt=True):
+        self.transcriber = transcriber
+        self.window_seconds = window_seconds
+        self.carry_prompt = carry_prompt
+
+    def transcribe(self, audio, **params):
+        if not isinstance(audio, (str, os.PathLike)):
+            return self.transcriber.transcribe(audio, **params)
+
+        windows = iter_audio_windows(audio, self.window_seconds)
+        first = next(windows, None)
+        if first is None:
+            import numpy as np
+            return self.transcriber.transcribe(np.zeros(0, dtype=np.float32), **params)
+
+        # Transcribe the first window now so info carries the detected language
+        offset, window = first
+        try:
+            segments, window_info = self.transcriber.transcribe(window, **params)
+            duration = probe_duration(audio)
+        except BaseException:
+            windows.close()  # Releases the open container and the window buffer
+            raise
+        info = SimpleNamespace(language=window_info.language,
+                               language_probability=window_info.language_probability,
+                               duration=duration if duration is not None else 0.0,
+                               duration_after_vad=window_info.duration_after_vad)
+        return self._stream(windows, offset, len(window), segments, info, params), info
+
+    def _stream(self, windows, offset, length, segments, info, params):
+        params = dict(params, language=info.language)
+        segment_id = 0
+        decoded = offset + length / SAMPLE_RATE
+        try:
+            while True:
+                tail = []
+                for segment in segments:
+                    segment_id += 1
+                    tail.append(segment.text)
+                    yield replace_fields(shift_segment(segment, offset), id=segment_id)
+
+                following = next(windows, None)
+                if following is None:
+                    break
+                offset, window = following
+                decoded = offset + len(window) / SAMPLE_RATE
+                if self.carry_prompt and tail:
+                    params["initial_prompt"] = "".join(tail)[-200:]
+                segments, window_info = self.transcriber.transcribe(window, **params)
+                info.duration_after_vad += window_info.duration_after_vad
+        finally:
+            windows.close()
+        # Header duration missing or short: settle on what was actually decoded
+        info.duration = max(info.duration, decoded)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+import os
+
+import numpy as np
+
+from audio_capture import CaptureBuffer
+
+RATE = 100  # Tiny chunks keep the tests fast: chunk_seconds=1.0 is 100 samples
+
+
+def _record(buffer, audio, block=37, maintain=True):
+    """Feed audio in callback-sized blocks, calling maintain() between them like the recording thread"""
+    for start in range(0, len(audio), block):
+        buffer.write(audio[start:start + block])
+        if maintain:
+            buffer.maintain()
+
+
+def _signal(samples, seed=0):
+    return np.random.default_rng(seed).standard_normal(samples).astype(np.float32)
+
+
+def test_in_memory_capture_is_byte_identical():
+    audio = _signal(450)
+    buffer = CaptureBuffer(RATE, chunk_seconds=1.0, max_memory_seconds=None)
+    _record(buffer, audio)
+    assert buffer.frames == 450 and buffer.spilled_frames == 0
+    assert buffer.get_audio().tobytes() == audio.tobytes()
+    buffer.close()
+
+
+def test_single_chunk_capture_is_a_view():
+    audio = _signal(60)
+    buffer = CaptureBuffer(RATE, chunk_seconds=1.0)
+    _record(buffer, audio)
+    result = buffer.get_audio()
+    assert result.tobytes() == audio.tobytes()
+    assert result.base is not None
+    buffer.close()
+
+
+def test_spilled_capture_is_byte_identical(tmp_path):
+    audio = _signal(1030, seed=1)
+    buffer = CaptureBuffer(RATE, chunk_seconds=1.0, max_memory_seconds=2.0, spill_dir=str(tmp_path))
+    _record(buffer, audio)
+    assert buffer.spilled_frames > 0
+    assert buffer.frames - buffer.spilled_frames <= 3 * RATE
+
+    # Ranges across the spill file and the in-memory chunks read back exactly
+    for start, stop in [(0, 50), (90, 310), (buffer.spilled_frames - 5, buffer.spilled_frames + 5), (1000, 2000)]:
+        assert buffer.read(start, stop).tobytes() == audio[start:stop].tobytes()
+
+    result = buffer.get_audio()
+    assert isinstance(result, np.memmap)
+    assert result.tobytes() == audio.tobytes()
+    del result
+
+    spill_files = list(tmp_path.iterdir())
+    assert len(spill_files) == 1
+    buffer.close()
+    assert not os.path.exists(spill_files[0])
+
+
+def test_empty_capture():
+    buffer = CaptureBuffer(RATE, chunk_seconds=1.0)
+    assert len(buffer.get_audio()) == 0
+    assert len(buffer.read(0, 10)) == 0
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from silence_gate import SilenceGatedTranscriber, TimeMap, gate_silence, remap_segment
+
+RATE = 16000
+THRESHOLD = 1e-4
+
+
+def _tone(seconds):
+    return (0.1 * np.sin(np.arange(int(seconds * RATE)) * 0.3)).astype(np.float32)
+
+
+def _silence(seconds):
+    return np.zeros(int(seconds * RATE), dtype=np.float32)
+
+
+def _speech_with_pauses():
+    """1 s silence, 1 s speech, 2 s pause, 1 s speech, 1 s silence"""
+    return np.concatenate([_silence(1), _tone(1), _silence(2), _tone(1), _silence(1)])
+
+
+def test_long_pauses_are_cut_to_keep_pause():
+    audio = _speech_with_pauses()
+    gated, time_map = gate_silence(audio, THRESHOLD, keep_pause=0.4)
+
+    # Each burst keeps 0.2 s either side: [0.8, 2.2) and [3.8, 5.2)
+    assert len(gated) == int(2.8 * RATE)
+    assert gated.tobytes() == np.concatenate([audio[int(0.8 * RATE):int(2.2 * RATE)],
+                                              audio[int(3.8 * RATE):int(5.2 * RATE)]]).tobytes()
+    assert list(time_map.gated_starts) == [0.0, 1.4]
+    assert list(time_map.original_starts) == [0.8, 3.8]
+
+
+def test_times_map_back_to_the_original():
+    _, time_map = gate_silence(_speech_with_pauses(), THRESHOLD, keep_pause=0.4)
+    assert time_map.to_original(0.0) == 0.8
+    assert time_map.to_original(0.2) == 1.0
+    assert time_map.to_original(2.0) == 4.4
+    assert time_map.to_original(2.8, end=True) == 5.2
+
+
+def test_a_time_on_a_cut_belongs_to_the_span_it_bounds():
+    _, time_map = gate_silence(_speech_with_pauses(), THRESHOLD, keep_pause=0.4)
+    assert time_map.to_original(1.4) == 3.8  # Start of the second span
+    assert time_map.to_original(1.4, end=True) == 2.2  # End of the first span
+
+
+def test_short_pauses_are_kept_whole():
+    audio = np.concatenate([_tone(1), _silence(0.3), _tone(1)])
+    gated, time_map = gate_silence(audio, THRESHOLD, keep_pause=0.4)
+    assert gated is audio
+    assert time_map.to_original(1.15) == 1.15
+
+
+def test_silent_or_unbroken_audio_is_returned_unchanged():
+    for audio in (_silence(3), _tone(3), _silence(0.01)):
+        gated, time_map = gate_silence(audio, THRESHOLD)
+        assert gated is audio
+        assert time_map.to_original(1.234) == 1.234
+        assert time_map.to_original(1.234, end=True) == 1.234
+
+
+def test_remap_segment_moves_words_too():
+    time_map = TimeMap([0.0, 1.4], [0.8, 3.8])
+    word = SimpleNamespace(start=1.0, end=1.4, word=" hi", probability=0.9)
+    segment = SimpleNamespace(id=1, start=0.2, end=2.0, text=" hi there", words=[word])
+    remapped = remap_segment(segment, time_map)
+    assert (remapped.start, remapped.end) == (1.0, 4.4)
+    assert (remapped.words[0].start, remapped.words[0].end) == (1.8, 2.2)
+    assert segment.start == 0.2  # The original is left alone
+
+
+class GatedTimesTranscriber:
+    """Stands in for a WhisperModel: reports one segment per second of whatever audio it gets"""
+
+    def __init__(self):
+        self.audio = None
+
+    def transcribe(self, audio, **params):
+        self.audio = audio
+        seconds = len(audio) / RATE
+        segments = (SimpleNamespace(id=i + 1, start=float(i), end=min(i + 1.0, seconds), text=" x", words=None)
+                    for i in range(int(np.ceil(seconds))))
+        return segments, SimpleNamespace(language="en", duration=seconds, duration_after_vad=seconds)
+
+
+def test_gated_transcriber_reports_original_times():
+    inner = GatedTimesTranscriber()
+    segments, info = SilenceGatedTranscriber(inner, THRESHOLD).transcribe(_speech_with_pauses())
+    assert len(inner.audio) == int(2.8 * RATE)
+    assert info.duration == 6.0
+    assert [(s.start, s.end) for s in segments] == [(0.8, 1.8), (1.8, 4.4), (4.4, 5.2)]
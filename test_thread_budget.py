@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import pytest
+
+import thread_budget
+from thread_budget import ThreadBudget
+
+
+@pytest.fixture(autouse=True)
+def sixteen_cores(monkeypatch):
+    """A 16-core host, with no process-wide budget configured yet"""
+    monkeypatch.setattr(thread_budget, "allowed_cores", lambda: list(range(16)))
+    monkeypatch.setattr(thread_budget, "_current", None)
+
+
+@pytest.mark.parametrize("total, jobs, reserved, expected", [
+    (None, None, 0, (16, 3, 4)),  # One job per 8 cores, a decode core each
+    (None, None, 1, (15, 2, 6)),  # The GUI's reserve comes out first
+    (None, 4, 1, (15, 4, 2)),
+    (8, 2, 1, (7, 2, 2)),
+    (4, 2, 1, (3, 2, 1)),  # Too few cores for decode threads of its own
+    (2, None, 1, (1, 1, 1)),
+])
+def test_split(total, jobs, reserved, expected):
+    budget = ThreadBudget(total, jobs, reserved)
+    assert (budget.usable, budget.jobs, budget.inference_threads) == expected
+    assert budget.inference_cores + (budget.jobs if budget.usable >= 3 * budget.jobs else 0) <= budget.usable
+
+
+def test_total_and_reserve_are_capped():
+    budget = ThreadBudget(64, reserved=1)
+    assert budget.total == 16 and budget.cores == list(range(16))
+
+    budget = ThreadBudget(1, reserved=3)
+    assert (budget.total, budget.reserved, budget.usable) == (1, 0, 1)
+    assert budget.jobs == 1 and budget.inference_threads == 1
+
+
+def test_jobs_never_exceed_usable_cores():
+    budget = ThreadBudget(4, jobs=10, reserved=1)
+    assert budget.jobs == 3 and budget.inference_threads == 1
+
+
+def test_inference_threads_for():
+    budget = ThreadBudget(None, None, 1)
+    assert budget.inference_threads_for(1) == 14
+    assert budget.inference_threads_for(5) == 2
+    assert budget.inference_threads_for(6) == 2  # 15 cores: no room for decode threads
+    assert budget.inference_threads_for(2, usable=4) == 2
+    assert budget.inference_threads_for(20) == 1
+
+
+def test_line_describes_decode_placement():
+    assert "1 decode per job" in ThreadBudget(None, 2, 1).line()
+    assert "decode sharing their cores" in ThreadBudget(4, 2, 1).line()
+
+
+def test_set_jobs_keeps_total_reserve_and_pinning():
+    assert thread_budget.current().jobs == 3  # Host default until configured
+
+    thread_budget._current = ThreadBudget(8, 1, 1)
+    thread_budget._current.pinned = True
+    budget = thread_budget.set_jobs(3)
+    assert thread_budget.current() is budget
+    assert (budget.total, budget.reserved, budget.jobs, budget.inference_threads) == (8, 1, 3, 2)
+    assert budget.pinned
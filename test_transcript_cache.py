@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+import itertools
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import transcript_cache
+from transcript_cache import TranscriptCache, hash_audio, transcribe_cached, to_dict
+
+
+def _segment(index, text):
+    word = SimpleNamespace(start=float(index), end=index + 0.5, word=text, probability=0.9)
+    return SimpleNamespace(id=index, start=float(index), end=index + 1.0, text=text, words=[word])
+
+
+class CountingTranscriber:
+    """Stands in for a WhisperModel: yields fixed segments and counts transcribe() calls"""
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.calls = 0
+
+    def transcribe(self, audio, **params):
+        self.calls += 1
+        info = SimpleNamespace(language="en", language_probability=0.99, duration=len(audio) / 16000,
+                               duration_after_vad=len(audio) / 16000, all_language_probs=[("en", 0.99)])
+        return (_segment(i, text) for i, text in enumerate(self.texts)), info
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = TranscriptCache(tmp_path / "cache.sqlite3")
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Deterministic last_used times, one second apart"""
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(transcript_cache.time, "time", lambda: float(next(ticks)))
+
+
+def test_miss_then_hit(cache):
+    audio = np.zeros(16000, dtype=np.float32)
+    transcriber = CountingTranscriber([" hello", " world"])
+
+    segments, info, hit = transcribe_cached(cache, transcriber, audio, ["tiny", "int8", "batched"], beam_size=1)
+    assert not hit
+    live = [to_dict(s) for s in segments]
+
+    segments, cached_info, hit = transcribe_cached(cache, transcriber, audio, ["tiny", "int8", "batched"],
+                                                   beam_size=1)
+    assert hit
+    assert transcriber.calls == 1
+    assert [to_dict(s) for s in segments] == live
+    assert cached_info.language == "en" and cached_info.duration == 1.0
+    assert not hasattr(cached_info, "all_language_probs")  # Only INFO_FIELDS are stored
+
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_key_covers_audio_model_and_params(cache):
+    audio = np.zeros(16000, dtype=np.float32)
+    other_audio = np.ones(16000, dtype=np.float32)
+    key = cache.make_key(hash_audio(audio), ["tiny", "int8", "batched"], {"beam_size": 1})
+    assert key == cache.make_key(hash_audio(audio.copy()), ["tiny", "int8", "batched"], {"beam_size": 1})
+    assert key != cache.make_key(hash_audio(other_audio), ["tiny", "int8", "batched"], {"beam_size": 1})
+    assert key != cache.make_key(hash_audio(audio), ["base", "int8", "batched"], {"beam_size": 1})
+    assert key != cache.make_key(hash_audio(audio), ["tiny", "int8", "batched"], {"beam_size": 5})
+
+
+def test_abandoned_transcription_is_not_stored(cache):
+    audio = np.zeros(16000, dtype=np.float32)
+    segments, _, _ = transcribe_cached(cache, CountingTranscriber([" a", " b", " c"]), audio, ["tiny"])
+    next(segments)
+    segments.close()
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(cache, clock):
+    info = SimpleNamespace(language="en", language_probability=1.0, duration=1.0, duration_after_vad=1.0)
+    cache.put("a", ["tiny"], [_segment(0, " a" * 50)], info)
+    entry_bytes = cache.stats()["bytes"]
+    cache.max_bytes = int(entry_bytes * 2.5)  # Room for two entries
+    cache.put("b", ["tiny"], [_segment(0, " b" * 50)], info)
+    assert cache.get("a") is not None  # "a" is now more recently used than "b"
+
+    cache.put("c", ["tiny"], [_segment(0, " c" * 50)], info)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 1
+    assert stats["bytes"] <= cache.max_bytes
+
+
+def test_clear_resets_entries_and_counters(cache):
+    audio = np.zeros(16000, dtype=np.float32)
+    segments, _, _ = transcribe_cached(cache, CountingTranscriber([" x"]), audio, ["tiny"])
+    list(segments)
+    cache.clear()
+    assert cache.stats() == {"entries": 0, "bytes": 0, "hits": 0, "misses": 0, "evictions": 0, "hit_rate": 0.0}
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from transcript_writers import SegmentWriter, TranscriptWriters, format_timestamp, write_transcript
+
+INFO = SimpleNamespace(language="en", language_probability=0.99, duration=3.0, duration_after_vad=3.0)
+
+
+def _segments():
+    return [SimpleNamespace(id=1, start=0.0, end=1.5, text=" Hello there.", words=None),
+            SimpleNamespace(id=2, start=1.5, end=3.0, text=" General Kenobi.", words=None)]
+
+
+def test_format_timestamp():
+    assert format_timestamp(1.5) == "00:00:01.500"
+    assert format_timestamp(1.5, ",") == "00:00:01,500"
+    assert format_timestamp(3723.0456) == "01:02:03.046"
+    assert format_timestamp(-0.2) == "00:00:00.000"
+
+
+def test_segment_writer_is_abstract(tmp_path):
+    with pytest.raises(TypeError):
+        SegmentWriter(tmp_path / "out.txt")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_outputs_are_renamed_into_place_on_success(tmp_path):
+    base = tmp_path / "talk"
+    with TranscriptWriters(base, ["txt", "srt", "vtt", "json"]) as writers:
+        writers.begin(INFO)
+        for segment in _segments():
+            writers.write(segment)
+        # Only the partial files exist until the block completes
+        assert sorted(p.name for p in tmp_path.iterdir()) == \
+            ["talk.json.part", "talk.srt.part", "talk.txt.part", "talk.vtt.part"]
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["talk.json", "talk.srt", "talk.txt", "talk.vtt"]
+    assert (tmp_path / "talk.txt").read_text(encoding="utf-8") == " Hello there.  General Kenobi."
+    assert (tmp_path / "talk.srt").read_text(encoding="utf-8") == (
+        "1\n00:00:00,000 --> 00:00:01,500\nHello there.\n\n"
+        "2\n00:00:01,500 --> 00:00:03,000\nGeneral Kenobi.\n\n")
+    assert (tmp_path / "talk.vtt").read_text(encoding="utf-8") == (
+        "WEBVTT\n\n"
+        "00:00:00.000 --> 00:00:01.500\nHello there.\n\n"
+        "00:00:01.500 --> 00:00:03.000\nGeneral Kenobi.\n\n")
+    data = json.loads((tmp_path / "talk.json").read_text(encoding="utf-8"))
+    assert data["language"] == "en" and data["duration"] == 3.0
+    assert [s["text"] for s in data["segments"]] == [" Hello there.", " General Kenobi."]
+
+
+def test_outputs_are_discarded_on_error(tmp_path):
+    with pytest.raises(RuntimeError):
+        with TranscriptWriters(tmp_path / "talk", ["txt", "srt"]) as writers:
+            writers.begin(INFO)
+            writers.write(_segments()[0])
+            raise RuntimeError("transcription failed")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_write_transcript_picks_format_and_discards_on_error(tmp_path):
+    write_transcript(tmp_path / "talk.srt", _segments(), INFO)
+    assert (tmp_path / "talk.srt").read_text(encoding="utf-8").startswith("1\n00:00:00,000 --> 00:00:01,500\n")
+
+    def failing():
+        yield _segments()[0]
+        raise RuntimeError("transcription failed")
+
+    with pytest.raises(RuntimeError):
+        write_transcript(tmp_path / "other.vtt", failing(), INFO)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["talk.srt"]
+
+
+def test_partial_json_lines_parse(tmp_path):
+    writers = TranscriptWriters(tmp_path / "talk", ["json"])
+    writers.begin(INFO)
+    for segment in _segments():
+        writers.write(segment)
+    lines = (tmp_path / "talk.json.part").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line.rstrip(","))["id"] for line in lines[1:]] == [1, 2]
+    writers.close(keep=False)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+
+import os
+import threading
+import time
+
+import perf_log
+
+# Thread pools of the numeric libraries; our numpy work is elementwise, so one thread each
+# keeps BLAS/OpenMP from spinning up a pool per core next to CTranslate2's threads.
+# CTranslate2 itself falls back to OMP_NUM_THREADS only when cpu_threads is 0, which
+# tuning.plan_resources passes only for a detected GPU.
+LIBRARY_THREAD_VARS = ["OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+                       "VECLIB_MAXIMUM_THREADS", "NUMEXPR_NUM_THREADS"]
+
+_current = None
+_lock = threading.Lock()
+
+
+def allowed_cores():
+    """CPU ids this process may run on (all of them where affinity isn't supported)"""
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return list(range(os.cpu_count() or 1))
+
+
+class ThreadBudget:
+    """How the cores given to the app are split between its thread pools
+
+    total cores are divided as: `reserved` for the Tk loop and the audio
+    callback, one decode thread per job when there are enough cores to
+    spare (otherwise decode shares with inference -- it only runs between
+    windows), and the rest as `jobs` concurrent transcriptions of
+    `inference_threads` CTranslate2 intra-op threads each. cores lists the
+    CPU ids the budget covers, used when pinning.
+    """
+
+    def __init__(self, total=None, jobs=None, reserved=0):
+        cores = allowed_cores()
+        self.total = max(1, min(total or len(cores), len(cores)))
+        self.cores = cores[:self.total]
+        self.reserved = min(reserved, self.total - 1)
+        usable = self.total - self.reserved
+        # Default: one job per 8 cores (1 to 4), like tuning.plan_resources
+        self.jobs = max(1, min(jobs or min(4, usable // 8 + 1), usable))
+        self.decode_threads = 1
+        self.inference_threads = self.inference_threads_for(self.jobs)
+        self.pinned = False
+
+    @property
+    def usable(self):
+        """Cores left for decode and inference once the reserve is taken out"""
+        return self.total - self.reserved
+
+    def inference_threads_for(self, jobs, usable=None):
+        """Intra-op threads per job if `jobs` transcriptions share the usable cores"""
+        usable = usable or self.usable
+        decode_cores = jobs * self.decode_threads if usable >= 3 * jobs else 0
+        return max(1, (usable - decode_cores) // jobs)
+
+    @property
+    def inference_cores(self):
+        """Cores the jobs' inference threads may use together"""
+        return self.jobs * self.inference_threads
+
+    def as_dict(self):
+        return {"total": self.total, "reserved": self.reserved, "jobs": self.jobs,
+                "inference_threads": self.inference_threads, "decode_threads": self.decode_threads,
+                "pinned": self.pinned}
+
+    def line(self):
+        decode = (f"{self.decode_threads} decode per job" if self.usable >= 3 * self.jobs
+                  else "decode sharing their cores")
+        return (f"{self.total} threads: {self.jobs} job(s) x {self.inference_threads} inference, "
+                f"{decode}, {self.reserved} reserved"
+                + (f", pinned to CPUs {self.cores[0]}-{self.cores[-1]}" if self.pinned else ""))
+
+
+def configure(total=None, jobs=None, reserved=0, pin=False):
+    """Set the process-wide budget and apply it; returns the ThreadBudget
+
+    Call before numpy or faster_whisper are imported so the library thread
+    variables take effect (they are inherited by worker and engine
+    processes too). With pin, the process is restricted to the budget's
+    cores where the OS supports it (Linux).
+    """
+    global _current
+    budget = ThreadBudget(total, jobs, reserved)
+    for name in LIBRARY_THREAD_VARS:
+        os.environ.setdefault(name, "1")
+    if pin:
+        try:
+            os.sched_setaffinity(0, budget.cores)
+            budget.pinned = True
+        except (AttributeError, OSError) as e:
+            print(f"CPU pinning not available: {e}")
+    with _lock:
+        _current = budget
+    perf_log.event("thread_budget", **budget.as_dict())
+    return budget
+
+
+def current():
+    """The configured budget, or the default one for this host if configure() hasn't run"""
+    with _lock:
+        return _current if _current is not None else ThreadBudget()
+
+
+def set_jobs(jobs):
+    """Change the number of concurrent jobs, keeping the rest of the budget; returns it"""
+    global _current
+    with _lock:
+        previous = _current or ThreadBudget()
+        budget = ThreadBudget(previous.total, jobs, previous.reserved)
+        budget.pinned = previous.pinned
+        _current = budget
+    return budget
+
+
+def cpu_seconds(pid=None):
+    """CPU time (user + system) used so far by a process; None if it can't be read"""
+    if pid is None or pid == os.getpid():
+        return time.process_time()
+    try:
+        with open(f"/proc/{pid}/stat", 'r') as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class CpuMonitor:
+    """How busy the budget is: CPU time of this process (and others, e.g. the engine) per wall second
+
+    sample() returns the utilization since the previous call as a fraction
+    of the budget's total threads (1.0 = every budgeted core busy).
+    """
+
+    def __init__(self, pids=()):
+        self.pids = list(pids)
+        self._last = self._read()
+
+    def _read(self):
+        used = cpu_seconds()
+        for pid in self.pids:
+            used += cpu_seconds(pid) or 0.0
+        return time.perf_counter(), used
+
+    def track(self, pids):
+        """Follow a different set of other processes from now on"""
+        self.pids = [pid for pid in pids if pid is not None]
+        self._last = self._read()
+
+    def sample(self):
+        (then, used_then), (now, used_now) = self._last, self._read()
+        self._last = (now, used_now)
+        elapsed = now - then
+        if elapsed <= 0:
+            return 0.0
+        return max(0.0, used_now - used_then) / elapsed / current().total
@@ -1,62 +1,400 @@
 #!/usr/bin/env python3
 
-import whisper
+import argparse
 import sys
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-def transcribe_audio(audio_file, model_size="turbo"):
+from cancellation import CancellationToken, TranscriptionCancelled, cancellable
+import hardware_probe
+import perf_log
+from model_manager import LoadedModel, ModelManager
+from parallel_transcribe import ParallelTranscriber
+from streaming_audio import StreamingTranscriber
+from transcript_cache import TranscriptCache, transcribe_cached
+import thread_budget
+import transcription_server
+from transcript_writers import FORMATS, TranscriptWriters
+import tuning
+
+MODEL_SIZES = ["tiny", "base", "small", "medium", "large", "turbo"]
+AUDIO_EXTENSIONS = {".mp3", ".wav", ".flac", ".m4a", ".ogg", ".wma"}
+
+
+def load_model(model_size="turbo", num_workers=None, server=None):
+    """
+    Load a faster-whisper model on the best device for this machine
+
+    Args:
+        model_size (str): Whisper model size (tiny, base, small, medium, large, turbo)
+        num_workers (int): Number of transcriptions the model may run in parallel
+            (default: picked from cores and memory, see tuning.py)
+        server (str): URL of a running transcription_server.py to use instead,
+            if it answers; its clients stand in for the model and pipeline
+
+    Returns:
+        LoadedModel: model plus its BatchedInferencePipeline
+    """
+    if server:
+        client = transcription_server.connect(server)
+        if client is not None:
+            print(f"Using transcription server at {server} ({model_size})")
+            client = client.with_options(model_size=model_size)
+            return LoadedModel(model_size, "server", client.compute_type,
+                               client.with_options(pipeline='regular'), client)
+        print("Falling back to a local model")
+
+    probe = hardware_probe.load_probe()
+    print(f"Loading Whisper model: {model_size} ({probe['device']}, {probe['compute_type']})")
+    manager = ModelManager(memory_budget_mb=float('inf'), num_workers=num_workers)
+    loaded = manager.load(model_size, probe["device"], probe["compute_type"])
+    resources = loaded.resources
+    print(f"Resources: batch size {resources['batch_size']}, {resources['cpu_threads']} CPU threads, "
+          f"{resources['num_workers']} workers ({resources['source']})")
+    return loaded
+
+
+def run_calibration(model_size="turbo"):
+    """Find the fastest batch size for this machine and model and save it for later loads"""
+    loaded = load_model(model_size)
+    print(f"Calibrating batch size on a {tuning.CALIBRATION_SECONDS}s synthetic clip...")
+    results = tuning.calibrate(loaded)
+    timed = [(size, seconds) for size, seconds in results if seconds is not None]
+    if timed:
+        best = min(timed, key=lambda result: result[1])
+        print(f"Saved batch size {best[0]} for {model_size} ({loaded.device}, {loaded.compute_type})")
+
+
+def open_cache(enabled=True):
+    """The shared transcription cache, or None if disabled/unavailable"""
+    if not enabled:
+        return None
+    try:
+        return TranscriptCache()
+    except Exception as e:
+        print(f"Transcription cache disabled: {e}")
+        return None
+
+
+def consume_segments(segments, info, writers=None, cancel_token=None):
+    """Join the segment texts, streaming each segment to the output files as it arrives
+
+    A cancelled cancel_token stops decoding before the next segment and
+    raises TranscriptionCancelled; output written so far stays on disk.
+    """
+    texts = []
+    if writers is not None:
+        writers.begin(info)
+    for segment in cancellable(segments, cancel_token):
+        texts.append(segment.text)
+        if writers is not None:
+            writers.write(segment)
+    return " ".join(texts)
+
+
+def transcribe_loaded(loaded, audio, cache=None, writers=None, cancel_token=None):
+    """Transcribe a path or 16 kHz float32 array with an already loaded model; returns (text, info, hit)
+
+    With writers (a TranscriptWriters), every format is written incrementally during decoding.
+    """
+    # Same key layout as the GUI, so either one can reuse the other's results
+    model_key = [loaded.model_size, loaded.compute_type, 'batched']
+    if loaded.device == "server":
+        # The server decodes, streams and logs timings itself
+        segments, info, hit = transcribe_cached(cache, loaded.batched_model, audio, model_key)
+        return consume_segments(segments, info, writers, cancel_token), info, hit
+    instrumented = perf_log.InstrumentedTranscriber(loaded.batched_model, model=loaded.model_size, pipeline='batched')
+    # Paths are decoded window by window, so a long file never sits in memory whole
+    streaming = StreamingTranscriber(instrumented, carry_prompt=False)
+    segments, info, hit = transcribe_cached(cache, streaming, audio, model_key)
+    return consume_segments(segments, info, writers, cancel_token), info, hit
+
+
+def transcribe_parallel(audio_file, model_size="turbo", workers=None, cache=None, writers=None):
+    """Transcribe one long file across a pool of worker processes; returns (text, info, hit)"""
+    transcriber = ParallelTranscriber(model_size, workers)
+    try:
+        model_key = [model_size, transcriber.compute_type, 'parallel']
+        instrumented = perf_log.InstrumentedTranscriber(transcriber, model=model_size, pipeline='parallel')
+        segments, info, hit = transcribe_cached(cache, instrumented, audio_file, model_key)
+        text = consume_segments(segments, info, writers)
+    finally:
+        transcriber.close()
+    return text, info, hit
+
+
+def transcribe_audio(audio_file, model_size="turbo", use_cache=True, parallel=None, server=None, writers=None):
     """
     Transcribe audio file using Whisper
-    
+
     Args:
         audio_file (str): Path to audio file
         model_size (str): Whisper model size (tiny, base, small, medium, large, turbo)
-    
+        use_cache (bool): Reuse a cached result for identical audio and settings
+        parallel (int): If not None, split the file at pauses and transcribe it
+            with this many worker processes (0 = pick from cores and memory)
+        server (str): URL of a transcription server to send the file to
+        writers (TranscriptWriters): Output files written as segments arrive
+
     Returns:
         str: Transcribed text
     """
-    print(f"Loading Whisper model: {model_size}")
-    model = whisper.load_model(model_size)
-    
+    cache = open_cache(use_cache)
+
     print(f"Transcribing: {audio_file}")
-    result = model.transcribe(audio_file)
-    
-    return result["text"]
+    if parallel is not None:
+        text, info, hit = transcribe_parallel(audio_file, model_size, parallel or None, cache, writers)
+    else:
+        loaded = load_model(model_size, server=server)
+        text, info, hit = transcribe_loaded(loaded, audio_file, cache, writers)
+    if hit:
+        print("(result loaded from transcription cache)")
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python transcribe.py <audio_file> [model_size]")
+    return text
+
+
+def output_base_for(audio_file, output_dir=None):
+    """Output path without extension: <stem>_transcription beside the audio or in output_dir"""
+    audio_file = Path(audio_file)
+    directory = Path(output_dir) if output_dir else audio_file.parent
+    return directory / (audio_file.stem + "_transcription")
+
+
+def output_path_for(audio_file, output_dir=None, fmt="txt"):
+    """Where the transcription for audio_file goes in one format (<stem>_transcription.<fmt>)"""
+    return Path(f"{output_base_for(audio_file, output_dir)}.{fmt}")
+
+
+def is_up_to_date(audio_file, output_files):
+    """True when every output exists and is newer than the audio"""
+    if isinstance(output_files, (str, os.PathLike)):
+        output_files = [output_files]
+    try:
+        audio_mtime = os.path.getmtime(audio_file)
+        return all(os.path.getmtime(output_file) >= audio_mtime for output_file in output_files)
+    except OSError:
+        return False
+
+
+def collect_inputs(paths, manifest=None):
+    """Expand files, directories (recursively) and an optional manifest into audio files"""
+    entries = list(paths)
+    if manifest:
+        with open(manifest, 'r', encoding='utf-8') as f:
+            entries.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+
+    files = []
+    seen = set()
+    for entry in entries:
+        path = Path(entry)
+        if path.is_dir():
+            candidates = sorted(p for p in path.rglob('*') if p.suffix.lower() in AUDIO_EXTENSIONS)
+        elif path.exists():
+            candidates = [path]
+        else:
+            print(f"Warning: '{entry}' not found, skipping")
+            continue
+        for candidate in candidates:
+            key = candidate.resolve()
+            if key not in seen:
+                seen.add(key)
+                files.append(candidate)
+    return files
+
+
+def run_batch(files, model_size="turbo", jobs=2, output_dir=None, force=False, use_cache=True, server=None,
+              formats=("txt",)):
+    """
+    Transcribe many files with one model load and bounded parallelism
+
+    Each worker decodes its file with PyAV window by window while
+    transcribing it, so at most `jobs` decode windows are held in memory
+    and decoding overlaps with inference on the other files. Each requested
+    output format is written incrementally while its file transcribes. Files already in the
+    transcription cache are served from it without decoding.
+
+    Returns:
+        dict: counts plus audio/wall seconds and CPU utilization for the run
+    """
+    todo = []
+    skipped = 0
+    for audio_file in files:
+        output_base = output_base_for(audio_file, output_dir)
+        outputs = [output_path_for(audio_file, output_dir, fmt) for fmt in formats]
+        if not force and is_up_to_date(audio_file, outputs):
+            skipped += 1
+        else:
+            todo.append((audio_file, output_base))
+    print(f"{len(files)} files found, {skipped} up to date, {len(todo)} to transcribe")
+
+    stats = {"done": 0, "failed": 0, "skipped": skipped, "cached": 0, "audio_seconds": 0.0, "wall_seconds": 0.0}
+    if not todo:
+        return stats
+
+    started = time.perf_counter()
+    loaded = load_model(model_size, num_workers=jobs, server=server)
+    print(f"Model loaded in {time.perf_counter() - started:.1f}s")
+
+    if output_dir:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    lock = threading.Lock()
+    cache = open_cache(use_cache)
+    cancel_token = CancellationToken()
+
+    def work(audio_file, output_base):
+        file_started = time.perf_counter()
+        cancel_token.raise_if_cancelled()
+        with TranscriptWriters(output_base, formats) as writers:
+            text, info, hit = transcribe_loaded(loaded, str(audio_file), cache, writers, cancel_token)
+        if hit:
+            with lock:
+                stats["cached"] += 1
+        return info.duration, time.perf_counter() - file_started
+
+    batch_started = time.perf_counter()
+    cpu_monitor = thread_budget.CpuMonitor()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(work, audio_file, output_base): audio_file for audio_file, output_base in todo}
+        try:
+            for future in as_completed(futures):
+                audio_file = futures[future]
+                try:
+                    duration, elapsed = future.result()
+                    with lock:
+                        stats["done"] += 1
+                        stats["audio_seconds"] += duration
+                    print(f"[{stats['done'] + stats['failed']}/{len(todo)}] {audio_file} "
+                          f"({duration:.0f}s audio in {elapsed:.1f}s, RTF {elapsed / max(duration, 1e-9):.2f})")
+                except TranscriptionCancelled:
+                    pass
+                except Exception as e:
+                    with lock:
+                        stats["failed"] += 1
+                    print(f"[{stats['done'] + stats['failed']}/{len(todo)}] {audio_file} FAILED: {e}")
+        except KeyboardInterrupt:
+            # Running files stop at their next segment; queued ones never start
+            print("\nCancelling...")
+            cancel_token.cancel()
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+    stats["wall_seconds"] = time.perf_counter() - batch_started
+    stats["cpu_utilization"] = cpu_monitor.sample()
+    return stats
+
+
+def print_batch_summary(stats):
+    wall_hours = stats["wall_seconds"] / 3600
+    audio_hours = stats["audio_seconds"] / 3600
+    print("\n" + "="*50)
+    print(f"Transcribed: {stats['done']} ({stats['cached']} from cache)  Skipped: {stats['skipped']}  Failed: {stats['failed']}")
+    print(f"Audio: {audio_hours:.2f} h in {stats['wall_seconds']:.1f} s wall time")
+    if wall_hours > 0:
+        print(f"Throughput: {audio_hours / wall_hours:.1f} audio-hours per wall-hour")
+    if "cpu_utilization" in stats:
+        print(f"CPU: {stats['cpu_utilization']:.0%} of the {thread_budget.current().total}-thread budget")
+    print("="*50)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Transcribe audio with faster-whisper. One file prints the text; "
+                    "several files, directories or a manifest run in batch mode.",
+        epilog="Example: python transcribe.py audio.mp3 turbo | python transcribe.py recordings/ -j 4"
+    )
+    parser.add_argument("inputs", nargs="*", help="Audio files or directories (optionally followed by a model size)")
+    parser.add_argument("-m", "--model", choices=MODEL_SIZES, help="Model size (default: turbo)")
+    parser.add_argument("--manifest", help="Text file with one audio path per line")
+    parser.add_argument("-j", "--jobs", type=int, default=2, help="Files transcribed in parallel in batch mode (default: 2)")
+    parser.add_argument("-o", "--output-dir", help="Write results here (default: next to each file in batch mode, "
+                                                       "the current directory for a single file)")
+    parser.add_argument("-f", "--format", dest="formats", nargs="+", choices=FORMATS, default=["txt"],
+                        help="Output formats, written while decoding (default: txt)")
+    parser.add_argument("--force", action="store_true", help="Re-transcribe files whose output is up to date")
+    parser.add_argument("--no-cache", action="store_true", help="Don't read or write the transcription cache")
+    parser.add_argument("-p", "--parallel", type=int, nargs="?", const=0, metavar="WORKERS",
+                        help="Long single file: split at pauses and transcribe across WORKERS processes, "
+                             "each with its own CPU int8 model (default: picked from cores and memory)")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="Time a short synthetic clip at several batch sizes and remember the fastest")
+    parser.add_argument("--server", nargs="?", const=transcription_server.DEFAULT_URL, metavar="URL",
+                        help="Use a running transcription_server.py instead of loading a model "
+                             f"(default URL: {transcription_server.DEFAULT_URL})")
+    parser.add_argument("--threads", type=int, metavar="N",
+                        help="CPU threads to use in total, split between jobs, inference and decode "
+                             "(default: all allowed cores)")
+    parser.add_argument("--pin", action="store_true", help="Pin the process to the first --threads CPUs (Linux)")
+    args = parser.parse_args(argv)
+
+    # Keep the original "transcribe.py <audio_file> [model_size]" form working
+    if args.inputs and args.inputs[-1] in MODEL_SIZES and not os.path.exists(args.inputs[-1]):
+        legacy_model = args.inputs.pop()
+        args.model = args.model or legacy_model
+    args.model = args.model or "turbo"
+
+    if not args.inputs and not args.manifest and not args.calibrate:
+        parser.print_usage()
         print("Model sizes: tiny, base, small, medium, large, turbo (default)")
         print("Example: python transcribe.py audio.mp3 turbo")
         sys.exit(1)
-    
-    audio_file = sys.argv[1]
-    model_size = sys.argv[2] if len(sys.argv) > 2 else "turbo"
-    
+    return args
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    batch_mode = bool(args.manifest) or len(args.inputs) > 1 or any(os.path.isdir(p) for p in args.inputs)
+
+    # Set before any model or numpy import; -j is the budget's job count in batch mode
+    budget = thread_budget.configure(total=args.threads, jobs=max(1, args.jobs) if batch_mode else 1, pin=args.pin)
+    print(f"Thread budget: {budget.line()}")
+
+    if args.calibrate:
+        run_calibration(args.model)
+        return
+
+    if batch_mode:
+        if args.parallel is not None:
+            print("Note: --parallel applies to single files; batch mode runs files in parallel with -j")
+        files = collect_inputs(args.inputs, args.manifest)
+        if not files:
+            print("Error: no audio files found!")
+            sys.exit(1)
+        stats = run_batch(files, args.model, budget.jobs, args.output_dir, args.force,
+                          use_cache=not args.no_cache, server=args.server, formats=args.formats)
+        print_batch_summary(stats)
+        sys.exit(1 if stats["failed"] else 0)
+
+    audio_file = args.inputs[0]
+    model_size = args.model
+
     if not os.path.exists(audio_file):
         print(f"Error: Audio file '{audio_file}' not found!")
         sys.exit(1)
-    
+
     try:
-        text = transcribe_audio(audio_file, model_size)
-        
+        # Outputs go to the current directory unless -o is given, written as segments arrive
+        output_base = Path(args.output_dir or ".") / (Path(audio_file).stem + "_transcription")
+        if args.output_dir:
+            Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+        with TranscriptWriters(output_base, args.formats) as writers:
+            text = transcribe_audio(audio_file, model_size, use_cache=not args.no_cache, parallel=args.parallel,
+                                    server=args.server, writers=writers)
+
         # Print transcription
         print("\n" + "="*50)
         print("TRANSCRIPTION:")
         print("="*50)
         print(text)
         print("="*50)
-        
-        # Save to file
-        output_file = Path(audio_file).stem + "_transcription.txt"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(text)
-        print(f"\nTranscription saved to: {output_file}")
-        
+
+        print(f"\nTranscription saved to: {', '.join(str(path) for path in writers.paths)}")
+
     except Exception as e:
         print(f"Error during transcription: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+import dataclasses
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+
+from hardware_probe import cache_dir
+
+# Fields of TranscriptionInfo worth keeping; the rest (options, language probs) is bulky
+INFO_FIELDS = ["language", "language_probability", "duration", "duration_after_vad"]
+
+
+def hash_audio(source):
+    """sha256 of the audio content: file bytes for a path, sample bytes for a numpy array"""
+    digest = hashlib.sha256()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    else:
+        digest.update(b"pcm-f32-16k:")
+        digest.update(memoryview(source).cast('B') if source.flags.c_contiguous else source.tobytes())
+    return digest.hexdigest()
+
+
+def to_dict(obj):
+    """A faster-whisper Segment/Word (dataclass, namedtuple or namespace) as a plain dict, words included"""
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    data = obj._asdict() if hasattr(obj, '_asdict') else vars(obj)
+    return {key: _to_plain(value) for key, value in data.items()}
+
+
+def _to_plain(value):
+    """to_dict() for nested values: word objects become dicts, lists are converted item by item"""
+    if dataclasses.is_dataclass(value) or hasattr(value, '_asdict') or isinstance(value, SimpleNamespace):
+        return to_dict(value)
+    if isinstance(value, (list, tuple)):
+        return [_to_plain(item) for item in value]
+    return value
+
+
+def to_namespace(data):
+    """Rebuild a segment/word so cached hits look like live faster-whisper results"""
+    if isinstance(data, dict):
+        return SimpleNamespace(**{k: to_namespace(v) for k, v in data.items()})
+    if isinstance(data, list):
+        return [to_namespace(v) for v in data]
+    return data
+
+
+class TranscriptCache:
+    """SQLite store of finished transcriptions keyed by audio hash, model and decode settings
+
+    Entries hold the full segment list and the key fields of the
+    TranscriptionInfo, zlib-compressed. When the stored size passes
+    max_bytes the least recently used entries are deleted.
+    """
+
+    def __init__(self, path=None, max_bytes=256 * 1024 * 1024):
+        self.path = str(path or cache_dir() / "transcripts.sqlite3")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, model TEXT, size INTEGER, created REAL,"
+                " last_used REAL, hits INTEGER DEFAULT 0, info TEXT, segments BLOB)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER)")
+
+    @staticmethod
+    def make_key(audio_hash, model_key, params):
+        """Cache key from the audio hash, model identity (size/compute type/pipeline) and decode params"""
+        settings = json.dumps({"model": model_key, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha256(f"{audio_hash}:{settings}".encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """(segments, info) for a hit, None for a miss"""
+        with self._lock:
+            row = self._conn.execute("SELECT info, segments FROM entries WHERE key = ?", (key,)).fetchone()
+            with self._conn:
+                if row is None:
+                    self._bump("misses")
+                    return None
+                self._conn.execute("UPDATE entries SET last_used = ?, hits = hits + 1 WHERE key = ?",
+                                   (time.time(), key))
+                self._bump("hits")
+        info = SimpleNamespace(**json.loads(row[0]))
+        segments = to_namespace(json.loads(zlib.decompress(row[1])))
+        return segments, info
+
+    def put(self, key, model_key, segments, info):
+        info_data = {field: getattr(info, field, None) for field in INFO_FIELDS}
+        blob = zlib.compress(json.dumps([to_dict(s) for s in segments]).encode('utf-8'))
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, model, size, created, last_used, hits, info, segments)"
+                " VALUES (?, ?, ?, ?, ?, 0, ?, ?)",
+                (key, json.dumps(model_key), len(blob), now, now, json.dumps(info_data), blob)
+            )
+            self._evict()
+
+    def recording(self, key, model_key, segments, info):
+        """Pass segments through, storing them once the generator is fully consumed"""
+        collected = []
+        for segment in segments:
+            collected.append(segment)
+            yield segment
+        # Only complete transcriptions are cached; an abandoned generator never gets here
+        try:
+            self.put(key, model_key, collected, info)
+        except Exception as e:
+            print(f"Could not store transcription in cache: {e}")
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_used").fetchall():
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._bump("evictions")
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def _bump(self, name):
+        self._conn.execute("INSERT INTO stats (name, value) VALUES (?, 1)"
+                           " ON CONFLICT(name) DO UPDATE SET value = value + 1", (name,))
+
+    def stats(self):
+        """Entry count, stored bytes and lifetime hit/miss/eviction counters"""
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            counters = dict(self._conn.execute("SELECT name, value FROM stats").fetchall())
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": hits,
+            "misses": misses,
+            "evictions": counters.get("evictions", 0),
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM stats")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def transcribe_cached(cache, transcriber, audio, model_key, **params):
+    """transcriber.transcribe(audio, **params) with a cache in front
+
+    Returns (segments, info, hit). On a miss the segments are a generator
+    that streams live results and stores them when it finishes.
+    """
+    if cache is None:
+        segments, info = transcriber.transcribe(audio, **params)
+        return segments, info, False
+
+    key = cache.make_key(hash_audio(audio), model_key, params)
+    cached = cache.get(key)
+    if cached is not None:
+        segments, info = cached
+        return iter(segments), info, True
+
+    segments, info = transcriber.transcribe(audio, **params)
+    return cache.recording(key, model_key, segments, info), info, False
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+
+class TranscriptStore:
+    """The transcript on screen, held apart from the Tk text widget
+
+    Pieces are appended in order: segment texts (spaced like the output
+    box shows them) or committed live-dictation text. Pieces are grouped
+    into pages of page_size so the view only ever renders a bounded amount
+    of text, and copy/save read from here instead of back out of the
+    widget. Segments are kept alongside for timed exports.
+    """
+
+    def __init__(self, page_size=1000):
+        self.page_size = page_size
+        self.clear()
+
+    def clear(self):
+        self.pieces = []
+        self.segments = []
+        self.info = None
+        self._page_chars = []  # Characters per page, kept so the view can trim pages without counting
+
+    def __len__(self):
+        return len(self.pieces)
+
+    def __bool__(self):
+        return any(self.pieces)
+
+    def add_segment(self, segment):
+        """Append a decoded segment; returns the text piece added"""
+        self.segments.append(segment)
+        return self.add_text(segment.text if not self.pieces else " " + segment.text)
+
+    def add_text(self, text):
+        """Append raw text (live commits, a finished job's transcript); returns it"""
+        if len(self.pieces) % self.page_size == 0:
+            self._page_chars.append(0)
+        self.pieces.append(text)
+        self._page_chars[-1] += len(text)
+        return text
+
+    @property
+    def page_count(self):
+        return len(self._page_chars)
+
+    def page_chars(self, page):
+        return self._page_chars[page]
+
+    def page_text(self, page):
+        start = page * self.page_size
+        return "".join(self.pieces[start:start + self.page_size])
+
+    def text(self):
+        """The whole transcript as one string"""
+        return "".join(self.pieces).strip()
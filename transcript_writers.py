@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from transcript_cache import INFO_FIELDS, to_dict
+
+FORMATS = ["txt", "srt", "vtt", "json"]
+
+
+def format_timestamp(seconds, decimal_marker="."):
+    """HH:MM:SS.mmm (SRT uses a comma as the decimal marker)"""
+    milliseconds = max(0, int(round(seconds * 1000)))
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{decimal_marker}{milliseconds:03d}"
+
+
+class SegmentWriter(ABC):
+    """Writes one output format a segment at a time, flushing after each
+
+    Everything written so far is on disk as soon as write() returns, so a
+    crash mid-transcription leaves a usable partial file and memory use
+    does not grow with the transcript. The file is written as
+    <path>.part and only renamed to path by a successful close(), so a
+    failed or interrupted run never leaves an output that looks finished.
+    """
+
+    extension = None
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.partial_path = self.path.with_name(self.path.name + ".part")
+        self.count = 0
+        self._file = open(self.partial_path, 'w', encoding='utf-8')
+
+    def begin(self, info):
+        """Called once with the TranscriptionInfo before the first segment"""
+
+    def write(self, segment):
+        self._write_segment(segment)
+        self.count += 1
+        self._file.flush()
+
+    @abstractmethod
+    def _write_segment(self, segment):
+        """Write one segment; count is the number written before it"""
+
+    def _finish(self):
+        pass
+
+    def close(self, keep=True):
+        """Finish the file and move it into place; keep=False discards it (failed or cancelled run)"""
+        if self._file.closed:
+            return
+        if keep:
+            self._finish()
+        self._file.close()
+        if keep:
+            os.replace(self.partial_path, self.path)
+        else:
+            self.partial_path.unlink(missing_ok=True)
+
+
+class TextWriter(SegmentWriter):
+    """Plain text, segments joined by spaces like the text box shows them"""
+
+    extension = "txt"
+
+    def _write_segment(self, segment):
+        self._file.write(segment.text if self.count == 0 else " " + segment.text)
+
+
+class SrtWriter(SegmentWriter):
+    extension = "srt"
+
+    def _write_segment(self, segment):
+        start = format_timestamp(segment.start, ",")
+        end = format_timestamp(segment.end, ",")
+        self._file.write(f"{self.count + 1}\n{start} --> {end}\n{segment.text.strip()}\n\n")
+
+
+class VttWriter(SegmentWriter):
+    extension = "vtt"
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._file.write("WEBVTT\n\n")
+
+    def _write_segment(self, segment):
+        self._file.write(f"{format_timestamp(segment.start)} --> {format_timestamp(segment.end)}\n"
+                         f"{segment.text.strip()}\n\n")
+
+
+class JsonWriter(SegmentWriter):
+    """{"language": ..., "duration": ..., "segments": [...]} with one segment per line
+
+    Until close() the closing brackets are missing, but every complete
+    line of a partial file is still one parseable segment object.
+    """
+
+    extension = "json"
+
+    def begin(self, info):
+        header = {field: getattr(info, field, None) for field in INFO_FIELDS}
+        self._file.write(json.dumps(header)[:-1] + ', "segments": [\n')
+
+    def _write_segment(self, segment):
+        if self.count == 0 and self._file.tell() == 0:
+            self.begin(None)
+        data = to_dict(segment)
+        data.pop("tokens", None)  # Token ids are only meaningful to the model
+        self._file.write(("" if self.count == 0 else ",\n") + json.dumps(data, default=str))
+
+    def _finish(self):
+        if self._file.tell() == 0:
+            self.begin(None)
+        self._file.write("\n]}\n")
+
+
+WRITERS = {writer.extension: writer for writer in (TextWriter, SrtWriter, VttWriter, JsonWriter)}
+
+
+class TranscriptWriters:
+    """The requested formats for one transcription, written side by side as segments arrive
+
+    Files are named <base>.<format>. Use as a context manager, call
+    begin(info) once and write(segment) per segment; the files appear
+    only if the block completes, an exception discards them.
+    """
+
+    def __init__(self, base_path, formats=("txt",)):
+        self.writers = []
+        try:
+            for fmt in formats:
+                self.writers.append(WRITERS[fmt](f"{base_path}.{fmt}"))
+        except BaseException:
+            self.close(keep=False)
+            raise
+
+    @property
+    def paths(self):
+        return [writer.path for writer in self.writers]
+
+    def begin(self, info):
+        for writer in self.writers:
+            writer.begin(info)
+
+    def write(self, segment):
+        for writer in self.writers:
+            writer.write(segment)
+
+    def close(self, keep=True):
+        for writer in self.writers:
+            writer.close(keep)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(keep=exc_type is None)
+
+
+def write_transcript(path, segments, info=None):
+    """Write finished segments to one file, the format taken from its extension"""
+    writer = WRITERS.get(Path(path).suffix.lstrip(".").lower(), TextWriter)(path)
+    try:
+        writer.begin(info)
+        for segment in segments:
+            writer.write(segment)
+    except BaseException:
+        writer.close(keep=False)
+        raise
+    writer.close()
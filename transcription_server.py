@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import hardware_probe
+import perf_log
+from model_manager import ModelManager
+from streaming_audio import StreamingTranscriber
+from transcript_cache import INFO_FIELDS, to_dict, to_namespace
+
+DEFAULT_PORT = 8765
+DEFAULT_URL = f"http://127.0.0.1:{DEFAULT_PORT}"
+
+# Request body formats: an encoded audio file, or raw 16 kHz mono float32 samples
+FILE_CONTENT_TYPE = "application/octet-stream"
+PCM_CONTENT_TYPE = "audio/x-pcm-f32le"
+
+
+class TranscriptionService:
+    """The warm models behind the server, shared by every client request
+
+    Models live in a ModelManager, so the preloaded one answers immediately
+    and other sizes are loaded on first use within the memory budget; with
+    warm_up each is run over a short synthetic clip first. Up to
+    `concurrency` requests transcribe at once; CTranslate2's num_workers
+    lets them run on the same model in parallel instead of queueing behind
+    a lock, and further requests wait for a free slot.
+    """
+
+    def __init__(self, concurrency=2, memory_budget_mb=4096, warm_up=True):
+        probe = hardware_probe.load_probe()
+        self.device = probe["device"]
+        self.compute_type = probe["compute_type"]
+        self.models = ModelManager(memory_budget_mb=memory_budget_mb, num_workers=concurrency, warm_up=warm_up)
+        self.concurrency = concurrency
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._active = 0
+        self._served = 0
+        self._lock = threading.Lock()
+
+    def preload(self, model_size):
+        entry = self.models.load(model_size, self.device, self.compute_type)
+        print(f"Model ready: {model_size} ({entry.device}, {entry.compute_type})")
+
+    def status(self):
+        with self._lock:
+            active, served = self._active, self._served
+        return {
+            "device": self.device,
+            "compute_type": self.compute_type,
+            "models": ["/".join(key) for key in self.models.loaded_keys()],
+            "concurrency": self.concurrency,
+            "active": active,
+            "served": served,
+        }
+
+    def transcribe(self, model_size, pipeline, audio, params):
+        """(segments, info, compute_type) for a path or array; holds a slot until segments are exhausted"""
+        self._slots.acquire()
+        with self._lock:
+            self._active += 1
+        try:
+            entry = self.models.load(model_size, self.device, self.compute_type)
+            transcriber = entry.batched_model if pipeline == 'batched' else entry.model
+            instrumented = perf_log.InstrumentedTranscriber(transcriber, model=model_size, pipeline=pipeline,
+                                                            server=True)
+            streaming = StreamingTranscriber(instrumented, carry_prompt=(pipeline != 'batched'))
+            segments, info = streaming.transcribe(audio, **params)
+        except BaseException:
+            self._release()
+            raise
+        return self._holding_slot(segments), info, entry.compute_type
+
+    def _holding_slot(self, segments):
+        try:
+            yield from segments
+        finally:
+            self._release()
+
+    def _release(self):
+        with self._lock:
+            self._active -= 1
+            self._served += 1
+        self._slots.release()
+
+
+class TranscriptionHandler(BaseHTTPRequestHandler):
+    """GET /health, POST /transcribe?model=&pipeline= streaming newline-delimited JSON back
+
+    Each response line is one message: {"type": "info", ...} first, then
+    one {"type": "segment", ...} per segment as it is decoded, and finally
+    {"type": "done"} or {"type": "error", "message": ...}. Decode options go
+    in the X-Transcribe-Params header as a JSON object.
+    """
+
+    server_version = "SpeechToTextServer/1.0"
+
+    def log_message(self, format, *args):
+        pass  # Requests are logged to perf.jsonl instead of stderr
+
+    def _send_json(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urllib.parse.urlparse(self.path).path == "/health":
+            self._send_json(200, {"status": "ok", **self.server.service.status()})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        url = urllib.parse.urlparse(self.path)
+        if url.path != "/transcribe":
+            self._send_json(404, {"error": "not found"})
+            return
+        query = urllib.parse.parse_qs(url.query)
+        model_size = query.get("model", ["turbo"])[0]
+        pipeline = query.get("pipeline", ["batched"])[0]
+        try:
+            params = json.loads(self.headers.get("X-Transcribe-Params") or "{}")
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError as e:
+            self._send_json(400, {"error": f"bad request: {e}"})
+            return
+
+        started = time.perf_counter()
+        spooled = None
+        try:
+            if self.headers.get("Content-Type") == PCM_CONTENT_TYPE:
+                import numpy as np
+                audio = np.frombuffer(self.rfile.read(length), dtype=np.float32)
+            else:
+                # Spool uploads to disk so the streaming decoder can window through them
+                spooled = tempfile.NamedTemporaryFile(prefix="stt-upload-", delete=False)
+                with spooled:
+                    remaining = length
+                    while remaining:
+                        block = self.rfile.read(min(remaining, 1024 * 1024))
+                        if not block:
+                            break
+                        spooled.write(block)
+                        remaining -= len(block)
+                audio = spooled.name
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Connection", "close")
+            self.end_headers()
+
+            count = 0
+            segments = None
+            try:
+                segments, info, compute_type = self.server.service.transcribe(model_size, pipeline, audio, params)
+                info_data = {field: getattr(info, field, None) for field in INFO_FIELDS}
+                self._send_line({"type": "info", "compute_type": compute_type, **info_data})
+                for segment in segments:
+                    self._send_line({"type": "segment", **to_dict(segment)})
+                    count += 1
+                self._send_line({"type": "done"})
+            except (BrokenPipeError, ConnectionResetError):
+                raise
+            except Exception as e:
+                self._send_line({"type": "error", "message": str(e)})
+            finally:
+                if segments is not None:
+                    segments.close()  # Frees the slot right away, also when the client went away
+            perf_log.event("server_request", model=model_size, pipeline=pipeline, segments=count,
+                           seconds=round(time.perf_counter() - started, 4))
+        except (BrokenPipeError, ConnectionResetError):
+            perf_log.event("server_request", model=model_size, pipeline=pipeline, disconnected=True,
+                           seconds=round(time.perf_counter() - started, 4))
+        finally:
+            if spooled is not None:
+                try:
+                    os.unlink(spooled.name)
+                except OSError:
+                    pass
+
+    def _send_line(self, data):
+        self.wfile.write(json.dumps(data, default=str).encode('utf-8') + b"\n")
+        self.wfile.flush()
+
+
+def serve(model_size="turbo", host="127.0.0.1", port=DEFAULT_PORT, concurrency=2, memory_budget_mb=4096,
+          warm_up=True):
+    """Load the model and serve transcription requests until interrupted"""
+    service = TranscriptionService(concurrency, memory_budget_mb, warm_up)
+    service.preload(model_size)
+    server = ThreadingHTTPServer((host, port), TranscriptionHandler)
+    server.daemon_threads = True
+    server.service = service
+    print(f"Transcription server listening on http://{host}:{port} (concurrency {concurrency})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.models.clear()
+
+
+class TranscriptionClient:
+    """Thin client for the transcription server with the same transcribe() shape as WhisperModel
+
+    transcribe(audio, **params) accepts a path (the file is uploaded as is)
+    or a 16 kHz float32 array and returns (segments, info); segments is a
+    generator that yields as the server streams them. Drop-in for the GUI's
+    model/batched_model and for transcribe.py.
+    """
+
+    def __init__(self, url=DEFAULT_URL, model_size="turbo", pipeline="batched", timeout=10.0):
+        self.url = url.rstrip("/")
+        self.model_size = model_size
+        self.pipeline = pipeline
+        self.timeout = timeout  # Connect/health timeout; streaming reads wait as long as decoding takes
+        self.compute_type = None  # Filled in from the server's health/info responses
+
+    def with_options(self, model_size=None, pipeline=None):
+        """A client for the same server with a different model size or pipeline"""
+        client = TranscriptionClient(self.url, model_size or self.model_size, pipeline or self.pipeline,
+                                     self.timeout)
+        client.compute_type = self.compute_type
+        return client
+
+    def health(self):
+        """Server status dict; raises OSError if the server isn't reachable"""
+        with urllib.request.urlopen(self.url + "/health", timeout=self.timeout) as response:
+            status = json.loads(response.read())
+        self.compute_type = self.compute_type or status.get("compute_type")
+        return status
+
+    def transcribe(self, audio, **params):
+        query = urllib.parse.urlencode({"model": self.model_size, "pipeline": self.pipeline})
+        headers = {"X-Transcribe-Params": json.dumps(params)}
+        if isinstance(audio, (str, os.PathLike)):
+            body = open(audio, 'rb')
+            headers["Content-Type"] = FILE_CONTENT_TYPE
+            headers["Content-Length"] = str(os.path.getsize(audio))
+        else:
+            body = memoryview(audio).cast('B') if audio.flags.c_contiguous else audio.tobytes()
+            headers["Content-Type"] = PCM_CONTENT_TYPE
+            headers["Content-Length"] = str(len(body))
+        request = urllib.request.Request(f"{self.url}/transcribe?{query}", data=body, headers=headers)
+        try:
+            response = urllib.request.urlopen(request)
+        finally:
+            if hasattr(body, 'close'):
+                body.close()
+
+        first = self._read_message(response)
+        if first is None or first["type"] != "info":
+            response.close()
+            raise RuntimeError((first or {}).get("message", "Transcription server closed the connection"))
+        self.compute_type = first.pop("compute_type", self.compute_type)
+        first.pop("type")
+        return self._segments(response), SimpleNamespace(**first)
+
+    @staticmethod
+    def _read_message(response):
+        line = response.readline()
+        return json.loads(line) if line else None
+
+    def _segments(self, response):
+        with response:
+            while True:
+                message = self._read_message(response)
+                if message is None:
+                    raise RuntimeError("Transcription server closed the connection mid-transcription")
+                kind = message.pop("type")
+                if kind == "segment":
+                    yield to_namespace(message)
+                elif kind == "done":
+                    return
+                else:
+                    raise RuntimeError(message.get("message", "Transcription failed on the server"))
+
+
+def connect(url):
+    """A client for url if a server answers there, else None"""
+    client = TranscriptionClient(url)
+    try:
+        client.health()
+    except (OSError, ValueError) as e:
+        print(f"Transcription server at {url} not available: {e}")
+        return None
+    return client
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Serve transcriptions from one warm model to the GUI and transcribe.py over localhost HTTP",
+        epilog="Clients: python speech_to_text_gui.py --server | python transcribe.py audio.mp3 --server"
+    )
+    parser.add_argument("-m", "--model", default="turbo", help="Model to preload (default: turbo)")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument("-c", "--concurrency", type=int, default=2,
+                        help="Requests transcribed at the same time (default: 2)")
+    parser.add_argument("--memory-budget", type=int, default=4096,
+                        help="MB of models kept loaded when clients ask for other sizes (default: 4096)")
+    parser.add_argument("--no-warm-up", dest="warm_up", action="store_false",
+                        help="Skip the synthetic warm-up run after loading a model")
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    serve(args.model, args.host, args.port, max(1, args.concurrency), args.memory_budget, args.warm_up)
+
+
+if __name__ == "__main__":
+    main()
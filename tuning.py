@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+import gc
+import json
+import os
+import time
+
+import hardware_probe
+import perf_log
+import thread_budget
+from segment_times import shift_segment
+from synthetic_audio import synthesize_speechlike
+
+TUNING_FILENAME = "tuning.json"
+
+# Rough working memory per item of a CPU batch (MB): encoder activations plus decoder state
+BATCH_ITEM_MB = {
+    "tiny": 45,
+    "base": 55,
+    "small": 85,
+    "medium": 150,
+    "large": 270,
+    "turbo": 160,
+}
+
+SAMPLE_RATE = 16000
+MAX_BATCH_SIZE = 16  # faster-whisper's own recommendation for GPUs; more rarely helps
+CALIBRATION_SECONDS = 60
+CALIBRATION_BATCH_SIZES = [1, 2, 4, 8, 16]
+CALIBRATION_WARM_UP_SECONDS = 5  # Untimed run first, so batch size 1 isn't charged for a cold model
+
+
+def plan_resources(model_size, device, model_mb, num_workers=None, cpu_count=None, available_mb=None):
+    """Heuristic batch_size, cpu_threads and num_workers for this host
+
+    On CPU: the thread budget's job count (see thread_budget.py), its
+    usable cores split between them, and the largest batch whose
+    activations fit in ~70% of the memory left after the weights. GPUs get
+    the library's recommended batch of 16 since free VRAM can't be read
+    without torch; calibrate() or an OOM backoff refines it. "auto" counts
+    as a GPU only when CTranslate2 actually sees one. An explicit
+    num_workers (e.g. a CLI --jobs) is kept; cpu_count overrides the
+    budget's usable cores.
+    """
+    budget = thread_budget.current()
+    if hardware_probe.runs_on_gpu(device):
+        return {"batch_size": MAX_BATCH_SIZE, "cpu_threads": 0, "num_workers": num_workers or 2,
+                "source": "heuristic"}
+
+    if available_mb is None:
+        available_mb = hardware_probe.available_memory_mb() or 8192
+    item_mb = BATCH_ITEM_MB.get(model_size, BATCH_ITEM_MB["large"])
+    headroom = max(0.0, available_mb * 0.7 - model_mb)
+
+    workers = num_workers or budget.jobs
+    batch_size = int(headroom // (workers * item_mb))
+    if batch_size < 2 and workers > 1 and not num_workers:
+        # Not enough memory to batch for several workers; one worker batching does better
+        workers = 1
+        batch_size = int(headroom // item_mb)
+    return {
+        "batch_size": max(1, min(MAX_BATCH_SIZE, batch_size)),
+        "cpu_threads": budget.inference_threads_for(workers, cpu_count),
+        "num_workers": workers,
+        "source": "heuristic",
+    }
+
+
+def _tuning_file():
+    return hardware_probe.cache_dir() / TUNING_FILENAME
+
+
+def _entry_key(model_size, device, compute_type):
+    return f"{model_size}/{device}/{compute_type}"
+
+
+def _load_store():
+    """Saved tuning for this host, or an empty store if missing or from another host/stack"""
+    fingerprint = hardware_probe.host_fingerprint()
+    try:
+        with open(_tuning_file(), 'r', encoding='utf-8') as f:
+            store = json.load(f)
+        if store.get("fingerprint") == fingerprint:
+            return store
+    except (OSError, ValueError):
+        pass
+    return {"fingerprint": fingerprint, "entries": {}}
+
+
+def load_tuning(model_size, device, compute_type, model_mb, num_workers=None):
+    """plan_resources() with any calibrated or backed-off values saved for this model merged in"""
+    plan = plan_resources(model_size, device, model_mb, num_workers)
+    saved = _load_store()["entries"].get(_entry_key(model_size, device, compute_type))
+    if saved:
+        plan["batch_size"] = saved.get("batch_size", plan["batch_size"])
+        if not num_workers and "num_workers" in saved:
+            plan["num_workers"] = saved["num_workers"]
+            if not hardware_probe.runs_on_gpu(device):
+                plan["cpu_threads"] = thread_budget.current().inference_threads_for(plan["num_workers"])
+        plan["source"] = saved.get("source", "saved")
+    return plan
+
+
+def save_tuning(model_size, device, compute_type, **fields):
+    """Merge fields into the saved tuning for this model (atomic write)"""
+    store = _load_store()
+    entry = store["entries"].setdefault(_entry_key(model_size, device, compute_type), {})
+    entry.update(fields, updated_at=time.time())
+    tuning_file = _tuning_file()
+    tmp_file = tuning_file.with_suffix(".tmp")
+    try:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(store, f, indent=2)
+        os.replace(tmp_file, tuning_file)
+    except OSError as e:
+        print(f"Could not save tuning: {e}")
+
+
+def is_out_of_memory(error):
+    """True for the ways CTranslate2/CUDA report running out of memory"""
+    if isinstance(error, MemoryError):
+        return True
+    message = str(error).lower()
+    return "out of memory" in message or "bad_alloc" in message or "cudaerrormemoryallocation" in message
+
+
+class AdaptiveBatchTranscriber:
+    """BatchedInferencePipeline that halves its batch size and retries when it runs out of memory
+
+    An OOM can surface in transcribe() or while iterating the segments. In
+    the latter case an array is resumed at the smaller size from the end of
+    the last segment yielded (segment boundaries move with the batch size,
+    so the rest of the audio is decoded again rather than matched up), so
+    callers see one uninterrupted stream. A path is not decoded whole just
+    to resume it: the error is raised instead; StreamingTranscriber hands
+    this class arrays one window at a time, so files go through that. The
+    reduced size is saved so the next load starts there. An explicit
+    batch_size argument still takes precedence.
+    """
+
+    def __init__(self, pipeline, batch_size, tuning_key):
+        self.pipeline = pipeline
+        self.batch_size = batch_size
+        self.tuning_key = tuning_key  # (model_size, device, compute_type)
+
+    def transcribe(self, audio, **params):
+        if "batch_size" in params:
+            return self.pipeline.transcribe(audio, **params)
+        while True:
+            try:
+                segments, info = self.pipeline.transcribe(audio, batch_size=self.batch_size, **params)
+                return self._with_backoff(audio, params, segments), info
+            except Exception as e:
+                if not self._back_off(e):
+                    raise
+
+    def _with_backoff(self, audio, params, segments):
+        resume = 0.0  # End of the last segment yielded
+        offset = 0.0  # Where the audio being decoded starts in the original
+        while True:
+            try:
+                for segment in segments:
+                    if offset:
+                        segment = shift_segment(segment, offset)
+                    if segment.start < resume - 0.001:  # Tolerance for the rounding in shift_segment
+                        continue  # Overlaps what was yielded before the retry
+                    resume = segment.end
+                    yield segment
+                return
+            except Exception as e:
+                if not self._back_off(e) or isinstance(audio, (str, os.PathLike)):
+                    raise
+                close = getattr(segments, "close", None)
+                if close is not None:
+                    close()  # Frees the failed run's features and batches before the retry
+                offset = resume
+                segments, _ = self.pipeline.transcribe(audio[int(resume * SAMPLE_RATE):],
+                                                       batch_size=self.batch_size, **params)
+
+    def _back_off(self, error):
+        """Halve the batch size after an OOM; False if it's another error or already 1"""
+        if not is_out_of_memory(error) or self.batch_size <= 1:
+            return False
+        previous = self.batch_size
+        self.batch_size = max(1, previous // 2)
+        gc.collect()
+        print(f"Out of memory at batch size {previous}, retrying with {self.batch_size}")
+        perf_log.event("batch_backoff", model=self.tuning_key[0], previous=previous, batch_size=self.batch_size)
+        save_tuning(*self.tuning_key, batch_size=self.batch_size, source="backoff")
+        return True
+
+
+def calibrate(loaded, seconds=CALIBRATION_SECONDS, batch_sizes=CALIBRATION_BATCH_SIZES):
+    """Time a synthetic clip at increasing batch sizes and save the fastest
+
+    A short untimed run goes first so the first size isn't timed on a cold
+    model. Stops early on an OOM or once a larger batch gets slower.
+    Returns a list of (batch_size, seconds or None for OOM) and updates
+    loaded.batched_model's batch size.
+    """
+    clip = synthesize_speechlike(seconds)
+    pipeline = getattr(loaded.batched_model, "pipeline", loaded.batched_model)
+    segments, _ = pipeline.transcribe(clip[:CALIBRATION_WARM_UP_SECONDS * SAMPLE_RATE], batch_size=1)
+    for _ in segments:
+        pass
+
+    results = []
+    best = None
+    for batch_size in batch_sizes:
+        started = time.perf_counter()
+        try:
+            segments, _ = pipeline.transcribe(clip, batch_size=batch_size)
+            for _ in segments:
+                pass
+        except Exception as e:
+            if not is_out_of_memory(e):
+                raise
+            results.append((batch_size, None))
+            break
+        elapsed = time.perf_counter() - started
+        results.append((batch_size, elapsed))
+        print(f"  batch size {batch_size:>2}: {elapsed:.2f}s (RTF {elapsed / seconds:.3f})")
+        if best is None or elapsed < best[1]:
+            best = (batch_size, elapsed)
+        elif elapsed > best[1] * 1.1:
+            break
+        gc.collect()
+
+    if best is not None:
+        key = getattr(loaded.batched_model, "tuning_key", (loaded.model_size, loaded.device, loaded.compute_type))
+        save_tuning(*key, batch_size=best[0], calibration_rtf=round(best[1] / seconds, 4), source="calibrated")
+        if isinstance(loaded.batched_model, AdaptiveBatchTranscriber):
+            loaded.batched_model.batch_size = best[0]
+        perf_log.event("calibration", model=loaded.model_size, device=loaded.device,
+                       compute_type=loaded.compute_type, results=results, batch_size=best[0])
+    return results